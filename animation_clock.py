@@ -0,0 +1,61 @@
+# ============================================================================
+# FILE: animation_clock.py - SHARED ANIMATION CLOCKS
+# ============================================================================
+# PURPOSE:
+#   Looping animations that run over the same frames at the same speed all
+#   show the same frame at any moment, so the frame is worked out once per
+#   tick per (animation set, frame time) instead of by every entity with
+#   its own timestamp:
+#   - GAME.anim_clocks.get(name, frame_time, length) returns the shared
+#     AnimationClock, created on first use
+#   - Game.advance() calls update() once per tick: each clock sets
+#     step = now // frame_time and frame = step % length
+#   - Entities read clock.frame. One that should run out of step reads
+#     clock.frame_at(phase), phase being its offset in frames
+#   - The frame only depends on the game clock, so fixed-step runs stay
+#     reproducible
+#   One-shot animations (deaths) keep their own timing: they have to start
+#   at their first frame whenever they are triggered.
+#
+# CLOCKS IN USE:
+#   - Enemy walk cycles, one clock per enemy type, phase from the spawn
+#     cell (enemy.Enemy)
+#
+# DEPENDENCIES:
+#   - None (reads GAME.clock)
+# ============================================================================
+
+
+class AnimationClock:
+  __slots__ = ("frame_time", "length", "step", "frame")
+
+  def __init__(self, frame_time, length, now):
+    self.frame_time = frame_time   # ms per frame
+    self.length = length           # Frames in the loop
+    self.set_time(now)
+
+  def set_time(self, now):
+    self.step = now // self.frame_time
+    self.frame = self.step % self.length
+
+  def frame_at(self, phase):
+    """Frame of an animation running `phase` frames ahead of the shared one."""
+    return (self.step + phase) % self.length
+
+
+class AnimationClocks:
+  def __init__(self, clock):
+    self.clock = clock
+    self.clocks = {}   # (animation set, frame time) -> AnimationClock
+
+  def get(self, name, frame_time, length):
+    key = (name, frame_time)
+    anim_clock = self.clocks.get(key)
+    if anim_clock is None:
+      anim_clock = self.clocks[key] = AnimationClock(frame_time, length, self.clock.get_ticks())
+    return anim_clock
+
+  def update(self):
+    now = self.clock.get_ticks()
+    for anim_clock in self.clocks.values():
+      anim_clock.set_time(now)
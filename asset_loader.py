@@ -0,0 +1,120 @@
+# ============================================================================
+# FILE: asset_loader.py - CONCURRENT ASSET LOADING WITH A SPLASH SCREEN
+# ============================================================================
+# PURPOSE:
+#   Loads Assets on a thread pool so main.py can draw a splash screen with a
+#   progress bar instead of a blank window during start-up.
+#
+# HOW IT WORKS:
+#   Worker threads (no display access):
+#   - Read and decompress the baked sprite cache (sprite_cache.read)
+#   - On a cache miss, decode every sprite sheet PNG
+#   - Decode the sound effect WAVs
+#
+#   Main thread, in poll() (called once per splash frame):
+#   - convert_alpha() each sheet as it arrives
+#   - Build the frames: from the cache, or with Assets.load_images() + bake
+#   - Put the decoded sounds in Assets.sounds
+#
+# DEPENDENCIES:
+#   - concurrent.futures: Thread pool
+#   - Assets, sprite_cache: What is loaded
+#   - pygame: Decoding, splash rendering
+# ============================================================================
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import pygame
+import gamesetting as gs
+import sprite_cache
+from assets import Assets
+from audio import SOUND_DIR
+
+WORKERS = 4
+
+
+class AssetLoader:
+  def __init__(self, workers=WORKERS):
+    self.assets = Assets(load=False)
+    self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asset-loader")
+    self.jobs = {}            # Future -> (kind, name)
+    self.steps_done = 0
+    self.steps_total = 0
+    self.build_step = None    # Main thread step that makes the frames, once its inputs are in
+    self.sheets_waiting = 0
+    self.finished = False
+
+    self.submit("cache", None, sprite_cache.read)
+    for sound in gs.SOUNDS:
+      self.submit("sound", sound, pygame.mixer.Sound, os.path.join(SOUND_DIR, sound))
+    self.steps_total += 1     # The frame build on the main thread
+
+  def submit(self, kind, name, function, *args):
+    self.jobs[self.pool.submit(function, *args)] = (kind, name)
+    self.steps_total += 1
+
+  def progress(self):
+    """Fraction of loading steps finished (0.0 - 1.0)."""
+    return self.steps_done / self.steps_total
+
+  def poll(self, timeout=0.0):
+    """
+    Handle the jobs that finished (waiting up to `timeout` seconds for one),
+    then run the main thread step if it is ready. Returns True when done.
+    """
+    if self.jobs:
+      done, _ = wait(list(self.jobs), timeout=timeout, return_when=FIRST_COMPLETED)
+      for future in done:
+        kind, name = self.jobs.pop(future)
+        self.steps_done += 1
+        self.arrived(kind, name, future.result())
+
+    if self.build_step is not None and self.sheets_waiting == 0:
+      step, self.build_step = self.build_step, None
+      step()
+      self.steps_done += 1
+
+    if not self.jobs and self.build_step is None and not self.finished:
+      self.finished = True
+      self.pool.shutdown()
+    return self.finished
+
+  def arrived(self, kind, name, result):
+    """Main thread handling of one finished job."""
+    if kind == "cache":
+      if result is not None:
+        self.build_step = lambda: self.build_from_cache(result)
+      else:
+        # No usable cache: decode the sheets, then run the full pipeline
+        for sheet in sprite_cache.SHEET_FILES:
+          self.submit("sheet", sheet, pygame.image.load, os.path.join("images", sheet))
+          self.sheets_waiting += 1
+        self.build_step = self.build_from_sheets
+    elif kind == "sheet":
+      self.assets.preloaded_sheets[name] = result.convert_alpha()
+      self.sheets_waiting -= 1
+    elif kind == "sound":
+      self.assets.sounds[name] = result
+
+  def build_from_cache(self, cached):
+    if not sprite_cache.apply(self.assets, cached):
+      self.build_from_sheets()
+
+  def build_from_sheets(self):
+    self.assets.load_images()
+    sprite_cache.bake(self.assets)
+
+
+def draw_splash(window, progress, font):
+  """Splash screen: title and a progress bar."""
+  window.fill(gs.BLACK)
+  width, height = window.get_size()
+  title = font.render("Bomba~ Na!", True, gs.WHITE)
+  window.blit(title, title.get_rect(center=(width // 2, height // 2 - 40)))
+
+  bar = pygame.Rect(0, 0, width // 2, 20)
+  bar.center = (width // 2, height // 2 + 20)
+  pygame.draw.rect(window, gs.WHITE, bar, 2)
+  fill = bar.inflate(-6, -6)
+  fill.width = int(fill.width * progress)
+  pygame.draw.rect(window, gs.YELLOW, fill)
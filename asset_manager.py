@@ -0,0 +1,138 @@
+# ============================================================================
+# FILE: asset_manager.py - ON-DEMAND ENEMY/SPECIAL SPRITE SETS
+# ============================================================================
+# PURPOSE:
+#   A stage uses only a few of the eight enemy types and the specials hidden
+#   in it. SpriteSetManager builds each enemy/special sprite set the first
+#   time it is needed and keeps at most gs.SPRITE_SET_BUDGET_KB of them:
+#   - get(kind, name, owner): returns a set, building it on a miss, and pins
+#     it to the owner's current stage. The owner is the Game using it
+#     (Game.sprite_set()); one manager serves every Game in a process
+#     (versus rooms), and each keeps its own pins
+#   - prefetch(): builds a set ahead of time (LevelTransition prefetches the
+#     sets a stage may need later: pontans, the specials under its blocks)
+#   - begin_stage(owner): unpins that owner's previous stage's sets. A Game
+#     that is garbage collected drops its pins with it
+#   - Over the budget, the least recently used sets no owner pins are
+#     evicted
+#
+#   Assets.enemies and Assets.specials are SpriteSetView mappings, so
+#   code with no Game (the network client) keeps using
+#   ASSETS.enemies[name] / ASSETS.specials[name]; those sets are pinned to
+#   no owner.
+#
+#   Sets are cut from spritesheet.png, which stays loaded (it is much
+#   smaller than the 64x64 frames cut from it).
+#
+# DEPENDENCIES:
+#   - collections: OrderedDict (LRU order), Mapping
+#   - weakref: Pins per owner, dropped with the owner
+#   - frame_registry: Memory of a set
+#   - gamesetting: Coordinate tables, budget
+# ============================================================================
+
+from collections import OrderedDict
+from collections.abc import Mapping
+import weakref
+import gamesetting as gs
+from frame_registry import frame_memory
+
+SHEET_FILE = "spritesheet.png"
+ENEMY = "enemy"
+SPECIAL = "special"
+
+
+class SpriteSetView(Mapping):
+  """Read-only name -> sprite set mapping backed by the manager."""
+  def __init__(self, manager, kind, names):
+    self.manager = manager
+    self.kind = kind
+    self.names = list(names)
+
+  def __getitem__(self, name):
+    if name not in self.names:
+      raise KeyError(name)
+    return self.manager.get(self.kind, name)
+
+  def __iter__(self):
+    return iter(self.names)
+
+  def __len__(self):
+    return len(self.names)
+
+
+class SpriteSetManager:
+  def __init__(self, assets, budget_kb=gs.SPRITE_SET_BUDGET_KB):
+    self.ASSETS = assets
+    self.budget = budget_kb * 1024
+    self.sheet = None
+    self.resident = OrderedDict()  # (kind, name) -> (sprite set, bytes), least recently used first
+    self.pins = weakref.WeakKeyDictionary()  # Owner -> sets used by its current stage (never evicted)
+    self.unowned = set()                     # Sets pinned with no owner (views)
+    self.loads = 0
+    self.evictions = 0
+
+  def view(self, kind, names):
+    return SpriteSetView(self, kind, names)
+
+  def get(self, kind, name, owner=None):
+    """Return a sprite set, building it if it is not resident, and pin it to `owner`'s stage."""
+    key = (kind, name)
+    self.pinned_by(owner).add(key)
+    if key in self.resident:
+      self.resident.move_to_end(key)
+      return self.resident[key][0]
+    return self.load(key)
+
+  def prefetch(self, kind, name, owner=None):
+    """Make a set resident for `owner`'s current stage without using it yet."""
+    self.get(kind, name, owner)
+
+  def begin_stage(self, owner=None):
+    """Unpin `owner`'s previous stage's sets (they stay resident until evicted)."""
+    self.pinned_by(owner).clear()
+
+  def pinned_by(self, owner):
+    if owner is None:
+      return self.unowned
+    pins = self.pins.get(owner)
+    if pins is None:
+      pins = self.pins[owner] = set()
+    return pins
+
+  def pinned(self, key):
+    return key in self.unowned or any(key in pins for pins in self.pins.values())
+
+  def load(self, key):
+    kind, name = key
+    if self.sheet is None:
+      self.sheet = self.ASSETS.load_sprite_sheet("images", SHEET_FILE)
+    if kind == ENEMY:
+      table = getattr(gs, name.upper())  # e.g. gs.BALLOM
+      sprite_set = self.ASSETS.load_sprite_range(table, self.sheet, row=16, col=16, width=16,
+                                                 height=16, resize=True, apply_colorkey=True)
+    else:
+      sprite_set = self.ASSETS.load_sprite_range({name: gs.SPECIALS[name]}, self.sheet, row=16,
+                                                 col=16, width=16, height=16, resize=True,
+                                                 apply_colorkey=True)[name]
+    self.resident[key] = (sprite_set, frame_memory(sprite_set)["bytes"])
+    self.loads += 1
+    self.evict()
+    return sprite_set
+
+  def evict(self):
+    """Drop least recently used unpinned sets until the budget is met."""
+    for key in list(self.resident):
+      if self.resident_bytes() <= self.budget:
+        return
+      if not self.pinned(key):
+        del self.resident[key]
+        self.evictions += 1
+
+  def resident_bytes(self):
+    return sum(size for _, size in self.resident.values())
+
+  def stats(self):
+    return {"resident": [f"{kind}:{name}" for kind, name in self.resident],
+            "resident_kb": self.resident_bytes() // 1024, "budget_kb": self.budget // 1024,
+            "loads": self.loads, "evictions": self.evictions}
@@ -2,10 +2,43 @@
 
 import pygame
 import gamesetting as gs
+import sprite_cache
+from audio import SoundBank
+from frame_registry import FrameRegistry, frame_memory
+from asset_manager import ENEMY, SPECIAL, SpriteSetManager
 
 class Assets:
-    def __init__(self):
+    def __init__(self, load=True):
+        """
+        PARAMETERS:
+        - load: Build every frame now. asset_loader.AssetLoader passes False,
+          decodes the sheets on worker threads and finishes the job itself.
+        """
+        # Sheets decoded and converted ahead of time (file name -> Surface)
+        self.preloaded_sheets = {}
+        # Identical frames (same sheet cell, size and transform) are built once
+        self.frames = FrameRegistry()
+        # Enemy and special sprite sets are built when a stage needs them
+        self.sprite_sets = SpriteSetManager(self)
+        self.enemies = self.sprite_sets.view(ENEMY, gs.ENEMIES.keys())
+        self.specials = self.sprite_sets.view(SPECIAL, gs.SPECIALS.keys())
+        self.sounds = self.load_sound_effect()
+
+        # Frames baked by an earlier launch skip the cut/scale/rotate pipeline
+        if load and not sprite_cache.load(self):
+            self.load_images()
+            sprite_cache.bake(self)
+
+
+        # Create a Green Background Block manually
+        bg_surface = pygame.Surface((gs.SIZE, gs.SIZE))
+        bg_surface.fill(gs.YELLOWISH) # Fills the square with Green color
+        
+        # Save it so game.py can find it
+        self.background = {"background": [bg_surface]}
 
+    def load_images(self):
+        """Cut, scale and rotate every frame from the sprite sheets."""
         self.sprite_sheet = self.load_sprite_sheet("images", "owncreation.png") # Removed hardcoded size | THIS IS FOR CHARACTER
         self.player_char = self.load_sprite_range(
             gs.PLAYER, 
@@ -64,111 +97,10 @@ class Assets:
 
         for image_list in ["right_end", "right_mid", "down_end", "down_mid"]: 
             self.rotate_images_in_list(self.explosion[image_list], 180) 
-        
-        # Load all enemy sprites from the same sprite sheet
-        # Initialize empty enemies dictionary
-        self.enemies = {}
-        
-        # Load each enemy type and add to the dictionary (DO NOT OVERWRITE)
-        self.enemies["ballom"] = self.load_sprite_range(
-            gs.BALLOM, 
-            self.sprite_sheet,
-            row=16,
-            col=16,
-            width=16,
-            height=16,
-            resize=True,
-            apply_colorkey=True
-        )
-        
-        self.enemies["onil"] = self.load_sprite_range(
-            gs.ONIL, 
-            self.sprite_sheet,
-            row=16,
-            col=16,
-            width=16,
-            height=16,
-            resize=True,
-            apply_colorkey=True
-        )
-        
-        self.enemies["dahl"] = self.load_sprite_range(
-            gs.DAHL, 
-            self.sprite_sheet,
-            row=16,
-            col=16,
-            width=16,
-            height=16,
-            resize=True,
-            apply_colorkey=True
-        )
-
-        self.enemies["minvo"] = self.load_sprite_range(
-            gs.MINVO, 
-            self.sprite_sheet,
-            row=16,
-            col=16,
-            width=16,
-            height=16,
-            resize=True,
-            apply_colorkey=True
-        )
 
-        self.enemies["doria"] = self.load_sprite_range(
-            gs.DORIA, 
-            self.sprite_sheet,
-            row=16,
-            col=16,
-            width=16,
-            height=16,
-            resize=True,
-            apply_colorkey=True
-        )
-
-        self.enemies["ovape"] = self.load_sprite_range(
-            gs.OVAPE, 
-            self.sprite_sheet,
-            row=16,
-            col=16,
-            width=16,
-            height=16,
-            resize=True,
-            apply_colorkey=True
-        )
-
-        self.enemies["pass"] = self.load_sprite_range(
-            gs.PASS, 
-            self.sprite_sheet,
-            row=16,
-            col=16,
-            width=16,
-            height=16,
-            resize=True,
-            apply_colorkey=True
-        )
-
-        self.enemies["pontan"] = self.load_sprite_range(
-            gs.PONTAN, 
-            self.sprite_sheet,
-            row=16,
-            col=16,
-            width=16,
-            height=16,
-            resize=True,
-            apply_colorkey=True
-        )
-    
-        self.specials = self.load_sprite_range(
-            gs.SPECIALS,
-            self.sprite_sheet,
-            row=16,
-            col=16,
-            width=16,
-            height=16,
-            resize=True,
-            apply_colorkey=True
-
-        )
+        # Enemy and special sets are cut from this sheet when a stage needs them
+        self.sprite_sets.sheet = self.sprite_sheet
+        
         time_sprite = self.load_sprites(self.sprite_sheet, 4*16, 13*16, 64, 16)
         self.time_word = pygame.transform.scale(time_sprite, (256, 64))
         
@@ -212,21 +144,18 @@ class Assets:
         self.stage_word = pygame.transform.scale(stage_word_sprite, (300, 64))  #320
         self.stage_word.set_colorkey(gs.BLACK)
 
-        self.sounds = self.load_sound_effect()
-
-
-        # Create a Green Background Block manually
-        bg_surface = pygame.Surface((gs.SIZE, gs.SIZE))
-        bg_surface.fill(gs.YELLOWISH) # Fills the square with Green color
-        
-        # Save it so game.py can find it
-        self.background = {"background": [bg_surface]}
-
     def load_sprite_sheet(self, path, file_name): # Removed width, height arguments
-        """Load a sprite sheet.""" 
-        image = pygame.image.load(f"{path}/{file_name}").convert_alpha()
+        """Load a sprite sheet (or take it from preloaded_sheets).""" 
+        image = self.preloaded_sheets.pop(file_name, None)
+        if image is None:
+            image = pygame.image.load(f"{path}/{file_name}").convert_alpha()
+        self.frames.name_sheet(image, file_name)
         return image
     
+    def frame_report(self):
+        """Frame counts and the memory saved by sharing identical frames (see frame_registry)."""
+        return frame_memory([getattr(self, name) for name in sprite_cache.SPRITE_ATTRIBUTES])
+
     def load_sprites(self, spritesheet, xcoord, ycoord, width, height):
         """Load individual sprites from a sprite sheet."""
         # CREATE AN EMPTY SURFACE
@@ -251,32 +180,41 @@ class Assets:
                 # NOTE: The coordinates here are (ROW, COL) * (SPRITE_HEIGHT, SPRITE_WIDTH)
                 # You were using coord[1] * col (COL * WIDTH) for x and coord[0] * row (ROW * HEIGHT) for y
                 # This is correct for (ROW, COL) mapping if row/col are pixel sizes
-                image = self.load_sprites(
-                    spritesheet, 
-                    coord[1] * col, # X-coordinate: Column index * Sprite Width
-                    coord[0] * row, # Y-coordinate: Row index * Sprite Height
-                    width, 
-                    height
-                )
-                if resize:
-                    # Scale to a more suitable game size, like 32x64 or 64x64
-                    image = pygame.transform.scale(image, (gs.SIZE, gs.SIZE)) # Example scale
-                    # IMPORTANT: Apply colorkey AFTER resizing, only if requested
-                    # Scaling creates a new image, so colorkey must be reapplied
-                    if apply_colorkey:
-                        image.set_colorkey(gs.BLACK)
+                rect = (coord[1] * col, # X-coordinate: Column index * Sprite Width
+                        coord[0] * row, # Y-coordinate: Row index * Sprite Height
+                        width, 
+                        height)
+                # Animations that reuse a sheet cell share one frame
+                scale = (gs.SIZE, gs.SIZE) if resize else None
+                key = (self.frames.sheet_key(spritesheet), rect, scale, resize and apply_colorkey)
+                image = self.frames.intern(
+                    key, lambda: self.load_frame(spritesheet, rect, resize, apply_colorkey))
                 animation_images[animation].append(image)
         return animation_images
+
+    def load_frame(self, spritesheet, rect, resize, apply_colorkey):
+        """Cut one frame from the sheet, optionally scaled to gs.SIZE with a colorkey."""
+        image = self.load_sprites(spritesheet, *rect)
+        if resize:
+            # Scale to a more suitable game size, like 32x64 or 64x64
+            image = pygame.transform.scale(image, (gs.SIZE, gs.SIZE)) # Example scale
+            # IMPORTANT: Apply colorkey AFTER resizing, only if requested
+            # Scaling creates a new image, so colorkey must be reapplied
+            if apply_colorkey:
+                image.set_colorkey(gs.BLACK)
+        return image
     
     def rotate_images_in_list(self,image_list, rotation):
         """Cycle through a list of images and rotate each by the given angle."""
         for ind, images in enumerate(image_list):
-            image = pygame.transform.rotate(images, rotation)
-            image.set_colorkey(gs.BLACK)
-            image_list[ind] = image
+            image_list[ind] = self.frames.transformed(
+                images, ("rotate", rotation), lambda: self.rotate_image(images, rotation))
+
+    def rotate_image(self, image, rotation):
+        image = pygame.transform.rotate(image, rotation)
+        image.set_colorkey(gs.BLACK)
+        return image
 
     def load_sound_effect(self):
-        sound_files = {}
-        for sound in gs.SOUNDS:
-            sound_files[sound] = pygame.mixer.Sound(f"sounds/{sound}")
-        return sound_files    
\ No newline at end of file
+        """Sound effects are decoded on first use; music is streamed (see audio.py)."""
+        return SoundBank()    
\ No newline at end of file
@@ -0,0 +1,186 @@
+# ============================================================================
+# FILE: audio.py - STREAMED MUSIC AND LAZY SOUND EFFECTS
+# ============================================================================
+# PURPOSE:
+#   - MusicPlayer: plays the music tracks in gs.MUSIC through
+#     pygame.mixer.music, which streams from disk instead of decoding the
+#     whole track into memory like pygame.mixer.Sound
+#   - SoundBank: dict of sound effects that loads each WAV on first use
+#   - VoiceManager: decides which sound effect requests get a mixer channel
+#
+# TRACK CHANGES:
+#   pygame.mixer.music is a single stream, so two tracks cannot overlap.
+#   play() fades the current track out (gs.MUSIC_FADE_MS) and update()
+#   starts the next one when the fade is over. Looping tracks (title, main
+#   BGM, power-up BGM) fade in; jingles (stage start/clear, miss) start at
+#   full volume so their first notes are not lost.
+#
+# SOUND EFFECT VOICES:
+#   Game code calls GAME.sfx.play(name) instead of Sound.play(). Requests are
+#   collected and started together once per tick by flush():
+#   - Duplicate requests in one tick are coalesced into one voice (a chain
+#     reaction asks for the explosion sound dozens of times in one tick)
+#   - Each effect has a voice cap (gs.SFX_VOICES); at the cap its oldest
+#     voice is restarted instead of adding another
+#   - With no free channel, an effect steals the channel of the oldest
+#     lower-priority effect, or is dropped
+#   - Stingers (power-up, player hit) use reserved channels
+#   gs.SFX_CHANNELS bounds the voices the mixer has to mix.
+#
+# SILENT GAMES:
+#   The mixer is one per process. Games that must not touch it (the rooms
+#   of a multi-room server) pass enabled=False: MusicPlayer ignores every
+#   track change and VoiceManager drops its requests at flush().
+#
+# DEPENDENCIES:
+#   - pygame.mixer: Music stream and sound effects
+#   - gamesetting: Track table, fade length
+# ============================================================================
+
+import os
+from collections import Counter
+import pygame
+import gamesetting as gs
+
+SOUND_DIR = "sounds"
+
+
+class SoundBank(dict):
+  """Sound effects by file name, decoded on first use."""
+  def __missing__(self, name):
+    sound = pygame.mixer.Sound(os.path.join(SOUND_DIR, name))
+    self[name] = sound
+    return sound
+
+
+class MusicPlayer:
+  def __init__(self, fade_ms=gs.MUSIC_FADE_MS, enabled=True):
+    self.fade_ms = fade_ms
+    self.enabled = enabled
+    self.current = None     # Name of the track playing (or fading out)
+    self.pending = None     # (name, loops) waiting for the fade-out to finish
+    self.fade_end = 0       # pygame.time.get_ticks() when the fade-out ends
+
+  def available(self):
+    return self.enabled and pygame.mixer.get_init() is not None
+
+  def play(self, name, loops=-1):
+    """
+    Switch to a track from gs.MUSIC
+
+    PARAMETERS:
+    - name: Key in gs.MUSIC ("title", "main", "power_up", ...)
+    - loops: -1 to loop forever, 0 to play once
+    """
+    if not self.available():
+      return
+    if name == self.current and self.pending is None and loops == -1 and pygame.mixer.music.get_busy():
+      return  # Already looping this track
+    if pygame.mixer.music.get_busy() and self.fade_ms:
+      if self.pending is None:
+        pygame.mixer.music.fadeout(self.fade_ms)
+        self.fade_end = pygame.time.get_ticks() + self.fade_ms
+      self.pending = (name, loops)
+      return
+    self.pending = None
+    self._start(name, loops)
+
+  def stop(self):
+    """Fade out whatever is playing and forget any queued track."""
+    self.pending = None
+    self.current = None
+    if self.available() and pygame.mixer.music.get_busy():
+      pygame.mixer.music.fadeout(self.fade_ms)
+
+  def update(self):
+    """Start the queued track once the fade-out is over (call once per frame)."""
+    if self.pending is None:
+      return
+    if pygame.mixer.music.get_busy() and pygame.time.get_ticks() < self.fade_end:
+      return
+    name, loops = self.pending
+    self.pending = None
+    self._start(name, loops)
+
+  def _start(self, name, loops):
+    # Halt first: loading over a track that is still fading out makes
+    # SDL_mixer wait for the fade in 100 ms sleeps on this thread
+    pygame.mixer.music.stop()
+    pygame.mixer.music.load(os.path.join(SOUND_DIR, gs.MUSIC[name]))
+    pygame.mixer.music.play(loops=loops, fade_ms=self.fade_ms if loops == -1 else 0)
+    self.current = name
+
+
+class VoiceManager:
+  def __init__(self, sounds, channels=gs.SFX_CHANNELS, reserved=gs.SFX_RESERVED_CHANNELS,
+               voices=gs.SFX_VOICES, enabled=True):
+    self.sounds = sounds
+    self.voices = voices
+    self.channels = channels
+    self.reserved = reserved
+    self.requests = {}    # name -> requests since the last flush
+    self.playing = {}     # channel index -> (name, priority, start order)
+    self.started = 0      # Start order counter (oldest voice = lowest)
+    self.stats = Counter()
+    # Disabled voice managers leave the process-wide channel setup alone
+    self.enabled = enabled and pygame.mixer.get_init() is not None
+    if self.enabled:
+      pygame.mixer.set_num_channels(channels)
+      pygame.mixer.set_reserved(reserved)
+
+  def voice(self, name):
+    """(max voices, priority, stinger) for a sound effect."""
+    return self.voices.get(name, gs.SFX_DEFAULT_VOICE)
+
+  def play(self, name):
+    """Request a sound effect; it starts at the next flush()."""
+    self.requests[name] = self.requests.get(name, 0) + 1
+
+  def flush(self):
+    """Start this tick's requests, highest priority first (call once per tick)."""
+    if not self.requests:
+      return
+    requests, self.requests = self.requests, {}
+    if not self.enabled:
+      return
+    for index in list(self.playing):
+      if not pygame.mixer.Channel(index).get_busy():
+        del self.playing[index]
+
+    for name in sorted(requests, key=lambda name: -self.voice(name)[1]):
+      self.stats["requested"] += requests[name]
+      self.stats["coalesced"] += requests[name] - 1
+      limit, priority, stinger = self.voice(name)
+      same = [index for index, voice in self.playing.items() if voice[0] == name]
+      if len(same) >= limit:
+        index = min(same, key=lambda index: self.playing[index][2])
+        self.stats["restarted"] += 1
+      else:
+        index = self.free_channel(stinger)
+        if index is None:
+          index = self.channel_to_steal(priority, stinger)
+          if index is None:
+            self.stats["dropped"] += 1
+            continue
+          self.stats["stolen"] += 1
+      pygame.mixer.Channel(index).play(self.sounds[name])
+      self.playing[index] = (name, priority, self.started)
+      self.started += 1
+      self.stats["played"] += 1
+
+  def channel_range(self, stinger):
+    return range(0, self.reserved) if stinger else range(self.reserved, self.channels)
+
+  def free_channel(self, stinger):
+    for index in self.channel_range(stinger):
+      if index not in self.playing:
+        return index
+    return None
+
+  def channel_to_steal(self, priority, stinger):
+    """Channel of the lowest-priority (then oldest) voice below `priority`, if any."""
+    candidates = [index for index in self.channel_range(stinger)
+                  if self.playing[index][1] < priority]
+    if not candidates:
+      return None
+    return min(candidates, key=lambda index: self.playing[index][1:])
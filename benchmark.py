@@ -0,0 +1,283 @@
+# ============================================================================
+# FILE: benchmark.py - FRAME-TIME BENCHMARK SUITE
+# ============================================================================
+# PURPOSE:
+#   Builds Game in fixed, seeded stress scenarios and times Game.update() and
+#   Game.draw() separately over many ticks.
+#   - Reports mean / p95 / p99 milliseconds per scenario
+#   - Saves the results as JSON (with per-frame collision query counts)
+#   - Compares against a stored baseline and flags regressions
+#
+# SCENARIOS:
+#   empty_stage       No soft blocks, no enemies - the fixed cost of a frame
+#   pontan_spawn      The stage timer hits 0 and 10 pontans are spawned
+#   chain_explosions  Power 10, full bomb limit, bombs chained across a row
+#   horde_200         200 enemies roaming the stage
+#   full_soft_blocks  Every free cell filled with a soft block
+#
+# USAGE:
+#   python benchmark.py                      # Run, compare with baseline
+#   python benchmark.py --update-baseline    # Run and store as new baseline
+#   python benchmark.py --only horde_200 --ticks 300
+#
+# DEPENDENCIES:
+#   - headless: Window-less fixed-step Game
+#   - Blocks/Bomb classes: Used to build the scenarios
+# ============================================================================
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+import gamesetting as gs
+from headless import make_game
+
+BASELINE_PATH = os.path.join("benchmarks", "baseline.json")
+RESULTS_PATH = os.path.join("benchmarks", "results.json")
+
+
+# ============================================================================
+# SCENARIO HELPERS
+# ============================================================================
+def make_invulnerable(player):
+  """Keep the player alive so the scenario is never interrupted by a restart."""
+  player.invisibility = True
+  # Invisibility ends on a scheduled end_invisibility(); with none pending it never does
+  player.GAME.timers.cancel(player.invisibility_expiry)
+  player.invisibility_expiry = None
+  player.flame_pass = True
+
+
+def clear_soft_blocks(game):
+  for block in game.groups["soft_block"].sprites():
+    game.level_matrix[block.row][block.col] = "_"
+    block.kill()
+
+
+def clear_specials(game):
+  for special in game.groups["specials"].sprites():
+    game.level_matrix[special.row][special.col] = "_"
+    special.kill()
+
+
+def clear_enemies(game):
+  game.groups["enemies"].empty()
+
+
+def free_cells(game):
+  """Empty cells outside the player's starting corner."""
+  cells = []
+  for row_num, row in enumerate(game.level_matrix):
+    for col_num, cell in enumerate(row):
+      if cell == "_" and not (row_num in [2, 3, 4] and col_num in [1, 2, 3]):
+        cells.append((row_num, col_num))
+  return cells
+
+
+# ============================================================================
+# SCENARIOS - setup(game) builds the state, tick(game) runs before each update
+# ============================================================================
+def setup_empty_stage(game):
+  clear_soft_blocks(game)  # Hidden specials are revealed when their block is killed
+  clear_specials(game)
+  clear_enemies(game)
+
+
+def setup_pontan_spawn(game):
+  clear_enemies(game)
+  make_invulnerable(game.PLAYER)
+  # One second left on the clock: the first timed ticks spawn the pontans
+  game.level_info.set_timer()
+  game.level_info.time = 1
+
+
+CHAIN_ROW = 1
+CHAIN_COLS = [1, 4, 7, 10, 13, 16, 19, 22, 25, 28]
+
+
+def setup_chain_explosions(game):
+  clear_enemies(game)
+  player = game.PLAYER
+  make_invulnerable(player)
+  player.power = 10
+  player.bomb_limit = 10
+  # Open up the whole row so every bomb's blast reaches the next bomb
+  for block in game.groups["soft_block"].sprites():
+    if block.row == CHAIN_ROW:
+      game.level_matrix[block.row][block.col] = "_"
+      block.kill()
+  for special in game.groups["specials"].sprites():
+    if special.row == CHAIN_ROW:
+      game.level_matrix[special.row][special.col] = "_"
+      special.kill()
+
+
+def tick_chain_explosions(game):
+  """Re-arm the full bomb limit and set off the chain whenever the last one is over."""
+  from character import Bomb
+  from explosion import Flames
+
+  if game.groups["bomb"] or game.world.size(Flames):
+    return
+  player = game.PLAYER
+  bombs = [Bomb(game, game.ASSETS.bomb["bomb"], game.groups["bomb"], player.power,
+                CHAIN_ROW, col, gs.SIZE, False) for col in CHAIN_COLS[:player.bomb_limit]]
+  bombs[0].explode()
+
+
+def setup_horde_200(game):
+  clear_enemies(game)
+  make_invulnerable(game.PLAYER)
+  types = [name for name in gs.ENEMIES.keys() if name != "pontan"]
+  game.insert_enemies_into_level(game.level_matrix, [types[i % len(types)] for i in range(200)])
+
+
+def setup_full_soft_blocks(game):
+  from blocks import Soft_Block
+
+  make_invulnerable(game.PLAYER)
+  for row, col in free_cells(game):
+    game.level_matrix[row][col] = Soft_Block(game, game.ASSETS.soft_block["soft_block"],
+                                             game.groups["soft_block"], row, col)
+
+
+SCENARIOS = {
+  "empty_stage": (setup_empty_stage, None),
+  "pontan_spawn": (setup_pontan_spawn, None),
+  "chain_explosions": (setup_chain_explosions, tick_chain_explosions),
+  "horde_200": (setup_horde_200, None),
+  "full_soft_blocks": (setup_full_soft_blocks, None),
+}
+
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+def percentile(sorted_values, pct):
+  """Nearest-rank percentile of an already sorted list."""
+  if not sorted_values:
+    return 0.0
+  index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+  return sorted_values[index]
+
+
+def summarize(samples):
+  """mean/p95/p99/max in milliseconds from a list of seconds."""
+  values = sorted(s * 1000 for s in samples)
+  return {"mean": sum(values) / len(values),
+          "p95": percentile(values, 95),
+          "p99": percentile(values, 99),
+          "max": values[-1]}
+
+
+def run_scenario(name, ticks=600, warmup=30, seed=1234):
+  """Build one scenario and time update/draw separately for `ticks` frames."""
+  setup, tick = SCENARIOS[name]
+  game = make_game(seed=seed)
+  setup(game)
+  game.collision_stats.enabled = True
+  game.collision_stats.reset()
+  window = game.MAIN.screen
+
+  update_times = []
+  draw_times = []
+  for frame in range(warmup + ticks):
+    if tick:
+      tick(game)
+    t0 = time.perf_counter()
+    game.update()
+    t1 = time.perf_counter()
+    game.draw(window)
+    t2 = time.perf_counter()
+    if frame >= warmup:
+      update_times.append(t1 - t0)
+      draw_times.append(t2 - t1)
+
+  return {"ticks": ticks,
+          "update_ms": summarize(update_times),
+          "draw_ms": summarize(draw_times),
+          "entities": {key: len(group) for key, group in game.groups.items()},
+          "collision_per_frame": game.collision_stats.averages()}
+
+
+def run(names=None, ticks=600, seed=1234):
+  results = {}
+  for name in names or SCENARIOS.keys():
+    # The game prints level layouts and spawn lists; keep that out of the report
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+      results[name] = run_scenario(name, ticks=ticks, seed=seed)
+  return results
+
+
+def compare(results, baseline, tolerance=0.25):
+  """Return a list of regressions: (scenario, metric, baseline ms, current ms)."""
+  regressions = []
+  for name, result in results.items():
+    if name not in baseline:
+      continue
+    for phase in ["update_ms", "draw_ms"]:
+      for stat in ["mean", "p95"]:
+        old = baseline[name][phase][stat]
+        new = result[phase][stat]
+        if new > old * (1 + tolerance) and new - old > 0.05:
+          regressions.append((name, f"{phase}.{stat}", old, new))
+  return regressions
+
+
+def print_report(results, baseline=None):
+  print(f"{'scenario':<18} {'phase':<7} {'mean':>8} {'p95':>8} {'p99':>8} {'base p95':>9}")
+  for name, result in results.items():
+    for phase in ["update_ms", "draw_ms"]:
+      stats = result[phase]
+      base = ""
+      if baseline and name in baseline:
+        base = f"{baseline[name][phase]['p95']:.3f}"
+      print(f"{name:<18} {phase[:-3]:<7} {stats['mean']:>8.3f} {stats['p95']:>8.3f} "
+            f"{stats['p99']:>8.3f} {base:>9}")
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description="Frame-time benchmark for Bomberman")
+  parser.add_argument("--ticks", type=int, default=600, help="timed frames per scenario")
+  parser.add_argument("--seed", type=int, default=1234)
+  parser.add_argument("--only", nargs="*", choices=list(SCENARIOS.keys()), help="scenarios to run")
+  parser.add_argument("--output", default=RESULTS_PATH, help="where to save the results JSON")
+  parser.add_argument("--baseline", default=BASELINE_PATH)
+  parser.add_argument("--update-baseline", action="store_true", help="save results as the new baseline")
+  parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown (0.25 = 25%%)")
+  args = parser.parse_args(argv)
+
+  results = run(args.only, ticks=args.ticks, seed=args.seed)
+
+  baseline = None
+  if os.path.exists(args.baseline):
+    with open(args.baseline) as f:
+      baseline = json.load(f)
+
+  print_report(results, baseline)
+
+  os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+  with open(args.output, "w") as f:
+    json.dump(results, f, indent=2)
+
+  if args.update_baseline:
+    os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+    with open(args.baseline, "w") as f:
+      json.dump(results, f, indent=2)
+    print(f"Baseline saved to {args.baseline}")
+    return 0
+
+  if baseline is None:
+    print("No baseline found; run with --update-baseline to create one")
+    return 0
+
+  regressions = compare(results, baseline, args.tolerance)
+  for name, metric, old, new in regressions:
+    print(f"REGRESSION {name} {metric}: {old:.3f} ms -> {new:.3f} ms")
+  return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
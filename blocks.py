@@ -15,6 +15,8 @@
 #This is blocks.py - defines block classes for the Bomberman game
 import pygame
 from specials import Special
+from collision_stats import SOFT_BLOCK
+from asset_manager import SPECIAL
 import gamesetting as gs
 
 # ============================================================================
@@ -61,7 +63,7 @@ class Blocks(pygame.sprite.Sprite):
     self.rect = self.image.get_rect(topleft=(self.x, self.y))  # Hitbox for collision
 
   def update(self):
-    """UPDATE - Currently empty (blocks don't animate or move)"""
+    """UPDATE - Currently empty (blocks don't animate or move); only awake blocks are updated (Game.wake)"""
     pass
 
   def draw(self, window, x_offset=0, y_offset=0):
@@ -125,30 +127,45 @@ class Soft_Block(Blocks):
   """
   def __init__ (self,game,images,group,row_num, col_num):
         super().__init__(game, images, group, row_num, col_num)
-        self.anim_timer = pygame.time.get_ticks()  # Animation timer (if needed in future)
+        self.anim_timer = self.GAME.clock.get_ticks()  # Animation timer (if needed in future)
         self.anim_frame_time = 50
 
         self.destroyed = False
         
+  def crumble(self):
+    """Crumble timer: next frame, the block is killed on the last one"""
+    self.image_index += 1
+    self.image = self.image_list[self.image_index]
+    self.anim_timer = self.GAME.clock.get_ticks()
+    if self.GAME.state_hash:
+      self.GAME.state_hash.touch(self)
+    if self.image_index >= len(self.image_list) - 1:
+      self.kill()
+      return
+    # Frames last strictly longer than anim_frame_time (ticks are whole ms)
+    self.GAME.timers.schedule(self.anim_frame_time + 1, self.crumble, owner=self)
+
   def update(self):     
     if self.destroyed:
-      if pygame.time.get_ticks() - self.anim_timer > self.anim_frame_time:
-        self.image_index += 1
-        if self.image_index >= len(self.image_list) - 1:
-           self.kill()
-        self.image = self.image_list[self.image_index]
-        self.anim_timer = pygame.time.get_ticks()
+      # Frames advance on GAME.timers (crumble()); while crumbling the block still kills what it touches
+      rect_tests = len(self.GAME.groups["player"])
+      mask_tests = 0
       for enemy in self.GAME.groups["enemies"]:
           if enemy.destroyed:
              continue
+          rect_tests += 1
           if not self.rect.colliderect(enemy):
               continue
+          mask_tests += 1
           if pygame.sprite.collide_mask(self,enemy):
                  enemy.destroy()
-      if self.rect.colliderect(self.GAME.PLAYER):
-           if pygame.sprite.collide_mask(self,self.GAME.PLAYER):
-              self.GAME.PLAYER.action = "dead_anim"
-              self.GAME.PLAYER.alive = False          
+      for player in self.GAME.groups["player"]:  # The player (every bomber in versus mode)
+        if self.rect.colliderect(player):
+           mask_tests += 1
+           if pygame.sprite.collide_mask(self,player):
+              player.action = "dead_anim"
+              player.alive = False          
+      self.GAME.collision_stats.count(SOFT_BLOCK, rect_tests, mask_tests)
       # for enemy in self.GAME.groups["enemies"]:
       #     if enemy.destroyed:
       #        continue
@@ -164,9 +181,13 @@ class Soft_Block(Blocks):
   def destroy_soft_block(self):
     """If soft block has been destroyed, change the destroyed boolean to True, and set the timer"""
     if not self.destroyed:
-      self.anim_timer = pygame.time.get_ticks()
+      self.anim_timer = self.GAME.clock.get_ticks()
       self.destroyed = True
       self.GAME.level_matrix[self.row][self.col] = "_"
+      self.GAME.wake("soft_block", self)  # Updated from now on, while it crumbles
+      self.GAME.timers.schedule(self.anim_frame_time + 1, self.crumble, owner=self)
+      if self.GAME.state_hash:
+        self.GAME.state_hash.touch(self)
       
   def __repr__(self):
     return "'@'"
@@ -184,7 +205,7 @@ class Special_Soft_Block(Soft_Block):
 
   def place_special_block(self):
       special_cell = Special(self.GAME,
-                             self.GAME.ASSETS.specials[self.special_type][0],
+                             self.GAME.sprite_set(SPECIAL, self.special_type)[0],
                              self.special_type,
                              self.GAME.groups["specials"],
                              self.special_type,
@@ -15,12 +15,13 @@
 # ============================================================================
 
 #This is character.py - defines the Character class for the Bomberman game
-from tokenize import group
 import pygame
 import gamesetting as gs
 
-# Import block classes for collision detection in explosion spreading
-from blocks import Hard_block, Soft_Block
+from collision_stats import CHECK_COLLISION, DEADLY_COLLISION
+from ecs import Animation, Collider
+from explosion import Flames, flames_hit, spawn_explosion
+from input_dispatcher import BOMB, DETONATE
 
 # ============================================================================
 # CLASS: Character - Player sprite with movement, animation, and collision
@@ -49,13 +50,13 @@ class Character(pygame.sprite.Sprite):
         self.GAME = game
 
         # Character sound
-        self.walk_sound_timer = pygame.time.get_ticks()
-        self.death_sound_timer = pygame.time.get_ticks()
+        self.walk_sound_timer = self.GAME.clock.get_ticks()
+        self.death_sound_timer = self.GAME.clock.get_ticks()
 
         self.death_sound_play = False
 
         self.delay = False
-        self.delay_timer = pygame.time.get_ticks()
+        self.delay_timer = self.GAME.clock.get_ticks()
 
         # Level matrix position (in grid tiles)
         self.row_num = row_num
@@ -71,13 +72,13 @@ class Character(pygame.sprite.Sprite):
         self.score = 0
         self.lives = 3
 
-    def input(self, events):
+    def input(self, controls):
         """
-        INPUT HANDLER - Process keyboard input for player movement
+        INPUT HANDLER - Consume the player's actions for this tick
         
         HANDLES:
-        - Event loop for QUIT and ESCAPE events (passed from main)
-        - Continuous key polling for smooth movement (WASD / Arrow keys)
+        - Buffered bomb / detonate presses (SPACE / LCTRL)
+        - Held movement keys for smooth movement (WASD / Arrow keys)
         
         MOVEMENT CONTROLS:
         - W / UP ARROW: Move up (walk_up animation)
@@ -86,51 +87,54 @@ class Character(pygame.sprite.Sprite):
         - D / RIGHT ARROW: Move right (walk_right animation)
         
         NOTES:
-        - Events are passed from Bomberman.input() via Game.input()
-        - Continuous polling with pygame.key.get_pressed() ensures smooth movement
+        - controls is the InputDispatcher, polled once per tick in Bomberman.input()
+        - A bomb press that cannot be used yet (bomb limit reached) stays
+          buffered for gs.INPUT_BUFFER_MS and is retried every tick
         - Each movement calls self.move() which handles collision detection
         """
-        # Process events passed from main (QUIT/ESCAPE)
-        for event in events:
-            if event.type == pygame.QUIT:
-                self.GAME.MAIN.running = False  
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    self.GAME.MAIN.running = False
-                elif event.key == pygame.K_SPACE:
-                    row, col, = ((self.rect.centery - gs.Y_OFFSET)//gs.SIZE, self.rect.centerx // gs.SIZE)
-                    if self.GAME.level_matrix[row][col] == "_" and self.bomb_planted < self.bomb_limit:
-                        Bomb(self.GAME, self.GAME.ASSETS.bomb["bomb"], 
-                             self.GAME.groups["bomb"], self.power ,row, col, gs.SIZE, self.remote)  
-                        print(self.bomb_planted)
-                elif event.key == pygame.K_LCTRL and self.remote and self.GAME.groups["bomb"]:
-                    bomb_list = self.GAME.groups["bomb"].sprites()
-                    bomb_list[-1].explode()
-
-        # Continuous key polling for smooth movement
-        keys_pressed = pygame.key.get_pressed() 
-        if keys_pressed[pygame.K_d] or keys_pressed[pygame.K_RIGHT]:
-            self.move("walk_right")
-        elif keys_pressed[pygame.K_a] or keys_pressed[pygame.K_LEFT]:
-            self.move("walk_left")
-        elif keys_pressed[pygame.K_w] or keys_pressed[pygame.K_UP]:
-            self.move("walk_up")
-        elif keys_pressed[pygame.K_s] or keys_pressed[pygame.K_DOWN]:
-            self.move("walk_down")
+        controls.consume(BOMB, self.plant_bomb)
+        controls.consume(DETONATE, self.detonate_bomb)
+
+        # Held (or tapped this tick) direction, sampled once by the dispatcher
+        if controls.move:
+            self.move(controls.move)
+
+    def plant_bomb(self):
+        """Plant a bomb in the cell under the player, if empty and under the bomb limit"""
+        row, col, = ((self.rect.centery - gs.Y_OFFSET)//gs.SIZE, self.rect.centerx // gs.SIZE)
+        if self.GAME.level_matrix[row][col] == "_" and self.bomb_planted < self.bomb_limit:
+            Bomb(self.GAME, self.GAME.ASSETS.bomb["bomb"], 
+                 self.GAME.groups["bomb"], self.power ,row, col, gs.SIZE, self.remote, owner=self)  
+            return True
+        return False
+
+    def detonate_bomb(self):
+        """Remote detonate the player's most recently planted bomb (requires the remote power-up)"""
+        if self.remote:
+            bomb_list = [bomb for bomb in self.GAME.groups["bomb"] if bomb.owner is self]
+            if bomb_list:
+                bomb_list[-1].explode()
+                return True
+        return False
 
     def update(self):
         """
         UPDATE - Update sprite state each frame (currently empty as movement is
         handled in move() and animation in animate())
         """
+        if self.GAME.state_hash:
+            # Input, power-ups and deaths all change the character: re-hash it every tick
+            self.GAME.state_hash.touch(self)
 
         if self.invisibility == False:
+            self.GAME.profiler.start("collision: deadly")
         # if there are flame/explosion, then perform a collision check
-            if len(self.GAME.groups["explosion"]) > 0 and self.flame_pass == False:
-                self.deadly_collision(self.GAME.groups["explosion"])
+            if self.GAME.world.size(Flames) > 0 and self.flame_pass == False:
+                self.flame_collision()
 
             # Perform collision detection with enemies
             self.deadly_collision(self.GAME.groups["enemies"])
+            self.GAME.profiler.stop("collision: deadly")
 
         # Play death animation if not alive
         if self.action == "dead_anim":
@@ -139,14 +143,6 @@ class Character(pygame.sprite.Sprite):
                 self.reset_player()
                 return    
 
-        # Invisibility Timer countdown
-        if not self.invisibility:
-            return
-        
-        if pygame.time.get_ticks() - self.invisibility_timer >= 20000:
-            self.invisibility = False
-            self.invisibility_timer = None
-
 
     def draw(self, window, x_offset=0, y_offset=0):
         if self.death_sound_play == False and self.delay == False:       
@@ -184,35 +180,35 @@ class Character(pygame.sprite.Sprite):
         """
 
         if self.delay == True:
-            if pygame.time.get_ticks() - self.delay_timer >= 400 and \
+            if self.GAME.clock.get_ticks() - self.delay_timer >= 400 and \
             self.death_sound_play == False:
                 self.death_sound_play = True
-                self.death_sound_timer = pygame.time.get_ticks()
-                self.GAME.ASSETS.sounds["BM - 09 Miss.mp3"].play()
+                self.death_sound_timer = self.GAME.clock.get_ticks()
+                self.GAME.music.play("miss", loops=0)
                 self.index = len(self.image_dict[action]) - 1
                 self.delay = False
                 return
             return
             
         if self.death_sound_play == True:
-            if pygame.time.get_ticks() - self.death_sound_timer >= 2500:
+            if self.GAME.clock.get_ticks() - self.death_sound_timer >= 2500:
                 self.reset_player()
                 return
             return
 
-        if pygame.time.get_ticks() - self.anim_time_set > self.anim_time:
+        if self.GAME.clock.get_ticks() - self.anim_time_set > self.anim_time:
             self.index += 1
             if self.index == len(self.image_dict[action]):
                 self.index = 0
                 if self.action == "dead_anim" and self.delay == False:
                     self.delay = True
-                    self.delay_timer = pygame.time.get_ticks()
+                    self.delay_timer = self.GAME.clock.get_ticks()
                     return
                     #self.reset_player()
 
             #self.index = self.index % len(self.image_dict[action])
             self.image = self.image_dict[action][self.index]
-            self.anim_time_set = pygame.time.get_ticks()
+            self.anim_time_set = self.GAME.clock.get_ticks()
 
     def check_collision(self):
         """
@@ -236,12 +232,15 @@ class Character(pygame.sprite.Sprite):
         """
                 # 1. Get a list of all blocks we are touching
         hard_hits = pygame.sprite.spritecollide(self, self.GAME.groups["hard_block"], False)
+        rect_tests = len(self.GAME.groups["hard_block"])
         
         if self.bomb_hack == False:
            bomb_hits = pygame.sprite.spritecollide(self, self.GAME.groups["bomb"], False)
+           rect_tests += len(self.GAME.groups["bomb"])
         
         if self.wall_hack == False:
            soft_hits = pygame.sprite.spritecollide(self, self.GAME.groups["soft_block"], False)
+           rect_tests += len(self.GAME.groups["soft_block"])
            if self.bomb_hack == False:
                all_hits = hard_hits + soft_hits + bomb_hits
            else:
@@ -251,6 +250,7 @@ class Character(pygame.sprite.Sprite):
                all_hits = hard_hits + bomb_hits
            else:
                all_hits = hard_hits
+        self.GAME.collision_stats.count(CHECK_COLLISION, rect_tests)
 
         # 2. Check each block to see if it is passable
         for block in all_hits:
@@ -316,12 +316,12 @@ class Character(pygame.sprite.Sprite):
 
 
         # play character sound when moving
-        if pygame.time.get_ticks() - self.walk_sound_timer >= 150:
+        if self.GAME.clock.get_ticks() - self.walk_sound_timer >= 150:
             if self.action in ["walk_left", "walk_right"]:
-                self.GAME.ASSETS.sounds["Bomberman SFX (1).wav"].play()
+                self.GAME.sfx.play("Bomberman SFX (1).wav")
             elif self.action in ["walk_up", "walk_down"]:
-                self.GAME.ASSETS.sounds["Bomberman SFX (2).wav"].play()
-            self.walk_sound_timer = pygame.time.get_ticks()
+                self.GAME.sfx.play("Bomberman SFX (2).wav")
+            self.walk_sound_timer = self.GAME.clock.get_ticks()
 
         # --- PHASE 1: MOVE X-AXIS ---
         self.x += dx
@@ -347,7 +347,9 @@ class Character(pygame.sprite.Sprite):
         self.animate(action)   
         
         # Update camera based on the center of the player (x and y)
+        self.GAME.profiler.start("camera")
         self.GAME.update_camera(self.rect.centerx, self.rect.centery)
+        self.GAME.profiler.stop("camera")
 
     def set_player_position(self):
         """Character position"""   
@@ -380,6 +382,7 @@ class Character(pygame.sprite.Sprite):
         self.flame_pass = False
         self.invisibility = False
         self.invisibility_timer = None
+        self.invisibility_expiry = None  # GAME.timers handle of end_invisibility()
 
         # CHARACTER ACTION/ANIMATION STATE
         self.action = "walk_left"  # Current animation direction
@@ -390,7 +393,7 @@ class Character(pygame.sprite.Sprite):
         # ANIMATION FRAME TRACKING
         self.index = 0  # Current frame in animation sequence
         self.anim_time = 50  # Milliseconds between frame updates
-        self.anim_time_set = pygame.time.get_ticks()  # Last frame switch time
+        self.anim_time_set = self.GAME.clock.get_ticks()  # Last frame switch time
         self.image_dict = image_dict  # Dictionary of all animation sequences
         
         # Set offset BEFORE calling set_player_images (which needs it)
@@ -419,36 +422,69 @@ class Character(pygame.sprite.Sprite):
         if self.lives < 0:
             self.GAME.game_on = False
             self.GAME.check_top_score(self.score)
-            self.GAME.start_screen_music.play(loops=-1)
+            self.GAME.music.play("title")
             self.GAME.music_playing = False
             #self.GAME.MAIN.running = False
             return
         self.GAME.regenerate_stage()
+        self.GAME.timers.cancel(self.invisibility_expiry)
         self.set_player(self.image_dict)
 
     def deadly_collision(self, group):
         if not self.alive:
             return
 
-        for item in group:
+        mask_tests = 0
+        for checked, item in enumerate(group, 1):
             if not self.rect.colliderect(item.rect):
                 continue    
+            mask_tests += 1
             if pygame.sprite.collide_mask(self, item):
-                self.action = "dead_anim"
-                self.alive = False
-                self.GAME.bg_music.stop()
-                self.GAME.bg_music_special.stop()
-                self.GAME.ASSETS.sounds["Bomberman SFX (5).wav"].play()              
+                self.GAME.collision_stats.count(DEADLY_COLLISION, checked, mask_tests)
+                self.die()
                 return
+        self.GAME.collision_stats.count(DEADLY_COLLISION, len(group), mask_tests)
+
+    def flame_collision(self):
+        """deadly_collision against the flame cells of every blast (GAME.world entities)"""
+        if not self.alive:
+            return
+
+        checked = mask_tests = 0
+        for _, collider, flames, animation in self.GAME.world.query(Collider, Flames, Animation):
+            checked += 1
+            if not self.rect.colliderect(collider.rect):
+                continue
+            mask_tests += 1
+            if flames_hit(flames, animation.index, self):
+                self.GAME.collision_stats.count(DEADLY_COLLISION, checked, mask_tests)
+                self.die()
+                return
+        self.GAME.collision_stats.count(DEADLY_COLLISION, checked, mask_tests)
+
+    def die(self):
+        """Start the death animation"""
+        self.action = "dead_anim"
+        self.alive = False
+        self.GAME.music.stop()
+        self.GAME.sfx.play("Bomberman SFX (5).wav")
     
+    def end_invisibility(self):
+        """Invisibility timer (specials.Special.invisible_special) ran out"""
+        self.invisibility = False
+        self.invisibility_timer = None
+        self.invisibility_expiry = None
+
     def update_score(self,score):
         """UPDATE THE PLAYER SCORE"""
         self.score += score
         
 class Bomb(pygame.sprite.Sprite):
-    def __init__(self,game, image_list, group, power, row_num, col_num, size, remote):
+    def __init__(self,game, image_list, group, power, row_num, col_num, size, remote, owner=None):
         super().__init__(group)
         self.GAME = game
+        # Character that planted the bomb (its bomb_planted count is updated)
+        self.owner = owner if owner is not None else game.PLAYER
 
         # Level matrix position (in grid tiles)
         self.row = row_num
@@ -476,21 +512,23 @@ class Bomb(pygame.sprite.Sprite):
         # Animation Settings
         self.anim_length = len(self.image_list)
         self.anim_frame_time = 200  # milliseconds per frame
-        self.anim_timer = pygame.time.get_ticks()
+        self.anim_timer = self.GAME.clock.get_ticks()
+        # Each fuse frame is a timer; the last one detonates the bomb
+        self.GAME.timers.schedule(self.anim_frame_time, self.animation, owner=self)
 
         # Insert into level matrix
         self.insert_bomb_into_grid()
+        # Updated until the owner has stepped off it (planted_bomb_player_collision)
+        self.GAME.wake("bomb", self)
 
         # Play sound when bomb is place
-        self.GAME.ASSETS.sounds["Bomberman SFX (3).wav"].play()
+        self.GAME.sfx.play("Bomberman SFX (3).wav")
 
     def update(self):
         # Keep the collision rect in sync with the bomb's fixed world position.
         # Do NOT change self.x/self.y here; bombs are stationary after placement.
-        self.animation()
+        # The fuse runs on GAME.timers (animation())
         self.planted_bomb_player_collision()
-        if self.bomb_counter == self.bomb_timer and not self.remote:
-            self.explode()
 
         self.rect.topleft = (int(self.x), int(self.y))
 
@@ -512,15 +550,21 @@ class Bomb(pygame.sprite.Sprite):
     def insert_bomb_into_grid(self):
         """Add the bomb object to the level matrix"""
         self.GAME.level_matrix[self.row][self.col] = self
-        self.GAME.PLAYER.bomb_planted += 1
+        self.owner.bomb_planted += 1
         
     def animation(self):
-        if pygame.time.get_ticks() - self.anim_timer >= self.anim_frame_time:
-            self.index += 1
-            self.index = self.index % self.anim_length
-            self.image = self.image_list[self.index]
-            self.anim_timer = pygame.time.get_ticks()
-            self.bomb_counter += 1
+        """Fuse timer: next frame, and detonation on the last count (remote bombs wait for detonate_bomb)"""
+        self.index += 1
+        self.index = self.index % self.anim_length
+        self.image = self.image_list[self.index]
+        self.anim_timer = self.GAME.clock.get_ticks()
+        self.bomb_counter += 1
+        if self.GAME.state_hash:
+            self.GAME.state_hash.touch(self)
+        if self.bomb_counter == self.bomb_timer and not self.remote:
+            self.explode()
+            return
+        self.GAME.timers.schedule(self.anim_frame_time, self.animation, owner=self)
 
     def remove_bomb_from_grid(self):
         """Remove the bomb object from the level matrix"""
@@ -529,172 +573,23 @@ class Bomb(pygame.sprite.Sprite):
         # self.GAME.PLAYER.bomb_planted += 1
         
         # NEW CODE (FIX - decrement to reflect bomb removal):
-        self.GAME.PLAYER.bomb_planted -= 1  # Subtract 1 so player can plant again
+        self.owner.bomb_planted -= 1  # Subtract 1 so the owner can plant again
 
     def explode(self):
         """Destroy the bomb and remove from the level matrix"""    
         self.kill()
-        Explosion(self.GAME, self.GAME.ASSETS.explosion, "centre", self.power, 
-                  self.GAME.groups["explosion"], self.row, self.col, self.size)
+        spawn_explosion(self.GAME, self.power, self.row, self.col)
         
         self.remove_bomb_from_grid()
 
     def planted_bomb_player_collision(self):
         if not self.passable:
             return
-        if not self.rect.colliderect(self.GAME.PLAYER):
+        if not self.rect.colliderect(self.owner):
             self.passable = False
+            self.GAME.sleep("bomb", self)  # Nothing left to update
+            if self.GAME.state_hash:
+                self.GAME.state_hash.touch(self)
 
     def __repr__(self):
-        return "'!'"         
-            
-class Explosion(pygame.sprite.Sprite):
-    def __init__(self, game, image_dict, image_type, power, group, row_num, col_num, size):
-        super().__init__(group)
-        self.GAME = game
-
-        # Level matrix position (in grid tiles)
-        self.row_num = row_num
-        self.col_num = col_num
-
-        # Sprite Coordinates
-        self.size = size
-        self.y = (self.row_num * self.size) + gs.Y_OFFSET
-        self.x = self.col_num * self.size
-
-        # Explosion Image and animation
-        self.index = 0
-        self.anim_frame_time = 75 
-        self.anim_timer = pygame.time.get_ticks()
-
-        self.image_dict = image_dict    
-        self.image_type = image_type 
-
-        self.image = self.image_dict[self.image_type][self.index]
-        self.rect = self.image.get_rect(topleft=(self.x, self.y))
-
-        # Streng 
-        self.power = power
-        self.passable = False
-        self.calculate_explosion_path()
-
-        # Play explosin sound
-        self.GAME.ASSETS.sounds["Bomberman SFX (7).wav"].play()
-
-
-    def update(self):
-        self.animate()
-    
-    def draw(self, window, x_offset=0, y_offset=0):
-        """Render explosion sprite with camera offsets applied to both axes."""
-        window.blit(self.image, (int(self.x) - int(x_offset), int(self.y) - int(y_offset)))
-
-    def animate(self):
-        if pygame.time.get_ticks() - self.anim_timer >= self.anim_frame_time:
-            self.index += 1
-            if self.index == len(self.image_dict[self.image_type]):
-                self.kill()
-                return
-            self.image = self.image_dict[self.image_type][self.index]
-            self.anim_timer = pygame.time.get_ticks()        
-
-    def calculate_explosion_path(self):
-        """Explode adjacent cells, depedent on power and available cells"""        
-        #                   left, right, up, down    
-        valid_directions = [True, True, True, True]
-        for power_cell in range(self.power):
-            # Get a list of the 4 directions, tuple of cell values
-            directions = self.calculate_direction_cells(power_cell)
-            # Check the cells in each direction per the directions list above
-            for ind, dir in enumerate (directions):
-                # If the corresponding direction is still valid_directions is False, skip
-                if not valid_directions[ind]:
-                    continue
-                # If the current cell being checked is an empty cells, check the next cell in that direction
-                # To determine type of image display, wether it is a mid or end
-                if self.GAME.level_matrix[dir[0]][dir[1]] == "_":
-                    # If the end of the power range, use the end piece
-                    if power_cell == self.power - 1:
-                        FireBall(self.image_dict[dir[4]], self.GAME.groups["explosion"], dir[0], dir[1], gs.SIZE)
-                    # Check if the next cell in sequence is a barrier, use end piece if true, and change valid_directions
-                    # to false
-                    elif self.GAME.level_matrix[dir[2]][dir[3]] in self.GAME.groups["hard_block"].sprites():
-                        FireBall(self.image_dict[dir[4]], self.GAME.groups["explosion"], dir[0], dir[1], gs.SIZE)
-                        valid_directions[ind] = False
-                    # If next cell in sequence is not a barrier, and not the end of the flame power, use mid image
-                    else:
-                        FireBall(self.image_dict[dir[5]], self.GAME.groups["explosion"], dir[0], dir[1], gs.SIZE)    
-                # if the current cell being checked is not empty, but is a bomb, detonate the bomb
-                elif self.GAME.level_matrix[dir[0]][dir[1]] in self.GAME.groups["bomb"].sprites():
-                     self.GAME.level_matrix[dir[0]][dir[1]].explode()   
-                     valid_directions[ind] = False
-                # If the current cell being checked is not empty, but is a soft box - destroy it
-                elif self.GAME.level_matrix[dir[0]][dir[1]] in self.GAME.groups["soft_block"].sprites():
-                     self.GAME.level_matrix[dir[0]][dir[1]].destroy_soft_block()
-                     valid_directions[ind] = False   
-                # If the current cell being checked is not empty, but is a special box
-                elif self.GAME.level_matrix[dir[0]][dir[1]] in self.GAME.groups["specials"].sprites():
-                     self.GAME.level_matrix[dir[0]][dir[1]].hit_by_explosion()
-                     valid_directions[ind] = False
-                # If the current cell being checked is not empty, or a bomb, or a soft block, or special
-                else:
-                    valid_directions[ind] = False
-                    continue
-
-
-    def calculate_direction_cells(self,cell):
-        """Return a list of the four cells in the up and down, left and right directions"""        
-        left = (self.row_num, self.col_num - (cell + 1), # Check cell immediate left
-                self.row_num, self.col_num - (cell + 2), # Check cell left to that
-                "left_end", "left_mid")
-        right = (self.row_num, self.col_num + (cell + 1), # Check cell immediate right
-                self.row_num, self.col_num + (cell + 2), # Check cell right to that
-                "right_end", "right_mid")
-        up = (self.row_num - (cell +1), self.col_num,  # Check all immediete up
-              self.row_num - (cell + 2), self.col_num, # Check cell up to that
-              "up_end", "up_mid")
-        down = (self.row_num + (cell +1), self.col_num,  # Check all immediete down
-              self.row_num + (cell + 2), self.col_num, # Check cell below to that
-              "down_end", "down_mid")
-        return [left, right, up, down]      
-        
-class FireBall(pygame.sprite.Sprite):
-    def __init__(self, image_list, group, row_num, col_num, size):
-        super().__init__(group)
-        self.row_num = row_num
-        self.col_num = col_num
-
-        self.size = size
-
-        # Coordinates
-        self.y = self.row_num * self.size + gs.Y_OFFSET
-        self.x = self.col_num * self.size
-
-        # Image
-        self.index = 0
-        self.anim_frame_time = 75
-        self.anim_timer = pygame.time.get_ticks()
-        self.image_list = image_list
-        self.image = self.image_list[self.index]
-        self.rect = self.image.get_rect(topleft=(self.x, self.y))
-
-        self.passable = False
-
-
-    def update(self):
-        # Keep rect synced with world position for collision detection
-        self.rect.topleft = (int(self.x), int(self.y))
-        self.animate()
-
-    def draw(self, window, x_offset=0, y_offset=0):
-        """Render fireball sprite with camera offsets applied to both axes."""
-        window.blit(self.image, (int(self.x) - int(x_offset), int(self.y) - int(y_offset)))        
-
-    def animate(self):
-        if pygame.time.get_ticks() - self.anim_timer >= self.anim_frame_time:
-            self.index += 1
-            if self.index == len(self.image_list):
-                self.kill()
-                return
-            self.image = self.image_list[self.index]
-            self.anim_timer = pygame.time.get_ticks()
+        return "'!'"
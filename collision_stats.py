@@ -0,0 +1,118 @@
+# ============================================================================
+# FILE: collision_stats.py - COLLISION QUERY COUNTERS
+# ============================================================================
+# PURPOSE:
+#   Counts the collision work done by every collision entry point, per frame:
+#   - calls: how many times the entry point ran
+#   - rects: rectangle tests (colliderect / spritecollide / clipline)
+#   - masks: pixel mask tests (collide_mask)
+#
+#   Entry points report once per call with count(), so the tight loops in
+#   the game are not slowed down by per-iteration bookkeeping. Counting is
+#   off in normal play: count() and end_frame() return at once unless
+#   gs.COLLISION_STATS (or a log interval) turns it on, or a tool sets
+#   `enabled` (benchmark.py does).
+#
+# QUERY API:
+#   last_frame()      -> {entry point: (calls, rects, masks)} for the last frame
+#   averages()        -> {entry point: (calls, rects, masks)} per frame, since reset
+#   totals()          -> cumulative counts since reset
+#   summary_line(game)-> one log line with per-frame counts since the previous
+#                        line, next to the current entity counts
+#
+#   When gs.COLLISION_LOG_INTERVAL is non-zero, Game prints summary_line()
+#   at that interval (milliseconds of game time).
+#
+# DEPENDENCIES:
+#   - gamesetting: On/off switch, log interval
+# ============================================================================
+
+import gamesetting as gs
+
+# Entry point names, in report order
+CHECK_COLLISION = "Character.check_collision"
+DEADLY_COLLISION = "Character.deadly_collision"
+ENEMY_BLOCKS = "Enemy.collision_detection_blocks"
+ENEMY_LOS = "Enemy.intersecting_items_with_LoS"
+EXPLOSION_HITS = "explosion.flame_system"
+SOFT_BLOCK = "Soft_Block.update"
+ENTRY_POINTS = [CHECK_COLLISION, DEADLY_COLLISION, ENEMY_BLOCKS, ENEMY_LOS, EXPLOSION_HITS, SOFT_BLOCK]
+
+
+class CollisionStats:
+  def __init__(self, log_interval=gs.COLLISION_LOG_INTERVAL, enabled=gs.COLLISION_STATS):
+    self.enabled = enabled or bool(log_interval)
+    self.log_interval = log_interval
+    self.last_log = None
+    self.reset()
+
+  def reset(self):
+    """Zero every counter."""
+    self.current = {name: [0, 0, 0] for name in ENTRY_POINTS}
+    self.previous = {name: (0, 0, 0) for name in ENTRY_POINTS}
+    self.cumulative = {name: [0, 0, 0] for name in ENTRY_POINTS}
+    self.frames = 0
+    self.interval = {name: [0, 0, 0] for name in ENTRY_POINTS}  # Since the last log line
+    self.interval_frames = 0
+
+  def count(self, name, rects=0, masks=0):
+    """Record one call of an entry point and the tests it performed."""
+    if not self.enabled:
+      return
+    counts = self.current[name]
+    counts[0] += 1
+    counts[1] += rects
+    counts[2] += masks
+
+  def end_frame(self, game=None):
+    """Close the current frame's counters (called once per Game.update)."""
+    if not self.enabled:
+      return
+    for name, counts in self.current.items():
+      self.previous[name] = tuple(counts)
+      for total in (self.cumulative[name], self.interval[name]):
+        total[0] += counts[0]
+        total[1] += counts[1]
+        total[2] += counts[2]
+      counts[0] = counts[1] = counts[2] = 0
+    self.frames += 1
+    self.interval_frames += 1
+
+    if self.log_interval and game is not None:
+      now = game.clock.get_ticks()
+      if self.last_log is None:
+        self.last_log = now
+      elif now - self.last_log >= self.log_interval:
+        self.last_log = now
+        print(self.summary_line(game))
+
+  def last_frame(self, name=None):
+    """Counts for the last completed frame (all entry points, or just `name`)."""
+    if name is not None:
+      return self.previous[name]
+    return dict(self.previous)
+
+  def totals(self, name=None):
+    """Cumulative counts since the last reset()."""
+    if name is not None:
+      return tuple(self.cumulative[name])
+    return {key: tuple(value) for key, value in self.cumulative.items()}
+
+  def averages(self, name=None):
+    """Average counts per frame since the last reset()."""
+    averages = self._per_frame(self.cumulative, self.frames)
+    return averages[name] if name is not None else averages
+
+  def summary_line(self, game):
+    """One line: per-frame calls/rects/masks since the previous line, then entity counts."""
+    entities = " ".join(f"{key}={len(group)}" for key, group in game.groups.items())
+    averages = self._per_frame(self.interval, self.interval_frames)
+    self.interval = {name: [0, 0, 0] for name in ENTRY_POINTS}
+    self.interval_frames = 0
+    parts = [f"{name} {c:g}/{r:g}/{m:g}" for name, (c, r, m) in averages.items()]
+    return f"[collision] per frame calls/rects/masks | {' | '.join(parts)} || {entities}"
+
+  @staticmethod
+  def _per_frame(counters, frames):
+    frames = max(1, frames)
+    return {key: tuple(round(v / frames, 2) for v in value) for key, value in counters.items()}
@@ -0,0 +1,175 @@
+# ============================================================================
+# FILE: ecs.py - ENTITY-COMPONENT STORE
+# ============================================================================
+# PURPOSE:
+#   Game objects that need none of the sprite machinery (group membership,
+#   a GAME back-reference, update()/draw() dispatched per object, a
+#   __dict__ per instance) live in a World instead:
+#   - An entity is an int id. Its data is split into components, small
+#     __slots__ classes: Position, Image, Animation, Collider, Timer (plus
+#     game-specific ones, e.g. info_panel.ScorePopup, explosion.Flames)
+#   - The World keeps one store per component class (entity -> component)
+#   - Systems are plain loops over query(A, B, ...), which walks the
+#     smallest of the stores involved, so a system only visits entities
+#     that have every component it needs
+#   - Game.advance() calls World.update() once per tick, right after
+#     GAME.timers (animation_system: frames of every Animation, and the
+#     end of non-looping ones); game-specific systems (explosion.py) are
+#     called from Game.advance()/draw() where the sprites they touch are
+#   - Game.draw() calls World.draw() (render_system) after the sprite
+#     groups
+#   - A Timer component is put on GAME.timers when its entity is created:
+#     expire() runs its on_expire and destroys the entity, without a
+#     per-tick system
+#
+# ENTITIES IN THE WORLD:
+#   - Score popups (info_panel.spawn_score_popup)
+#   - Bomb blasts (explosion.spawn_explosion)
+# ============================================================================
+
+
+# ============================================================================
+# COMPONENTS
+# ============================================================================
+class Position:
+  """World pixel position of the top-left corner, like a sprite's x/y."""
+  __slots__ = ("x", "y")
+
+  def __init__(self, x, y):
+    self.x = x
+    self.y = y
+
+
+class Image:
+  """Still image drawn at the entity's Position."""
+  __slots__ = ("image",)
+
+  def __init__(self, image):
+    self.image = image
+
+
+class Animation:
+  """Frame index of a looping or one-shot animation; the images are up to whoever draws it."""
+  __slots__ = ("index", "length", "frame_time", "timer", "loop")
+
+  def __init__(self, length, frame_time, timer, loop=True):
+    self.index = 0
+    self.length = length           # Frames in the animation
+    self.frame_time = frame_time   # ms per frame
+    self.timer = timer             # When the current frame started
+    self.loop = loop               # False: the entity is destroyed after the last frame
+
+
+class Collider:
+  """Broad-phase rectangle in world pixels."""
+  __slots__ = ("rect",)
+
+  def __init__(self, rect):
+    self.rect = rect
+
+
+class Timer:
+  __slots__ = ("start", "duration", "on_expire")
+
+  def __init__(self, start, duration, on_expire=None):
+    """on_expire(world, entity) runs once `duration` ms after `start` (GAME.timers); the entity is then destroyed."""
+    self.start = start
+    self.duration = duration
+    self.on_expire = on_expire
+
+
+# ============================================================================
+# WORLD
+# ============================================================================
+class World:
+  def __init__(self, game, listener=None):
+    """listener: gets entity_added(world, entity, kind) / entity_removed(entity) (the state hash)."""
+    self.game = game
+    self.clock = game.clock
+    self.listener = listener
+    self.stores = {}     # Component class -> {entity: component}
+    self.kinds = {}      # entity -> kind name
+    self.next_id = 1
+
+  def create(self, kind, *components):
+    entity = self.next_id
+    self.next_id += 1
+    self.kinds[entity] = kind
+    for component in components:
+      self.stores.setdefault(type(component), {})[entity] = component
+      if type(component) is Timer:
+        self.game.timers.schedule(component.start + component.duration - self.clock.get_ticks(),
+                                  self.expire, entity)
+    if self.listener:
+      self.listener.entity_added(self, entity, kind)
+    return entity
+
+  def destroy(self, entity):
+    if self.kinds.pop(entity, None) is None:
+      return
+    for store in self.stores.values():
+      store.pop(entity, None)
+    if self.listener:
+      self.listener.entity_removed(entity)
+
+  def expire(self, entity):
+    timer = self.get(entity, Timer)
+    if timer is None:
+      return   # Destroyed before its time was up
+    if timer.on_expire:
+      timer.on_expire(self, entity)
+    self.destroy(entity)
+
+  def clear(self):
+    for entity in list(self.kinds):
+      self.destroy(entity)
+
+  def get(self, entity, component_class):
+    return self.stores.get(component_class, {}).get(entity)
+
+  def query(self, *component_classes):
+    """(entity, component...) for every entity that has all the classes given."""
+    stores = [self.stores.get(component_class, {}) for component_class in component_classes]
+    smallest = min(stores, key=len)
+    for entity in list(smallest):   # Systems may destroy entities while iterating
+      if entity in smallest and all(entity in store for store in stores):
+        yield (entity, *[store[entity] for store in stores])
+
+  def size(self, component_class):
+    """Number of entities that have a `component_class` component."""
+    return len(self.stores.get(component_class, ()))
+
+  def entities(self, kind):
+    return [entity for entity, entity_kind in self.kinds.items() if entity_kind == kind]
+
+  def count(self, kind=None):
+    if kind is None:
+      return len(self.kinds)
+    return sum(1 for entity_kind in self.kinds.values() if entity_kind == kind)
+
+  def update(self):
+    animation_system(self, self.clock.get_ticks())
+
+  def draw(self, window, x_offset=0, y_offset=0):
+    render_system(self, window, x_offset, y_offset)
+
+
+# ============================================================================
+# SYSTEMS
+# ============================================================================
+def animation_system(world, now):
+  for entity, animation in world.query(Animation):
+    if now - animation.timer < animation.frame_time:
+      continue
+    animation.index += 1
+    if animation.index == animation.length:
+      if not animation.loop:
+        world.destroy(entity)
+        continue
+      animation.index = 0
+    animation.timer = now
+
+
+def render_system(world, window, x_offset, y_offset):
+  for _, position, image in world.query(Position, Image):
+    window.blit(image.image, (int(position.x) - int(x_offset), int(position.y) - int(y_offset)))
@@ -1,7 +1,10 @@
 import pygame
 import gamesetting as gs
-from info_panel import Scoring
-from random import choice
+from info_panel import spawn_score_popup
+from collision_stats import ENEMY_BLOCKS, ENEMY_LOS
+
+# Grid step (col, row) per walking direction
+DIRECTION_STEPS = {"left": (-1, 0), "right": (1, 0), "up": (0, -1), "down": (0, 1)}
 
 class Enemy(pygame.sprite.Sprite):
   def __init__(self, game, image_dict, group, type, row_num, col_num, size):
@@ -31,7 +34,7 @@ class Enemy(pygame.sprite.Sprite):
     self.direction = 'left'  # Initial direction
     self.dir_mvmt = {"left": -self.speed, "right": self.speed,
                      "up": -self.speed, "down": self.speed}
-    self.change_dir_timer = pygame.time.get_ticks()
+    self.change_dir_timer = self.GAME.clock.get_ticks()
     self.dir_time = 1500 # Time in milliseconds before changing direction
 
 
@@ -40,7 +43,12 @@ class Enemy(pygame.sprite.Sprite):
     self.action = f"walk_{self.direction}"
     self.image_dict = image_dict
     self.anim_frame_time = 100  # Time per frame in milliseconds
-    self.anim_timer = pygame.time.get_ticks()
+    self.anim_timer = self.GAME.clock.get_ticks()  # Death animation timing
+    # Walk cycle frame, shared by every enemy of this type; the phase (from the spawn
+    # cell) keeps neighbours from stepping in lockstep
+    self.walk_clock = self.GAME.anim_clocks.get(self.type, self.anim_frame_time,
+                                                len(self.image_dict[self.action]))
+    self.walk_phase = (row_num + col_num) % self.walk_clock.length
 
 
     self.image = self.image_dict[self.action][self.index]
@@ -50,8 +58,30 @@ class Enemy(pygame.sprite.Sprite):
     self.start_pos = self.rect.center
     self.end_pos = self.GAME.PLAYER.rect.center
 
+    # Level of detail (gs.ENEMY_LOD): ticks not yet walked in a far tier, and ticks to the
+    # next coarse step (staggered by spawn cell so far enemies do not all step together)
+    self.lod_skipped = 0
+    self.lod_countdown = 1 + (row_num + col_num) % gs.ENEMY_LOD_TIERS[0][1]
+
 
   def update(self):
+   interval = self.lod_interval()
+   if interval > 1:
+     # Far from every bomber: a coarse step every `interval` ticks, no LoS or animation
+     self.lod_skipped += 1
+     self.lod_countdown -= 1
+     if self.lod_countdown <= 0:
+       self.coarse_movement(self.lod_skipped)
+       self.lod_skipped = 0
+       self.lod_countdown = interval
+     return
+   if self.lod_skipped:
+     # Back near a bomber: walk the ticks skipped so far, then full updates again
+     if not self.destroyed:
+       self.coarse_movement(self.lod_skipped)
+     self.lod_skipped = 0
+   if self.GAME.state_hash:
+     self.GAME.state_hash.touch(self)
    self.movement()
    self.update_line_of_sight_with_player()
    self.animate()
@@ -111,38 +141,110 @@ class Enemy(pygame.sprite.Sprite):
     self.rect.update(self.x, self.y, self.size, self.size)
 
 
+  def lod_interval(self):
+    """Ticks between updates: 1 (full fidelity) near a bomber, more in the far tiers of gs.ENEMY_LOD_TIERS"""
+    if not gs.ENEMY_LOD or self.destroyed:
+      return 1
+    margin = gs.ENEMY_LOD_MARGIN * self.size
+    screens = None
+    for bomber in self.GAME.groups["player"]:
+      x_dist = abs(bomber.x - self.x)
+      y_dist = abs(bomber.y - self.y)
+      if self.chase_player and x_dist <= self.LoS and y_dist <= self.LoS:
+        return 1   # Close enough to start chasing
+      distance = max((x_dist - margin) / gs.SCREENWIDTH, (y_dist - margin) / gs.SCREENHEIGHT)
+      if screens is None or distance < screens:
+        screens = distance
+    interval = 1
+    if screens is not None:
+      for tier_screens, tier_interval in gs.ENEMY_LOD_TIERS:
+        if screens > tier_screens:
+          interval = tier_interval
+    return interval
+
+  def coarse_movement(self, ticks):
+    """Far tier: walk `ticks` ticks worth of distance at once, from grid point to grid point.
+    Walls are read from the level matrix instead of testing rects; turns use the same rules
+    (and GAME.random) as movement()"""
+    distance = self.speed * ticks
+    turns = 0
+    while distance > 0:
+      col_step, row_step = DIRECTION_STEPS[self.action.split("_")[1]]
+      offset = (self.x if col_step else self.y - gs.Y_OFFSET) % self.size
+      if self.x % self.size == 0 and (self.y - gs.Y_OFFSET) % self.size == 0:
+        # On a grid point: timed turn at intersections
+        self.change_direction(["left","right","up","down"])
+        col_step, row_step = DIRECTION_STEPS[self.action.split("_")[1]]
+      # Cell the front edge walks into (between two cells, walking left/up, that is the current one)
+      row = int(self.y - gs.Y_OFFSET) // self.size
+      col = int(self.x // self.size)
+      if offset == 0 or col_step + row_step > 0:
+        row += row_step
+        col += col_step
+      if not self.can_enter(row, col):
+        # Blocked: back to the grid point behind and turn, like movement() on a collision
+        if offset:
+          back = offset if col_step + row_step > 0 else self.size - offset
+          self.x -= col_step * back
+          self.y -= row_step * back
+        if turns == 4:
+          break   # Boxed in: wait for the next step
+        turns += 1
+        directions = ["left","right","up","down"]
+        directions.remove(self.action.split("_")[1])
+        self.action = f"walk_{self.GAME.random.choice(directions)}"
+        self.change_dir_timer = self.GAME.clock.get_ticks()
+        continue
+      # Walk up to the next grid point
+      to_point = self.size - offset if col_step + row_step > 0 else (offset or self.size)
+      step = min(distance, to_point)
+      self.x += col_step * step
+      self.y += row_step * step
+      distance -= step
+    self.rect.update(self.x, self.y, self.size, self.size)
+    if self.GAME.state_hash:
+      self.GAME.state_hash.touch(self)
+
+  def can_enter(self, row, col):
+    """Cell open to a walking enemy: empty or a special, and no soft block crumbling in it"""
+    cell = self.GAME.level_matrix[row][col]
+    if cell != "_":
+      return cell in self.GAME.groups["specials"]
+    return not any(block.row == row and block.col == col for block in self.GAME.awake["soft_block"])
+
   def collision_detection_blocks(self, group, direction):
      # Collision detection 
-    for block in group:
+    for checked, block in enumerate(group, 1):
       # compare each block for collision with enemy char rect
       if block.rect.colliderect(self.rect):
         # Reverse direction upon collision
         if direction == "left" and self.rect.right > block.rect.right:
            self.x = block.rect.right
-           return direction
-        if direction == "right" and self.rect.left < block.rect.left:
+        elif direction == "right" and self.rect.left < block.rect.left:
            self.x = block.rect.left - self.size
-           return direction
-        if direction == "up" and self.rect.bottom > block.rect.bottom:
+        elif direction == "up" and self.rect.bottom > block.rect.bottom:
            self.y = block.rect.bottom
-           return direction
-        if direction == "down" and self.rect.top < block.rect.top:
+        elif direction == "down" and self.rect.top < block.rect.top:
            self.y = block.rect.top - self.size     
-           return direction   
+        else:
+           continue
+        self.GAME.collision_stats.count(ENEMY_BLOCKS, checked)
+        return direction   
+    self.GAME.collision_stats.count(ENEMY_BLOCKS, len(group))
     return None    
   
   def new_direction(self,group,move_direction,directions):
       dir = self.collision_detection_blocks(group, move_direction) 
       if dir:   
         directions.remove(dir)
-        new_direction = choice(directions) 
+        new_direction = self.GAME.random.choice(directions) 
         self.action = f"walk_{new_direction}"
-        self.change_dir_timer = pygame.time.get_ticks()
+        self.change_dir_timer = self.GAME.clock.get_ticks()
 
   def change_direction(self, direction_list):
     """Randomly change direction after a set amount of time elapsed"""       
     # If timer has not elapsed, return out of method
-    if pygame.time.get_ticks() - self.change_dir_timer < self.dir_time:
+    if self.GAME.clock.get_ticks() - self.change_dir_timer < self.dir_time:
       return
     
     # If enemy coordinates do not alight with the grid coordinates
@@ -161,11 +263,11 @@ class Enemy(pygame.sprite.Sprite):
     self.determine_if_direction_valid(direction_list,row,col)
 
     # Randomly select a new direction from the remaining list of directions
-    new_direction = choice(direction_list)
+    new_direction = self.GAME.random.choice(direction_list)
     self.action = f"walk_{new_direction}"
 
     # Reset the change direction timer
-    self.change_dir_timer = pygame.time.get_ticks()
+    self.change_dir_timer = self.GAME.clock.get_ticks()
     return
   
   def determine_if_direction_valid(self,directions,row,col):  
@@ -187,21 +289,30 @@ class Enemy(pygame.sprite.Sprite):
 
   def animate(self):
     """ Cycle through enemy animation images"""
-    if pygame.time.get_ticks() - self.anim_timer >= self.anim_frame_time:
+    # Walk cycle: this type's shared clock, at this enemy's phase. The death animation is timed per enemy
+    if not self.destroyed:
+      self.index = self.walk_clock.frame_at(self.walk_phase)
+      self.image = self.image_dict[self.action][self.index]
+      return
+    if self.GAME.clock.get_ticks() - self.anim_timer >= self.anim_frame_time:
       self.index += 1
       if self.destroyed and self.index == len(self.image_dict[self.action]):
         self.kill()
-        Scoring(self.GAME, self.GAME.groups["scores"],gs.SCORES[self.type], self.x, self.y)
+        spawn_score_popup(self.GAME, gs.SCORES[self.type], self.x, self.y)
       self.index = self.index % len(self.image_dict[self.action])  
       self.image = self.image_dict[self.action][self.index]
-      self.anim_timer = pygame.time.get_ticks()
+      self.anim_timer = self.GAME.clock.get_ticks()
 
   def destroy(self):
     """Deactivate the enemy when killed"""    
+    if not self.destroyed:
+      self.anim_timer = self.GAME.clock.get_ticks()  # Death frames are timed from here
     self.destroyed = True
     self.index = 0
     self.action = "death"
     self.image = self.image_dict[self.action][self.index]
+    if self.GAME.state_hash:
+      self.GAME.state_hash.touch(self)   # Far-tier enemies are not touched by update() this tick
 
   def update_line_of_sight_with_player(self):
     """ Update the position of the enemy and player character"""  
@@ -227,7 +338,7 @@ class Enemy(pygame.sprite.Sprite):
     elif enemy_row < player_row and (self.x % self.size) + 32 == self.size//2:  
       self.action = "walk_down"
 
-    self.change_dir_timer = pygame.time.get_ticks()
+    self.change_dir_timer = self.GAME.clock.get_ticks()
     
 
   def check_LoS_distance(self):
@@ -240,7 +351,10 @@ class Enemy(pygame.sprite.Sprite):
   
   def intersecting_items_with_LoS(self,group):
     """Retrun True of False, if item obstructing LoS"""
-    for item in self.GAME.groups[group]:
+    items = self.GAME.groups[group]
+    for checked, item in enumerate(items, 1):
       if item.rect.clipline(self.start_pos, self.end_pos):
+        self.GAME.collision_stats.count(ENEMY_LOS, checked)
         return True
+    self.GAME.collision_stats.count(ENEMY_LOS, len(items))
     return False  
\ No newline at end of file
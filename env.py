@@ -0,0 +1,221 @@
+# ============================================================================
+# FILE: env.py - REINFORCEMENT LEARNING ENVIRONMENT
+# ============================================================================
+# PURPOSE:
+#   Wraps Game and Character in a Gym-style reset()/step() interface so that
+#   agents can be trained against the game.
+#   - Runs headless on a fixed-step clock (one step = one frame at gs.FPS)
+#   - Actions map to the player's controls (moves, SPACE bomb, LCTRL remote)
+#   - Observations are a single float32 tensor of shape
+#     (len(OBS_CHANNELS), gs.ROWS, gs.COLS)
+#
+# OBSERVATION ENCODING:
+#   Grid layers are filled from the sprite groups with NumPy fancy indexing
+#   (one array write per group), so no per-cell Python objects are built.
+#   The hard block layer never changes within a stage and is cached.
+#   Player stats are broadcast as constant planes so the whole observation
+#   stays one tensor.
+#
+# DEPENDENCIES:
+#   - numpy: Observation tensor
+#   - headless: Window-less Game construction
+#   - gamesetting: Grid dimensions, FPS
+# ============================================================================
+
+import numpy as np
+import pygame
+import gamesetting as gs
+from headless import make_game, skip_transition
+from explosion import Flames
+
+# Discrete action set: index -> name
+ACTIONS = ["noop", "walk_up", "walk_down", "walk_left", "walk_right", "bomb", "detonate"]
+
+# Observation planes, in order
+OBS_CHANNELS = [
+  "hard_block",   # 1 where an indestructible wall is
+  "soft_block",   # 1 where a destructible block is (including hidden specials)
+  "bomb",         # Fuse progress of a planted bomb (0..1, remote bombs stay at 1)
+  "special",      # 1 where a revealed power-up or exit lies
+  "blast",        # 1 where a flame is currently burning
+  "enemy",        # Number of living enemies in the cell
+  "player",       # 1 in the player's cell
+  "lives",        # Player stats, broadcast over the grid ...
+  "bomb_limit",
+  "power",
+  "speed",
+  "remote",
+  "wall_hack",
+  "bomb_pass",
+  "flame_pass",
+  "invisible",
+  "time_left",
+]
+
+# Rewards
+REWARD_SCORE_SCALE = 0.01  # Reward per point of score gained
+REWARD_DEATH = -1.0        # Losing a life
+REWARD_STAGE_CLEAR = 10.0  # Walking through the exit
+
+
+class BombermanEnv:
+  def __init__(self, seed=None, max_steps=5000, lives=None):
+    """
+    CONSTRUCTOR - Create the environment (the game is built on reset())
+
+    PARAMETERS:
+    - seed: Default seed used by reset() when none is given
+    - max_steps: Episode length before it is truncated
+    - lives: Override the player's starting lives (None keeps the game default)
+    """
+    self.seed = seed
+    self.max_steps = max_steps
+    self.lives = lives
+
+    self.num_actions = len(ACTIONS)
+    self.observation_shape = (len(OBS_CHANNELS), gs.ROWS, gs.COLS)
+    self.obs = np.zeros(self.observation_shape, dtype=np.float32)
+
+    self.game = None
+    self.steps = 0
+    self._hard_layer = None
+    self._hard_matrix = None
+
+  def reset(self, seed=None):
+    """Start a new game. Returns (observation, info)."""
+    seed = self.seed if seed is None else seed
+    self.game = make_game(seed=seed)
+    if self.lives is not None:
+      self.game.PLAYER.lives = self.lives
+    self.steps = 0
+    self._last_score = self.game.PLAYER.score
+    self._last_lives = self.game.PLAYER.lives
+    self._last_level = self.game.level
+    return self.observe(), self.info()
+
+  def step(self, action):
+    """
+    Apply one action and advance the game by one frame.
+
+    RETURNS:
+    - (observation, reward, terminated, truncated, info)
+    """
+    game = self.game
+    player = game.PLAYER
+    name = ACTIONS[action]
+
+    if name == "bomb":
+      player.plant_bomb()
+    elif name == "detonate":
+      player.detonate_bomb()
+    elif name != "noop":
+      player.move(name)
+
+    game.update()
+    # The "STAGE n" screen ignores input, so don't make the agent sit through it
+    skip_transition(game)
+    self.steps += 1
+
+    # The player object is replaced when a new game starts, but never mid-episode
+    player = game.PLAYER
+    reward = (player.score - self._last_score) * REWARD_SCORE_SCALE
+    if player.lives < self._last_lives:
+      reward += REWARD_DEATH
+    if game.level > self._last_level:
+      reward += REWARD_STAGE_CLEAR
+    self._last_score = player.score
+    self._last_lives = player.lives
+    self._last_level = game.level
+
+    terminated = not game.game_on
+    truncated = not terminated and self.steps >= self.max_steps
+    return self.observe(), reward, terminated, truncated, self.info()
+
+  def observe(self, out=None):
+    """Encode the current game state into the observation tensor."""
+    obs = self.obs if out is None else out
+    obs.fill(0)
+    game = self.game
+    groups = game.groups
+
+    # Hard blocks only change when a new stage is generated
+    if self._hard_matrix is not game.level_matrix:
+      self._hard_matrix = game.level_matrix
+      self._hard_layer = np.zeros((gs.ROWS, gs.COLS), dtype=np.float32)
+      rows, cols = self._cells(groups["hard_block"])
+      self._hard_layer[rows, cols] = 1
+    obs[0] = self._hard_layer
+
+    rows, cols = self._cells(groups["soft_block"])
+    obs[1, rows, cols] = 1
+
+    bombs = groups["bomb"].sprites()
+    if bombs:
+      fuse = np.fromiter((1.0 if b.remote else b.bomb_counter / b.bomb_timer for b in bombs),
+                         dtype=np.float32, count=len(bombs))
+      rows, cols = self._cells(bombs)
+      obs[2, rows, cols] = fuse
+
+    rows, cols = self._cells(groups["specials"])
+    obs[3, rows, cols] = 1
+
+    flames = [cell for _, blast in game.world.query(Flames) for cell in blast.cells]
+    if flames:
+      rows = np.fromiter((row for row, _ in flames), dtype=np.intp, count=len(flames))
+      cols = np.fromiter((col for _, col in flames), dtype=np.intp, count=len(flames))
+      obs[4, rows, cols] = 1
+
+    enemies = [e for e in groups["enemies"] if not e.destroyed]
+    if enemies:
+      rows, cols = self._pixel_cells(enemies)
+      np.add.at(obs[5], (rows, cols), 1)
+
+    player = game.PLAYER
+    rows, cols = self._pixel_cells([player])
+    obs[6, rows, cols] = 1
+
+    obs[7] = player.lives
+    obs[8] = player.bomb_limit
+    obs[9] = player.power
+    obs[10] = player.speed
+    obs[11] = player.remote
+    obs[12] = player.wall_hack
+    obs[13] = player.bomb_hack
+    obs[14] = player.flame_pass
+    obs[15] = player.invisibility
+    obs[16] = game.level_info.time / gs.STAGE_TIME
+    return obs
+
+  def info(self):
+    """Extra diagnostics returned alongside each observation."""
+    player = self.game.PLAYER
+    return {"score": player.score, "lives": player.lives, "level": self.game.level,
+            "enemies": len(self.game.groups["enemies"]), "steps": self.steps}
+
+  def render(self):
+    """Draw the current frame off-screen and return it as an (H, W, 3) uint8 array."""
+    surface = self.game.MAIN.screen
+    self.game.draw(surface)
+    return pygame.surfarray.array3d(surface).swapaxes(0, 1)
+
+  def close(self):
+    self.game = None
+
+  @staticmethod
+  def _cells(sprites):
+    """Row/column index arrays of grid-aligned sprites (blocks, bombs, specials)."""
+    count = len(sprites)
+    rows = np.fromiter((s.row for s in sprites), dtype=np.intp, count=count)
+    cols = np.fromiter((s.col for s in sprites), dtype=np.intp, count=count)
+    return rows, cols
+
+  @staticmethod
+  def _pixel_cells(sprites):
+    """Row/column index arrays of free-moving sprites, from their rect centres."""
+    count = len(sprites)
+    rows = np.fromiter(((s.rect.centery - gs.Y_OFFSET) // gs.SIZE for s in sprites),
+                       dtype=np.intp, count=count)
+    cols = np.fromiter((s.rect.centerx // gs.SIZE for s in sprites), dtype=np.intp, count=count)
+    np.clip(rows, 0, gs.ROWS - 1, out=rows)
+    np.clip(cols, 0, gs.COLS - 1, out=cols)
+    return rows, cols
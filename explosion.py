@@ -0,0 +1,181 @@
+# ============================================================================
+# FILE: explosion.py - BOMB BLASTS AS WORLD ENTITIES
+# ============================================================================
+# PURPOSE:
+#   A bomb blast is a GAME.world entity (ecs.World), not a sprite:
+#   - Position: top-left of the centre cell
+#   - Animation: the frame every cell shows; non-looping, so
+#     animation_system destroys the entity after the last frame
+#   - Collider: bounding box of every cell (broad phase)
+#   - Flames: the centre cell and the frame kind (a gs.EXPLOSION name)
+#     burning in every cell along the arms
+#   All four are __slots__ classes. A blast costs these four small objects
+#   and its cells dict, instead of a Sprite with a GAME reference, group
+#   bookkeeping and a __dict__ per instance.
+#
+# SYSTEMS:
+#   - spawn_explosion(): works out the cells (chaining bombs, breaking soft
+#     blocks, hitting specials on the way) and creates the entity
+#   - flame_system(): destroys the enemies a flame touches (Game.advance,
+#     after the sprite groups)
+#   - render_flames(): draws every blast (Game.draw, under enemies and
+#     bombers, where the old sprite group was)
+#   - flames_hit(): pixel test of a sprite against the cells under it, also
+#     used for the player (Character.flame_collision)
+#
+# DEPENDENCIES:
+#   - pygame: Masks and rects
+#   - ecs: Generic components
+#   - collision_stats: Blast vs enemy counter
+#   - gamesetting: Tile size and offsets
+# ============================================================================
+
+import pygame
+import gamesetting as gs
+from ecs import Animation, Collider, Position
+from collision_stats import EXPLOSION_HITS
+
+FRAME_TIME = 75   # ms per blast frame
+masks = {}        # Flame frame -> collision mask, shared by every blast
+
+
+class Flames:
+  """Component of a blast entity: its centre and the frame kind burning in each cell."""
+  __slots__ = ("row", "col", "cells", "images")
+
+  def __init__(self, row, col, cells, images):
+    self.row = row
+    self.col = col
+    self.cells = cells     # (row, col) -> gs.EXPLOSION name
+    self.images = images   # gs.EXPLOSION name -> frames (GAME.ASSETS.explosion)
+
+
+def spawn_explosion(game, power, row, col):
+  """Blow up the cell (row, col) with `power` cells of flame along each arm. Returns the entity."""
+  size = gs.SIZE
+  cells = {(row, col): "centre"}
+  explosion_path(game, power, row, col, cells)
+  images = game.ASSETS.explosion
+  x, y = col * size, row * size + gs.Y_OFFSET
+  rect = pygame.Rect(x, y, size, size).unionall(
+    [pygame.Rect(cell_col * size, cell_row * size + gs.Y_OFFSET, size, size) for cell_row, cell_col in cells])
+  now = game.clock.get_ticks()
+  entity = game.world.create("explosion", Position(x, y),
+                             Animation(len(images["centre"]), FRAME_TIME, now, loop=False),
+                             Collider(rect), Flames(row, col, cells, images))
+  game.sfx.play("Bomberman SFX (7).wav")
+  return entity
+
+
+def explosion_path(game, power, row, col, cells):
+  """Explode adjacent cells, depedent on power and available cells"""
+  matrix = game.level_matrix
+  groups = game.groups
+  #                   left, right, up, down
+  valid_directions = [True, True, True, True]
+  for power_cell in range(power):
+    # Get a list of the 4 directions, tuple of cell values
+    directions = direction_cells(row, col, power_cell)
+    # Check the cells in each direction per the directions list above
+    for ind, dir in enumerate(directions):
+      # If the corresponding direction is still valid_directions is False, skip
+      if not valid_directions[ind]:
+        continue
+      # If the current cell being checked is an empty cells, check the next cell in that direction
+      # To determine type of image display, wether it is a mid or end
+      if matrix[dir[0]][dir[1]] == "_":
+        # If the end of the power range, use the end piece
+        if power_cell == power - 1:
+          cells[(dir[0], dir[1])] = dir[4]
+        # Check if the next cell in sequence is a barrier, use end piece if true, and change valid_directions
+        # to false
+        elif matrix[dir[2]][dir[3]] in groups["hard_block"].sprites():
+          cells[(dir[0], dir[1])] = dir[4]
+          valid_directions[ind] = False
+        # If next cell in sequence is not a barrier, and not the end of the flame power, use mid image
+        else:
+          cells[(dir[0], dir[1])] = dir[5]
+      # if the current cell being checked is not empty, but is a bomb, detonate the bomb
+      elif matrix[dir[0]][dir[1]] in groups["bomb"].sprites():
+        matrix[dir[0]][dir[1]].explode()
+        valid_directions[ind] = False
+      # If the current cell being checked is not empty, but is a soft box - destroy it
+      elif matrix[dir[0]][dir[1]] in groups["soft_block"].sprites():
+        matrix[dir[0]][dir[1]].destroy_soft_block()
+        valid_directions[ind] = False
+      # If the current cell being checked is not empty, but is a special box
+      elif matrix[dir[0]][dir[1]] in groups["specials"].sprites():
+        matrix[dir[0]][dir[1]].hit_by_explosion()
+        valid_directions[ind] = False
+      # If the current cell being checked is not empty, or a bomb, or a soft block, or special
+      else:
+        valid_directions[ind] = False
+
+
+def direction_cells(row, col, cell):
+  """Return a list of the four cells in the up and down, left and right directions"""
+  left = (row, col - (cell + 1),   # Check cell immediate left
+          row, col - (cell + 2),   # Check cell left to that
+          "left_end", "left_mid")
+  right = (row, col + (cell + 1),  # Check cell immediate right
+           row, col + (cell + 2),  # Check cell right to that
+           "right_end", "right_mid")
+  up = (row - (cell + 1), col,     # Check all immediete up
+        row - (cell + 2), col,     # Check cell up to that
+        "up_end", "up_mid")
+  down = (row + (cell + 1), col,   # Check all immediete down
+          row + (cell + 2), col,   # Check cell below to that
+          "down_end", "down_mid")
+  return [left, right, up, down]
+
+
+def flames_hit(flames, index, sprite):
+  """Pixel test (like pygame.sprite.collide_mask) of sprite against the flame cells under sprite.rect"""
+  rect = sprite.rect
+  size = gs.SIZE
+  sprite_mask = None
+  for row in range((rect.top - gs.Y_OFFSET) // size, (rect.bottom - 1 - gs.Y_OFFSET) // size + 1):
+    for col in range(rect.left // size, (rect.right - 1) // size + 1):
+      kind = flames.cells.get((row, col))
+      if kind is None:
+        continue
+      image = flames.images[kind][index]
+      mask = masks.get(image)
+      if mask is None:
+        mask = masks[image] = pygame.mask.from_surface(image)
+      if sprite_mask is None:
+        sprite_mask = getattr(sprite, "mask", None) or pygame.mask.from_surface(sprite.image)
+      if mask.overlap(sprite_mask, (rect.x - col * size, rect.y - row * size - gs.Y_OFFSET)):
+        return True
+  return False
+
+
+def flame_system(game):
+  """Destroy every enemy a flame touches. Enemies inside a blast's Collider are pixel
+  tested against the cells under them only"""
+  enemies = game.groups["enemies"]
+  blasts = 0
+  mask_tests = 0
+  for _, collider, flames, animation in game.world.query(Collider, Flames, Animation):
+    blasts += 1
+    rect = collider.rect
+    for enemy in enemies:
+      if not rect.colliderect(enemy.rect):
+        continue
+      mask_tests += 1
+      if flames_hit(flames, animation.index, enemy):
+        enemy.destroy()
+  if blasts:
+    game.collision_stats.count(EXPLOSION_HITS, blasts * len(enemies), mask_tests)
+
+
+def render_flames(world, window, x_offset=0, y_offset=0):
+  """Draw every flame cell with camera offsets applied to both axes."""
+  size = gs.SIZE
+  x_offset = int(x_offset)
+  y_offset = int(y_offset) - gs.Y_OFFSET
+  for _, flames, animation in world.query(Flames, Animation):
+    images = flames.images
+    index = animation.index
+    for (row, col), kind in flames.cells.items():
+      window.blit(images[kind][index], (col * size - x_offset, row * size - y_offset))
@@ -0,0 +1,87 @@
+# ============================================================================
+# FILE: frame_registry.py - INTERNED SPRITE FRAMES
+# ============================================================================
+# PURPOSE:
+#   Many animations in gamesetting point at the same sheet cells (enemy
+#   walk_right/walk_down, walk_left/walk_up, explosion end pieces...).
+#   FrameRegistry builds each distinct frame once and hands the same Surface
+#   to every animation that uses it.
+#
+#   A frame is identified by (sheet, source rect, scaled size, colorkey,
+#   transform). Sheets are named by file, so the key does not depend on
+#   which Surface object the sheet happened to be loaded into.
+#
+#   The registry only holds weak references, so frames dropped by Assets
+#   (e.g. evicted sprite sets) are freed as usual.
+#
+#   Shared frames must not be modified in place (set_alpha, fill, ...);
+#   transform a copy instead.
+#
+# DEPENDENCIES:
+#   - weakref: Frame table without keeping frames alive
+#   - pygame: Surface sizes for the memory report
+# ============================================================================
+
+import weakref
+import pygame
+
+
+class FrameRegistry:
+  def __init__(self):
+    self.frames = weakref.WeakValueDictionary()  # Key -> Surface
+    self.keys = weakref.WeakKeyDictionary()      # Surface -> key (for transforms of a frame)
+    self.sheet_names = {}                        # id(sheet Surface) -> file name
+    self.hits = 0
+    self.misses = 0
+
+  def name_sheet(self, sheet, file_name):
+    """Remember which file a sheet Surface was loaded from."""
+    self.sheet_names[id(sheet)] = file_name
+
+  def sheet_key(self, sheet):
+    return self.sheet_names.get(id(sheet), id(sheet))
+
+  def intern(self, key, build):
+    """Return the frame for `key`, calling build() only the first time."""
+    frame = self.frames.get(key)
+    if frame is not None:
+      self.hits += 1
+      return frame
+    self.misses += 1
+    frame = build()
+    self.frames[key] = frame
+    self.keys[frame] = key
+    return frame
+
+  def transformed(self, frame, transform, build):
+    """Intern a transform of an interned frame, e.g. ("rotate", 180)."""
+    source = self.keys.get(frame, id(frame))
+    return self.intern((source, transform), build)
+
+
+def frame_memory(values):
+  """
+  Count the frames in nested dicts/lists of Surfaces
+
+  RETURNS: dict with
+  - references: Frames used by animations
+  - unique: Distinct Surface objects
+  - bytes: Pixel memory of the distinct Surfaces
+  - saved_bytes: Memory a separate Surface per reference would add
+  """
+  sizes = {}       # id(Surface) -> pixel bytes
+  references = 0
+  saved = 0
+  pending = [values]
+  while pending:
+    value = pending.pop()
+    if isinstance(value, pygame.Surface):
+      references += 1
+      size = value.get_width() * value.get_height() * value.get_bytesize()
+      if id(value) in sizes:
+        saved += size  # Another reference to a frame already counted
+      sizes[id(value)] = size
+      continue
+    pending.extend(value.values() if isinstance(value, dict) else value)
+  return {"references": references, "unique": len(sizes),
+          "bytes": sum(sizes.values()), "saved_bytes": saved}
@@ -3,9 +3,20 @@ import pygame
 from character import Character
 from enemy import Enemy
 from blocks import Hard_block, Soft_Block, Special_Soft_Block
-from random import choice, randint
 from info_panel import InfoPanel
 from specials import Special
+from gameclock import GameClock
+from profiler import FrameProfiler
+from collision_stats import CollisionStats
+from leak_tracker import SpriteLeakTracker
+from audio import MusicPlayer, VoiceManager
+from state_hash import StateHash, TrackedRandom
+from ecs import World
+from explosion import flame_system, render_flames
+from timer_queue import TimerQueue
+from animation_clock import AnimationClocks
+from asset_manager import ENEMY, SPECIAL
+from input_dispatcher import CONFIRM, MENU_DOWN, MENU_UP
 import gamesetting as gs
 
 # ============================================================================
@@ -22,6 +33,10 @@ import gamesetting as gs
 #   - pygame: Sprite groups, rendering
 #   - Character: Player sprite class
 #   - Hard_block, Soft_Block: Block sprite classes
+#   - ecs.World: Entities that are not sprites (score popups, bomb blasts)
+#   - explosion: Blast systems (flames vs enemies, drawing)
+#   - TimerQueue: Fuses, animations, countdowns (GAME.timers)
+#   - AnimationClocks: Shared walk cycle frames (GAME.anim_clocks)
 #   - gamesetting: Game configuration and constants
 # ============================================================================
 
@@ -29,12 +44,18 @@ import gamesetting as gs
 # CLASS: Game - Main game state and logic controller
 # ============================================================================
 class Game:
-  def __init__(self, main, assets):
+  def __init__(self, main, assets, clock=None, seed=None, audio=True, state_hash=None):
     """
     CONSTRUCTOR - Initialize game state and world
     
     INITIALIZATION STEPS:
-    1. Store references to main Bomberman instance and Assets
+    1. Store references to main Bomberman instance, Assets and the clock
+       (real time by default, fixed step when running headless), and create
+       the game's own random generator (seed: None seeds from the OS) so
+       several games in one process do not share random state. audio=False
+       keeps the game off the process-wide mixer (server rooms). state_hash:
+       a StateHash to keep up to date (default: one logging to
+       gs.STATE_HASH_LOG if that is set)
     2. Create sprite groups for organizing game objects
     3. Create the player character at starting position (row 3, col 2)
     4. Initialize camera system with offsets and smoothing parameters
@@ -43,6 +64,16 @@ class Game:
     # LINK WITH MAIN CLASS AND ASSETS
     self.MAIN = main
     self.ASSETS = assets
+    self.clock = clock if clock is not None else GameClock()
+    self.random = TrackedRandom(seed)  # Level layout, enemy picks and enemy turns
+    self.timers = TimerQueue(self.clock)  # Fuses, animations, stage countdown, invisibility
+    self.anim_clocks = AnimationClocks(self.clock)  # Looping animation frames, one per set and speed
+    self.profiler = FrameProfiler()
+    self.collision_stats = CollisionStats()
+    self.leak_tracker = SpriteLeakTracker() if gs.DEBUG_LEAK_TRACKER else None
+    if state_hash is None and gs.STATE_HASH_LOG:
+      state_hash = StateHash(gs.STATE_HASH_LOG)
+    self.state_hash = state_hash
 
     # Sprite groups for organizing and updating game objects
     self.groups = {
@@ -50,13 +81,26 @@ class Game:
       "soft_block": pygame.sprite.Group(),    # Destructible blocks
       "bomb": pygame.sprite.Group(),          # Bombs placed by player
       "specials" : pygame.sprite.Group(),      # Special items/power-ups
-      "explosion": pygame.sprite.Group(),     # Explosion effects
       "enemies": pygame.sprite.Group(),      # Enemy characters
       "player": pygame.sprite.Group(),         # Player character
-      "scores": pygame.sprite.Group()          # Score indicators
     }
+    if self.state_hash:
+      # Same groups, reporting sprites coming and going to the state hash
+      self.groups = {key: self.state_hash.group(key) for key in self.groups}
+    # Profiler section names for each group's update (built once, not every frame)
+    self.update_sections = {key: f"update: {key}" for key in self.groups}
+    # Block and bomb groups sleep: update() only runs on the sprites woken by an event (see wake()).
+    # Hard blocks never wake; a soft block wakes when a blast hits it and crumbles until killed;
+    # a bomb is awake from planting until its owner has stepped off it.
+    self.awake = {"hard_block": pygame.sprite.Group(), "soft_block": pygame.sprite.Group(),
+                  "bomb": pygame.sprite.Group()}
+    # Score indicators, bomb blasts and other component entities (ecs.py, explosion.py)
+    self.world = World(self, listener=self.state_hash)
     
     
+    # Versus mode (versus.start_round): several bombers, no enemies or stage timer
+    self.versus = False
+
     # Level Transition
     self.transition = False
     self.level_transition = None
@@ -69,42 +113,47 @@ class Game:
     self.pointer_pos = self.point_position[self.point_pos]
 
     self.music_playing = False
-    self.start_screen_music = self.ASSETS.sounds["BM - 01 Title Screen.mp3"]
-    self.bg_music = self.ASSETS.sounds["BM - 03 Main BGM.mp3"]
-    self.bg_music_special = self.ASSETS.sounds["BM - 04 Power-Up Get.mp3"]
-    self.stage_ending_music = self.ASSETS.sounds["BM - 05 Stage Clear.mp3"]
-
-    self.start_screen_music.play(loops=-1)
+    self.music = MusicPlayer(enabled=audio)
+    self.sfx = VoiceManager(self.ASSETS.sounds, enabled=audio)  # Sound effects: GAME.sfx.play(name)
+    self.score_bonus = 0   # Score popups on screen (back-to-back kills score double)
+    self.music.play("title")
     self.top_score = 0
     self.top_score_img = self.top_score_image()
 
-  def input(self, events):
-    # Expect an events list forwarded from main
+  def input(self, controls):
+    # Expect the InputDispatcher from main, already polled for this tick
     if not self.game_on:
-       for event in events:
-          if event.type == pygame.QUIT:
-             self.MAIN.running = False
-
-          if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_UP:
-              self.point_pos -= 1
-              if self.point_pos < 0:
-                self.point_pos = 1
-            if event.key == pygame.K_DOWN:
-              self.point_pos += 1
-              if self.point_pos > 1:
-                self.point_pos = 0
-            self.pointer_pos = self.point_position[self.point_pos] 
-
-            if event.key == pygame.K_RETURN:
-              if self.point_pos == 0:
-                self.new_game()
+       while controls.take(MENU_UP):
+          self.point_pos -= 1
+          if self.point_pos < 0:
+            self.point_pos = 1
+       while controls.take(MENU_DOWN):
+          self.point_pos += 1
+          if self.point_pos > 1:
+            self.point_pos = 0
+       self.pointer_pos = self.point_position[self.point_pos] 
+
+       if controls.take(CONFIRM):
+          if self.point_pos == 0:
+            self.new_game()
 
        return     
            
-    self.PLAYER.input(events)
+    self.PLAYER.input(controls)
     
   def update(self):
+    self.advance()
+    if self.state_hash:
+      self.state_hash.end_tick(self)
+
+  def advance(self):
+    """One tick of the game (update() also closes the tick's state hash)."""
+    self.clock.tick()
+    # Close the previous frame's collision counters (input + update)
+    self.collision_stats.end_frame(self)
+    self.music.update()
+    # Sound effects requested since the last tick (input, previous update) start together
+    self.sfx.flush()
     if not self.game_on:
       return
           
@@ -117,41 +166,47 @@ class Game:
         and self.music_playing == False \
         and len(self.groups["enemies"].sprites()) > 0:
       self.music_playing = True
-      self.bg_music.play(loops=-1)
+      self.music.play("main")
 
     if len(self.groups["enemies"].sprites()) == 0 and self.music_playing == True:
       self.music_playing = False
-      self.bg_music.stop()
-      self.bg_music_special.stop()
-      self.stage_ending_music.play()
+      self.music.play("stage_clear", loops=0)
     
+    profiler = self.profiler
+    # Timers due this tick (fuses, animation frames, stage countdown...)
+    profiler.start("timers")
+    self.timers.run()
+    self.anim_clocks.update()
+    profiler.stop("timers")
+    # Component entities: blast frames (and the end of a blast)
+    profiler.start("update: world")
+    self.world.update()
+    profiler.stop("update: world")
     # Update info panel 
-    self.level_info.update()
+    if not self.versus:
+      profiler.start("update: info panel")
+      self.level_info.update()
+      profiler.stop("update: info panel")
     # self.hard_blocks.update()
     # self.soft_block.update()
     # self.PLAYER.update()
-    for value in self.groups.values():
-      for item in value:
+    for key, value in self.groups.items():
+      profiler.start(self.update_sections[key])
+      for item in self.awake.get(key, value):
         item.update()
-    # Perform enemy collision check with explosions, only if there is an explosion
-    if self.groups["explosion"]:
-      # Compare explosion group with the enemies group, check for collision. This will retrun a dictionary
-      # keys: group 1, values: list of all group 2 that collision detection occurs
-      killed_enemies = pygame.sprite.groupcollide(self.groups["explosion"],
-                                                   self.groups["enemies"], False, False)
-      if killed_enemies:
-         # Cycle through the dictionary, performing checks on each enemy colliding with a flame
-         for flame, enemies in killed_enemies.items():
-           # Cycle through each enemy in the dictionary value list
-           for enemy in enemies:
-             if pygame.sprite.collide_mask(flame,enemy):
-               enemy.destroy()
+      profiler.stop(self.update_sections[key])
+    # Enemies caught in a blast
+    profiler.start("collision: blasts")
+    flame_system(self)
+    profiler.stop("collision: blasts")
 
     # Smoothly interpolate camera current offsets toward target offsets
+    profiler.start("camera")
     dx = self.cam_target_x - self.x_camera_offset
     dy = self.cam_target_y - self.y_camera_offset
     self.x_camera_offset += dx * self.camera_lerp
     self.y_camera_offset += dy * self.camera_lerp
+    profiler.stop("camera")
 
   def update_camera(self, centerx, centery):
     """Update camera offsets so the player stays near screen center (both axes)."""
@@ -159,8 +214,7 @@ class Game:
     total_map_height = gs.ROWS * gs.SIZE
 
     # Use current window size so camera adapts to any screen/device
-    screen_w = self.MAIN.screen.get_width()
-    screen_h = self.MAIN.screen.get_height()
+    screen_w, screen_h = self.view_size()
     half_screen_w = screen_w // 2
     half_screen_h = screen_h // 2
 
@@ -211,6 +265,21 @@ class Game:
     self.cam_target_x = float(round(desired_x))
     self.cam_target_y = float(round(desired_y))
 
+  def view_size(self):
+    """Size of the window the game is drawn in (the default window size when there is none)."""
+    screen = getattr(self.MAIN, "screen", None)
+    if screen is None:
+      return gs.SCREENWIDTH, gs.SCREENHEIGHT
+    return screen.get_size()
+
+  def wake(self, key, sprite):
+    """Update `sprite` (of sleeping group `key`) every tick from now until it is killed or sleeps"""
+    self.awake[key].add(sprite)
+
+  def sleep(self, key, sprite):
+    """Stop updating `sprite` (of sleeping group `key`) until it is woken again"""
+    self.awake[key].remove(sprite)
+
   def draw(self,window):
     #Draw the Green Background squares
     # for row_num, row in enumerate(self.level_matrix): 
@@ -249,7 +318,9 @@ class Game:
                     ((col_num * gs.SIZE) - cam_x, (row_num * gs.SIZE) + gs.Y_OFFSET - cam_y))                
 
 
-    for value in self.groups.values():
+    for key, value in self.groups.items():
+      if key == "enemies":
+        render_flames(self.world, window, cam_x, cam_y)   # Blasts go under enemies and bombers
       for item in value:
         # Prefer the 2-arg (x,y) draw signature; fall back for compatibility
         try:
@@ -259,6 +330,7 @@ class Game:
             item.draw(window, cam_x)
           except TypeError:
             item.draw(window)
+    self.world.draw(window, cam_x, cam_y)
 
 
   def generate_level_matrix(self,rows,cols):
@@ -323,7 +395,7 @@ class Game:
          elif row_num in [2,3,4] and col_num in [1,2,3]:
           continue
          else:
-           cell = choice(["@","_","_","_"])
+           cell = self.random.choice(["@","_","_","_"])
            if cell == "@":
              cell = Soft_Block(self,self.ASSETS.soft_block["soft_block"],
                                self.groups["soft_block"],row_num,col_num,)
@@ -334,8 +406,8 @@ class Game:
       power_up = special
       valid = False
       while not valid:
-        row = randint(0, gs.ROWS - 1)
-        col = randint(0, gs.COLS - 1)
+        row = self.random.randint(0, gs.ROWS - 1)
+        col = self.random.randint(0, gs.COLS - 1)
         if row == 0 or row == len(matrix) - 1 or col == 0 or col == len(matrix[0]) - 1:
           continue
         elif row % 2 == 0 and col % 2 == 0:
@@ -364,8 +436,8 @@ class Game:
     for enemy in enemies_list:
         valid_choice = False
         while not valid_choice:
-          row = randint(0, gs.ROWS - 1)
-          col = randint(0, gs.COLS - 1)
+          row = self.random.randint(0, gs.ROWS - 1)
+          col = self.random.randint(0, gs.COLS - 1)
 
           # Check if this row/col within 3 blocks of the player
           if row in [pl_row - 3, pl_row - 2, pl_row - 1, pl_row, pl_row + 1, pl_row + 2, pl_row + 3] and \
@@ -374,7 +446,7 @@ class Game:
           
           elif matrix[row][col] == "_":
             valid_choice = True
-            Enemy(self, self.ASSETS.enemies[enemy], self.groups["enemies"], enemy, row, col, gs.SIZE)
+            Enemy(self, self.sprite_set(ENEMY, enemy), self.groups["enemies"], enemy, row, col, gs.SIZE)
           else:
             continue
 
@@ -385,6 +457,13 @@ class Game:
       if key == "player":
         continue
       self.groups[key].empty()
+    for group in self.awake.values():
+      group.empty()
+    # Score popups cleared here never expire, so reset their bonus counter
+    self.world.clear()
+    self.score_bonus = 0
+    # The old stage's enemy/special sprite sets may now be evicted
+    self.ASSETS.sprite_sets.begin_stage(owner=self)
     
     # Clear the level matrix
     self.level_matrix.clear()
@@ -396,10 +475,11 @@ class Game:
     self.y_camera_offset = 0
     self.cam_target_x = 0
     self.cam_target_y = 0
-    # Stop all music before transition
-    self.stage_ending_music.stop()
+    # The transition's stage start jingle replaces the stage clear music
     self.level_transition = LevelTransition(self, self.ASSETS, self.level)
     self.music_playing = False
+    if self.leak_tracker:
+      self.leak_tracker.stage_boundary(self)
 
   def select_enemies_to_spawn(self):
     """Generate a list of enemies to spawn"""  
@@ -429,9 +509,21 @@ class Game:
       for num in range(num_2):
         enemies_list.append(enemies[self.level % 9])  
       for num in range(num_3):
-        enemies_list.append(choice(list(enemies.values()))) 
+        enemies_list.append(self.random.choice(list(enemies.values()))) 
       return   
   
+  def sprite_set(self, kind, name):
+    """Enemy/special sprite set, pinned to this game's current stage (asset_manager)."""
+    return self.ASSETS.sprite_sets.get(kind, name, owner=self)
+
+  def stage_sprite_sets(self):
+    """Sprite sets the current stage may need later: pontans and the hidden specials."""
+    sets = [(ENEMY, "pontan")]
+    for block in self.groups["soft_block"]:
+      if isinstance(block, Special_Soft_Block):
+        sets.append((SPECIAL, block.special_type))
+    return sets
+
   def select_a_special(self):
     special = list(gs.SPECIALS.keys())
     special.remove("exit")
@@ -440,7 +532,7 @@ class Game:
     elif self.level == 1:
       power_up = "bomb_up"
     elif self.PLAYER.bomb_limit <= 2 or self.PLAYER.power <= 2:
-      power_up = choice (["bomb_up", "fire_up"])
+      power_up = self.random.choice (["bomb_up", "fire_up"])
     else:
       if self.PLAYER.wall_hack:
         special.remove("wall_hack")
@@ -454,7 +546,7 @@ class Game:
         special.remove("bomb_up")
       if self.PLAYER.power == 10:
         special.remove("fire_up")
-      power_up = choice(special) 
+      power_up = self.random.choice(special) 
     return power_up       
 
 
@@ -478,6 +570,12 @@ class Game:
   def new_game(self):
     for keys, values in self.groups.items():
         self.groups[keys].empty()
+    self.timers.clear()
+    for group in self.awake.values():
+      group.empty()
+    self.world.clear()
+    self.score_bonus = 0
+    self.versus = False
 
    # Level Player
     self.PLAYER = Character(self, self.ASSETS.player_char, self.groups["player"], 3, 2, gs.SIZE)
@@ -505,11 +603,13 @@ class Game:
     self.game_on = True
     self.level = 1
     self.level_special = self.select_a_special()
+    self.ASSETS.sprite_sets.begin_stage(owner=self)
     self.level_matrix = self.generate_level_matrix(gs.ROWS, gs.COLS)
     self.level_info = InfoPanel(self, self.ASSETS)     
 
     self.level_transition = LevelTransition(self, self.ASSETS, self.level)
-    self.start_screen_music.stop()
+    if self.leak_tracker:
+      self.leak_tracker.stage_boundary(self, "new game")
 
   def check_top_score(self, player_score):
 
@@ -538,7 +638,7 @@ class LevelTransition(pygame.sprite.Sprite):
     self.stage_num = stage_num
     
     self.time = 2800
-    self.timer = pygame.time.get_ticks()
+    self.timer = self.GAME.clock.get_ticks()
 
     self.image = self.ASSETS.stage_word
     self.xpos = (gs.SCREENWIDTH // 2) - self.image.get_width() - 64
@@ -547,7 +647,9 @@ class LevelTransition(pygame.sprite.Sprite):
     self.rect = self.image.get_rect(topleft=(self.xpos, self.ypos))
 
     self.stage_num_img = self.generate_stage_number_image()
-    self.ASSETS.sounds["BM - 02 Stage Start.mp3"].play()
+    self.GAME.music.play("stage_start", loops=0)
+    # Sprite sets to build while the stage number is shown (one per frame)
+    self.prefetch = self.GAME.stage_sprite_sets()
 
   def generate_stage_number_image(self):
     """ Generate the image for the stage number"""
@@ -557,7 +659,9 @@ class LevelTransition(pygame.sprite.Sprite):
     return num_imgs  
   
   def update(self):
-    if pygame.time.get_ticks() - self.timer >= self.time:
+    if self.prefetch:
+      self.ASSETS.sprite_sets.prefetch(*self.prefetch.pop(), owner=self.GAME)
+    if self.GAME.clock.get_ticks() - self.timer >= self.time:
       self.GAME.transition = False
       self.kill()
 
@@ -0,0 +1,43 @@
+# ============================================================================
+# FILE: gameclock.py - SIMULATION CLOCK
+# ============================================================================
+# PURPOSE:
+#   Every timer in the game (bomb fuses, animations, stage countdown,
+#   invisibility) reads the time through Game.clock instead of calling
+#   pygame.time.get_ticks() directly. This lets the same game code run:
+#   - In real time (default): the clock simply reports pygame's ticks
+#   - In fixed steps (headless/training): each Game.update() advances the
+#     clock by exactly one frame, so runs are fast and reproducible
+#
+# DEPENDENCIES:
+#   - pygame: Real time source
+#   - gamesetting: Frame rate used for the default fixed step
+# ============================================================================
+
+import pygame
+import gamesetting as gs
+
+
+class GameClock:
+  def __init__(self, fixed_step=False, step_ms=None):
+    """
+    CONSTRUCTOR - Create a clock
+
+    PARAMETERS:
+    - fixed_step: If True, time only moves when tick() is called
+    - step_ms: Milliseconds added per tick() (defaults to one frame at gs.FPS)
+    """
+    self.fixed_step = fixed_step
+    self.step_ms = step_ms if step_ms is not None else 1000 / gs.FPS
+    self.elapsed = 0.0  # Simulated milliseconds (fixed step mode only)
+
+  def get_ticks(self):
+    """Return the current time in milliseconds."""
+    if self.fixed_step:
+      return int(self.elapsed)
+    return pygame.time.get_ticks()
+
+  def tick(self):
+    """Advance simulated time by one step (no effect in real time mode)."""
+    if self.fixed_step:
+      self.elapsed += self.step_ms
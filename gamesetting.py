@@ -56,6 +56,15 @@ ENEMIES = {
     "pontan":  {"speed": 4,   "wall_hack": True,  "chase_player": True,  "LoS": 30, "see_player_hack": False}   # Very fast, spawns when timer reaches 0
 }
 
+# Off-screen level of detail (Enemy.update): an enemy more than a screen plus
+# ENEMY_LOD_MARGIN tiles away from every bomber, and out of its line of sight
+# range, walks tile to tile on the level matrix every few ticks and is not
+# animated. Distances are measured from the bombers with the default screen
+# size (not the camera), so every peer and replay makes the same choice.
+ENEMY_LOD = True
+ENEMY_LOD_MARGIN = 2   # Tiles: far enough that a coarse step never lands on screen
+ENEMY_LOD_TIERS = ((1, 4), (1.5, 8))  # (screens away, update every N ticks)
+
 # ============================================================================
 # SPRITE AND TILE DIMENSIONS
 # ============================================================================
@@ -315,7 +324,7 @@ SCORES = {
 # ============================================================================
 # SOUND FILE NAMES
 # ============================================================================
-# List of all sound effect and music files to be loaded
+# Sound effects (kept in memory, each loaded the first time it is played)
 SOUNDS = [
     "Bomberman SFX (1).wav",       # Sound effect 1
     "Bomberman SFX (2).wav",       # Sound effect 2
@@ -324,11 +333,93 @@ SOUNDS = [
     "Bomberman SFX (5).wav",       # Sound effect 5
     "Bomberman SFX (6).wav",       # Sound effect 6
     "Bomberman SFX (7).wav",       # Sound effect 7
-    "BM - 01 Title Screen.mp3",    # Title screen music
-    "BM - 02 Stage Start.mp3",     # Level start jingle
-    "BM - 03 Main BGM.mp3",        # Main gameplay music
-    "BM - 04 Power-Up Get.mp3",    # Power-up pickup sound
-    "BM - 05 Stage Clear.mp3",     # Level complete music
-    "BM - 07 Special Power-Up Get.mp3",  # Special item pickup sound
-    "BM - 09  Miss.mp3"            # Player death sound
-]
\ No newline at end of file
+]
+
+# Music tracks (streamed from disk by audio.MusicPlayer)
+MUSIC = {
+    "title":       "BM - 01 Title Screen.mp3",    # Title screen music
+    "stage_start": "BM - 02 Stage Start.mp3",     # Level start jingle
+    "main":        "BM - 03 Main BGM.mp3",        # Main gameplay music
+    "power_up":    "BM - 04 Power-Up Get.mp3",    # Music after a power-up pickup
+    "stage_clear": "BM - 05 Stage Clear.mp3",     # Level complete music
+    "special":     "BM - 07 Special Power-Up Get.mp3",  # Special item pickup music
+    "miss":        "BM - 09  Miss.mp3"            # Player death jingle
+}
+MUSIC_FADE_MS = 400  # Fade-out of the old track / fade-in of a looping track
+
+# Sound effect voices (see audio.VoiceManager)
+SFX_CHANNELS = 12           # Mixer channels: bounds how many effects are mixed at once
+SFX_RESERVED_CHANNELS = 2   # Channels only stingers may use
+# name: (max voices at once, priority, stinger). When no channel is free an
+# effect takes the channel of the oldest lower-priority effect; stingers
+# play on the reserved channels so they are never crowded out
+SFX_VOICES = {
+    "Bomberman SFX (1).wav": (1, 1, False),  # Footstep (left/right)
+    "Bomberman SFX (2).wav": (1, 1, False),  # Footstep (up/down)
+    "Bomberman SFX (3).wav": (2, 2, False),  # Bomb placed
+    "Bomberman SFX (4).wav": (1, 4, True),   # Power-up pickup
+    "Bomberman SFX (5).wav": (1, 5, True),   # Player hit
+    "Bomberman SFX (7).wav": (3, 3, False),  # Explosion
+}
+SFX_DEFAULT_VOICE = (2, 2, False)
+
+# ============================================================================
+# INPUT
+# ============================================================================
+# Bomb / detonate presses that cannot be used right away (e.g. bomb limit
+# reached for a moment) are kept and retried for this long
+INPUT_BUFFER_MS = 150
+# Where the main loop waits for the next frame (compare with python latency.py):
+# - "after_input":       read input, then wait, then update/draw (input is up
+#                        to a frame old when it is used)
+# - "before_input":      wait, then read input, update and draw right away
+# - "busy_before_input": as before_input, but spin instead of sleeping
+#                        (more exact frame start, one core kept busy)
+FRAME_PACING = "after_input"
+
+# ============================================================================
+# ASSET RESIDENCY
+# ============================================================================
+# Enemy/special sprite sets are built when a stage needs them; sets not used
+# by the current stage are evicted (least recently used first) above this
+SPRITE_SET_BUDGET_KB = 768   # About four enemy sets
+
+# ============================================================================
+# VERSUS / NETWORK
+# ============================================================================
+# Online battles: net_server.py runs the simulation, net_client.py renders it
+NET_HOST = "127.0.0.1"
+NET_PORT = 5757
+NET_CLIENT_TIMEOUT_MS = 5000   # A client that sends nothing for this long is dropped
+VERSUS_MIN_PLAYERS = 2         # A round starts once this many bombers have joined
+VERSUS_MAX_PLAYERS = 4
+VERSUS_ROUND_END_MS = 3000     # Time the last bomber standing is shown before the next round
+VERSUS_BOMB_LIMIT = 2          # Versus starting loadout (there are no power-ups)
+VERSUS_POWER = 2
+NET_DEFAULT_ROOM = "main"      # Room a client joins when it names none
+NET_MAX_ROOMS = 64             # Concurrent versus rooms one server process hosts
+
+# ============================================================================
+# DIAGNOSTICS
+# ============================================================================
+# Frame telemetry: a ring buffer of per-frame records, dumped to JSONL
+# whenever a frame takes longer than the hitch threshold
+TELEMETRY_ENABLED = True
+TELEMETRY_HITCH_MS = 50         # Frames slower than this are reported as hitches
+TELEMETRY_FRAMES_BEFORE = 240   # Frames kept before the hitch (ring buffer size)
+TELEMETRY_FRAMES_AFTER = 60     # Frames recorded after the hitch before dumping
+TELEMETRY_DIR = "telemetry"     # Folder the JSONL files are written to
+
+# Collision counters: count collision work per frame (off in normal play; a
+# non-zero log interval turns it on) and print a per-frame summary every
+# COLLISION_LOG_INTERVAL milliseconds of game time (0 = never)
+COLLISION_STATS = False
+COLLISION_LOG_INTERVAL = 0
+
+# Leak tracker: count live sprites and take tracemalloc snapshots at every
+# stage boundary, printing the growth between stages (slows stage changes)
+DEBUG_LEAK_TRACKER = False
+
+# State hash: write a hash of the game state every tick to this file, to
+# compare runs with `python state_hash.py compare` (None = off)
+STATE_HASH_LOG = None
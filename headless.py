@@ -0,0 +1,86 @@
+# ============================================================================
+# FILE: headless.py - RUN THE GAME WITHOUT A WINDOW
+# ============================================================================
+# PURPOSE:
+#   Builds a Game that can be stepped without opening a real window or audio
+#   device. Used by tools that drive the simulation directly (training
+#   environments, benchmarks, servers).
+#   - SDL is pointed at its dummy video/audio drivers
+#   - A tiny display mode is still created because Assets relies on
+#     convert_alpha(), which needs a display surface to exist
+#   - HeadlessMain stands in for the Bomberman window controller
+#   - Each game has its own random generator and stays off the mixer, so
+#     any number of them can run side by side in one process (server rooms)
+#
+# DEPENDENCIES:
+#   - pygame: Display/mixer initialisation
+#   - Assets, Game, GameClock: The normal game objects
+#   - gamesetting: Screen size for the off-screen surface
+# ============================================================================
+
+import os
+import pygame
+import gamesetting as gs
+
+_assets = None
+
+
+def init_pygame():
+  """Initialise pygame with dummy drivers (safe to call more than once)."""
+  os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+  os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+  if not pygame.get_init():
+    pygame.init()
+  if not pygame.mixer.get_init():
+    try:
+      pygame.mixer.init()
+    except pygame.error:
+      pass
+  if pygame.display.get_surface() is None:
+    pygame.display.set_mode((1, 1))
+
+
+def shared_assets():
+  """Return one Assets instance per process (loading sprites is slow)."""
+  global _assets
+  if _assets is None:
+    from assets import Assets
+    init_pygame()
+    _assets = Assets()
+  return _assets
+
+
+class HeadlessMain:
+  """Minimal stand-in for Bomberman: the attributes Game reads from MAIN."""
+  def __init__(self, render=True):
+    # Off-screen window for tools that draw frames; None for games that are never drawn
+    self.screen = pygame.Surface((gs.SCREENWIDTH, gs.SCREENHEIGHT)) if render else None
+    self.running = True
+
+
+def make_game(seed=None, start=True, render=True, state_hash=None):
+  """
+  Create a fixed-step, silent Game with no window attached.
+
+  PARAMETERS:
+  - seed: Seed for the game's random generator (None: seeded from the OS)
+  - start: If True, start a new game and skip the opening stage transition
+  - render: If False, no off-screen window is allocated (game.MAIN.screen is None)
+  - state_hash: StateHash kept up to date every tick (see state_hash.py)
+  """
+  from game import Game
+  from gameclock import GameClock
+
+  init_pygame()
+  game = Game(HeadlessMain(render), shared_assets(), clock=GameClock(fixed_step=True),
+              seed=seed, audio=False, state_hash=state_hash)
+  if start:
+    game.new_game()
+    skip_transition(game)
+  return game
+
+
+def skip_transition(game):
+  """Step the game until the "STAGE n" screen has finished."""
+  while game.game_on and game.transition:
+    game.update()
@@ -1,5 +1,5 @@
-import pygame
 import gamesetting as gs
+from ecs import Image, Position, Timer
 
 class InfoPanel:
   def __init__(self, game, images):
@@ -8,7 +8,8 @@ class InfoPanel:
 
     self.black_nums = self.images.numbers_black
 
-    # Level timer
+    # Level timer (one GAME.timers step per second)
+    self.countdown = None
     self.set_timer()
 
     # Player Lives
@@ -20,8 +21,10 @@ class InfoPanel:
   def set_timer(self):
      # level timer
      self.time_total = gs.STAGE_TIME  # Total time for level in seconds
-     self.timer_start = pygame.time.get_ticks()  # Start time in milliseconds
+     self.timer_start = self.GAME.clock.get_ticks()  # Start time in milliseconds
      self.time = 250  # TIMER
+     self.GAME.timers.cancel(self.countdown)
+     self.countdown = self.GAME.timers.schedule(1000, self.count_down)
 
      # Images for Info Panel
      self.time_image = self.update_time_image()
@@ -37,17 +40,17 @@ class InfoPanel:
   def update(self):
     # Update the score
     self.score_image = self.update_score_image(self.GAME.PLAYER.score)
-    """ If timer reaches zero, stop the counter"""
+
+  def count_down(self):
+    """ Countdown timer: one second less, change the timer image; at zero spawn pontans and stop"""
+    self.timer_start = self.GAME.clock.get_ticks()
+    self.time -= 1
+    self.time_image = self.update_time_image()
     if self.time == 0:
+      self.countdown = None
+      self.GAME.insert_enemies_into_level(self.GAME.level_matrix, ["pontan" for _ in range(10)])
       return
-    
-    # Timer countdown, change the  timer image every seconds
-    if pygame.time.get_ticks() - self.timer_start >= 1000:
-      self.timer_start = pygame.time.get_ticks()
-      self.time -= 1
-      self.time_image = self.update_time_image()
-      if self.time == 0:
-          self.GAME.insert_enemies_into_level(self.GAME.level_matrix, ["pontan" for _ in range(10)])
+    self.countdown = self.GAME.timers.schedule(1000, self.count_down)
 
   def draw(self, window):
     # Draw the Time indicator to the screen
@@ -78,29 +81,29 @@ class InfoPanel:
       score_images = [self.black_nums[int(digit)][0] for digit in str(score)]
     return score_images  
 
-class Scoring(pygame.sprite.Sprite):
-     score_bonus = 0
+class ScorePopup:
+  """Component of a score popup entity (GAME.world): the points it shows."""
+  __slots__ = ("score",)
 
-     def __init__(self, game, group, score, xpos, ypos):
-        super().__init__(group)
-        Scoring.score_bonus += 1
+  def __init__(self, score):
+    self.score = score
 
-        self.GAME = game
-        self.score = score if Scoring.score_bonus <= 1 else score * 2
 
-        self.time = pygame.time.get_ticks()
-        self.x = xpos
-        self.y = ypos
-        
-        self.image = self.GAME.ASSETS.score_images[self.score][0]
-        self.rect = self.image.get_rect(center=(self.x, self.y))
+def spawn_score_popup(game, score, xpos, ypos):
+  """Show `score` centred on (xpos, ypos) for a second, then add it to the player's score."""
+  # Popups on screen are counted per game (GAME.score_bonus)
+  game.score_bonus += 1
+  # Back-to-back kills score double, but only up to the highest score image (8000)
+  if game.score_bonus > 1 and score * 2 in game.ASSETS.score_images:
+    score *= 2
+  image = game.ASSETS.score_images[score][0]
+  rect = image.get_rect(center=(xpos, ypos))
+  return game.world.create("score", Position(rect.x, rect.y), Image(image),
+                           Timer(game.clock.get_ticks(), 1000, score_popup_expired), ScorePopup(score))
 
-     def update(self):
-      if pygame.time.get_ticks() - self.time >= 1000:
-        self.kill()
-        Scoring.score_bonus -= 1
-        self.GAME.PLAYER.update_score(self.score)
 
-     def draw(self, window, x_offset=0, y_offset=0):  
-       window.blit(self.image, (self.rect.x - x_offset, self.rect.y - y_offset))
+def score_popup_expired(world, entity):
+  game = world.game
+  game.score_bonus -= 1
+  game.PLAYER.update_score(world.get(entity, ScorePopup).score)
 
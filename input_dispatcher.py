@@ -0,0 +1,139 @@
+# ============================================================================
+# FILE: input_dispatcher.py - ONE INPUT LAYER FOR THE WHOLE GAME
+# ============================================================================
+# PURPOSE:
+#   Reads the event queue once per tick and turns it into actions, so the
+#   window (Bomberman), the menu (Game) and the player (Character) consume
+#   actions instead of each walking the event list.
+#   - install() blocks every event type the game does not use, so SDL
+#     does not queue mouse motion, joystick, text input... events
+#   - poll() decodes the tick's events into the action buffer and samples
+#     the held movement keys (one get_pressed() per tick)
+#   - take(action) consumes one buffered action
+#   - consume(action, handler) consumes it only if handler() succeeds
+#   - probe: optional latency.LatencyProbe told about each bomb press, and
+#     when gameplay consumes that press or it expires (python latency.py)
+#
+# BUFFERED ACTIONS:
+#   Bomb and detonate presses stay in the buffer until gameplay uses them or
+#   they are older than gs.INPUT_BUFFER_MS, so a press made between ticks, or
+#   while the bomb limit is reached for a moment, is not lost. Other actions
+#   (quit, menu, toggles) only live for the tick they were pressed in.
+#
+# DEPENDENCIES:
+#   - pygame: Event queue, keyboard state
+#   - gamesetting: Buffer window
+# ============================================================================
+
+from collections import deque
+import pygame
+import gamesetting as gs
+
+# Actions
+QUIT = "quit"
+BOMB = "bomb"
+DETONATE = "detonate"
+MENU_UP = "menu_up"
+MENU_DOWN = "menu_down"
+CONFIRM = "confirm"
+TOGGLE_PROFILER = "toggle_profiler"
+TOGGLE_FULLSCREEN = "toggle_fullscreen"
+
+KEY_ACTIONS = {
+  pygame.K_ESCAPE: QUIT,
+  pygame.K_SPACE: BOMB,
+  pygame.K_LCTRL: DETONATE,
+  pygame.K_UP: MENU_UP,
+  pygame.K_DOWN: MENU_DOWN,
+  pygame.K_RETURN: CONFIRM,
+  pygame.K_F3: TOGGLE_PROFILER,
+  pygame.K_F11: TOGGLE_FULLSCREEN,
+}
+BUFFERED_ACTIONS = {BOMB, DETONATE}
+
+# Movement, in priority order when several directions are held
+MOVE_KEYS = [
+  ("walk_right", (pygame.K_d, pygame.K_RIGHT)),
+  ("walk_left", (pygame.K_a, pygame.K_LEFT)),
+  ("walk_up", (pygame.K_w, pygame.K_UP)),
+  ("walk_down", (pygame.K_s, pygame.K_DOWN)),
+]
+MOVE_KEY_CODES = {code for _, codes in MOVE_KEYS for code in codes}
+
+ALLOWED_EVENTS = [pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.VIDEORESIZE]
+
+
+class InputDispatcher:
+  def __init__(self, buffer_ms=gs.INPUT_BUFFER_MS):
+    self.buffer_ms = buffer_ms
+    self.actions = deque()  # (action, pygame.time.get_ticks() when pressed, probe record or None)
+    self.move = None        # Direction to walk this tick ("walk_left"...) or None
+    self.resize = None      # (width, height) of the last VIDEORESIZE this tick
+    self.tapped = set()     # Movement keys pressed this tick
+    self.probe = None       # latency.LatencyProbe while latency is measured
+
+  def install(self):
+    """Only let the event types the game uses into the queue (needs a display)."""
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(ALLOWED_EVENTS)
+
+  def poll(self):
+    """Decode this tick's events into actions (call once per tick)."""
+    now = pygame.time.get_ticks()
+    # Drop last tick's one-tick actions and expired buffered presses
+    if self.actions:
+      kept = deque()
+      for item in self.actions:
+        if item[0] in BUFFERED_ACTIONS and now - item[1] <= self.buffer_ms:
+          kept.append(item)
+        elif item[2] is not None and self.probe is not None:
+          self.probe.dropped(item[2])
+      self.actions = kept
+    self.resize = None
+    tapped = self.tapped
+    tapped.clear()
+
+    for event in pygame.event.get():
+      if event.type == pygame.KEYDOWN:
+        action = KEY_ACTIONS.get(event.key)
+        if action is not None:
+          press = self.probe.pressed() if action == BOMB and self.probe is not None else None
+          self.actions.append((action, now, press))
+        if event.key in MOVE_KEY_CODES:
+          tapped.add(event.key)
+      elif event.type == pygame.QUIT:
+        self.actions.append((QUIT, now, None))
+      elif event.type == pygame.VIDEORESIZE:
+        self.resize = (event.w, event.h)
+
+    # A key tapped and released between two ticks still moves for one tick
+    keys = pygame.key.get_pressed()
+    self.move = None
+    for direction, (key, alternative) in MOVE_KEYS:
+      if keys[key] or keys[alternative] or (tapped and (key in tapped or alternative in tapped)):
+        self.move = direction
+        break
+
+  def take(self, action):
+    """Consume the oldest buffered `action`. Returns True if there was one."""
+    for item in self.actions:
+      if item[0] == action:
+        self.actions.remove(item)
+        return True
+    return False
+
+  def consume(self, action, handler):
+    """
+    Call handler() if `action` is buffered; it is consumed only if handler() returns True
+
+    RETURNS: True if the action was consumed
+    """
+    for item in self.actions:
+      if item[0] == action:
+        if not handler():
+          return False
+        self.actions.remove(item)
+        if item[2] is not None and self.probe is not None:
+          self.probe.mark("input", item[2])
+        return True
+    return False
@@ -0,0 +1,188 @@
+# ============================================================================
+# FILE: latency.py - INPUT-TO-PHOTON LATENCY MEASUREMENT
+# ============================================================================
+# PURPOSE:
+#   Measures how long a bomb press takes to show up on screen, stage by stage:
+#   - input:   Character.input planted the bomb (InputDispatcher.consume)
+#   - update:  the following Game.update finished
+#   - present: pygame.display.update() returned with the bomb drawn
+#   Each stage is reported as p50/p95/p99/max milliseconds after the press.
+#
+#   "present" is when the frame was handed to the display; the monitor's
+#   scan-out (and any compositor buffering) comes on top of that.
+#
+# MEASUREMENT RUN (python latency.py):
+#   For each frame pacing strategy (gs.FRAME_PACING values):
+#   - Starts Bomberman and a game, makes the player invulnerable
+#   - A background thread presses SPACE at random times (so presses land
+#     at every point of the frame) and records when each press was sent
+#   - Bombs are removed as soon as they have been presented, so every
+#     press can plant a new bomb in the same cell
+#   Presses made by hand are timestamped when the event is read from the
+#   queue (pygame events carry no timestamp), which hides the queue wait.
+#
+# USAGE:
+#   python latency.py                          # all strategies, 200 presses each
+#   python latency.py --pacing after_input --presses 500
+#
+# DEPENDENCIES:
+#   - threading, random: Press injection at random times
+#   - main.Bomberman: The real game loop
+# ============================================================================
+
+import argparse
+import random
+import threading
+import time
+from collections import deque
+import pygame
+import gamesetting as gs
+
+STAGES = ("input", "update", "present")
+PACING_STRATEGIES = ["after_input", "before_input", "busy_before_input"]
+
+
+class LatencyProbe:
+  def __init__(self, sent_times=None, timeout=1.0):
+    """
+    PARAMETERS:
+    - sent_times: deque of perf_counter() send times, one per injected
+      press (None: presses are timestamped when they are read)
+    - timeout: Seconds after which a press that never planted a bomb is dropped
+    """
+    self.sent_times = sent_times
+    self.timeout = timeout
+    self.pending = deque()  # Presses in flight: {"pressed": t, stage: t, ...}
+    self.samples = []       # Presses that reached "present"
+    self.lost = 0
+
+  def pressed(self):
+    """A bomb press was read from the event queue. Returns its record (kept by the dispatcher)."""
+    now = time.perf_counter()
+    sent = self.sent_times.popleft() if self.sent_times else now
+    press = {"pressed": sent}
+    self.pending.append(press)
+    return press
+
+  def dropped(self, press):
+    """The dispatcher let `press` expire without gameplay using it."""
+    for index, pending in enumerate(self.pending):
+      if pending is press:
+        del self.pending[index]
+        self.lost += 1
+        return
+
+  def mark(self, stage, press=None):
+    """Record that `stage` was reached (see STAGES); "input" is marked on the press consumed."""
+    now = time.perf_counter()
+    if stage == "input":
+      press["input"] = now
+      return
+    previous = STAGES[STAGES.index(stage) - 1]
+    for press in self.pending:
+      if previous in press and stage not in press:
+        press[stage] = now
+    if stage == "present":
+      while self.pending and ("present" in self.pending[0] or
+                              now - self.pending[0]["pressed"] > self.timeout):
+        press = self.pending.popleft()
+        if "present" in press:
+          self.samples.append(press)
+        else:
+          self.lost += 1
+
+  def report(self):
+    """{stage: {p50, p95, p99, max, mean}} in milliseconds after the press."""
+    result = {}
+    for stage in STAGES:
+      values = sorted((press[stage] - press["pressed"]) * 1000 for press in self.samples)
+      if not values:
+        continue
+      pick = lambda pct: values[min(len(values) - 1, int(round(pct / 100 * len(values))) - 1)]
+      result[stage] = {"p50": pick(50), "p95": pick(95), "p99": pick(99),
+                       "max": values[-1], "mean": sum(values) / len(values)}
+    return result
+
+
+class KeyInjector(threading.Thread):
+  """Posts SPACE presses at random intervals and records when each was sent."""
+  def __init__(self, presses, seed=0, interval=(0.10, 0.25)):
+    super().__init__(name="latency-injector", daemon=True)
+    self.presses = presses
+    self.random = random.Random(seed)
+    self.interval = interval
+    self.sent_times = deque()
+    self.stop_event = threading.Event()
+
+  def run(self):
+    for _ in range(self.presses):
+      if self.stop_event.wait(self.random.uniform(*self.interval)):
+        return
+      self.sent_times.append(time.perf_counter())
+      for event_type in (pygame.KEYDOWN, pygame.KEYUP):
+        pygame.event.post(pygame.event.Event(event_type, key=pygame.K_SPACE, mod=0,
+                                             scancode=pygame.KSCAN_SPACE, unicode=" "))
+
+  def stop(self):
+    self.stop_event.set()
+
+
+def measure(pacing, presses=200, seed=0):
+  """Run the real game loop with one pacing strategy and return the probe report."""
+  from main import Bomberman
+  from headless import skip_transition
+
+  gs.TELEMETRY_ENABLED = False
+  bomberman = Bomberman()
+  bomberman.pacing = pacing
+  game = bomberman.GAME
+  game.new_game()
+  skip_transition(game)
+  player = game.PLAYER
+  player.invisibility = True
+  # Invisibility ends on a scheduled end_invisibility(); with none pending it never does
+  game.timers.cancel(player.invisibility_expiry)
+  player.invisibility_expiry = None
+  player.flame_pass = True
+  game.groups["enemies"].empty()
+
+  injector = KeyInjector(presses, seed)
+  probe = LatencyProbe(injector.sent_times)
+  bomberman.controls.probe = probe
+  injector.start()
+  deadline = time.perf_counter() + presses * injector.interval[1] + 5
+  while len(probe.samples) + probe.lost < presses and time.perf_counter() < deadline:
+    bomberman.run_frame()
+    # Remove presented bombs so the next press can plant in the same cell
+    if not any("input" in press for press in probe.pending):
+      for bomb in game.groups["bomb"].sprites():
+        bomb.kill()
+        bomb.remove_bomb_from_grid()
+  injector.stop()
+  report = probe.report()
+  report["samples"] = len(probe.samples)
+  report["lost"] = probe.lost
+  return report
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description="Bomb press input-to-photon latency")
+  parser.add_argument("--pacing", nargs="*", choices=PACING_STRATEGIES, default=PACING_STRATEGIES)
+  parser.add_argument("--presses", type=int, default=200)
+  parser.add_argument("--seed", type=int, default=0)
+  args = parser.parse_args(argv)
+
+  results = {pacing: measure(pacing, args.presses, args.seed) for pacing in args.pacing}
+  print(f"{'pacing':<18} {'stage':<8} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}  (ms after press)")
+  for pacing, report in results.items():
+    for stage in STAGES:
+      if stage in report:
+        stats = report[stage]
+        print(f"{pacing:<18} {stage:<8} {stats['p50']:>7.2f} {stats['p95']:>7.2f} "
+              f"{stats['p99']:>7.2f} {stats['max']:>7.2f}")
+    print(f"{pacing:<18} {report['samples']} presses measured, {report['lost']} lost")
+  pygame.quit()
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,109 @@
+# ============================================================================
+# FILE: leak_tracker.py - SPRITE LIFETIME AND MEMORY GROWTH TRACKER
+# ============================================================================
+# PURPOSE:
+#   Debug mode (gs.DEBUG_LEAK_TRACKER) that checks long sessions for slow
+#   bloat. At every stage boundary (new game, regenerate_stage) it:
+#   - Counts the live instances of every sprite class, and how many of them
+#     are no longer in any group (finished sprites that something still
+#     references - the usual shape of a leak)
+#   - Takes a tracemalloc snapshot and compares it with the previous one
+#     (the tracker's own allocations are filtered out)
+#   - Checks that the game's score_bonus counter went back to 0 once the
+#     score popups were cleared
+#   - Prints a report of the growth since the previous stage
+#
+#   Reports are also kept in self.reports so tools can inspect them.
+#
+# DEPENDENCIES:
+#   - gc, tracemalloc: Object counting and allocation snapshots
+#   - pygame: Sprite base class
+# ============================================================================
+
+import gc
+import tracemalloc
+from collections import Counter
+import pygame
+
+TOP_ALLOCATIONS = 5  # Allocation sites listed per report
+
+
+class SpriteLeakTracker:
+  def __init__(self, frames=1):
+    """
+    CONSTRUCTOR - Start tracemalloc (if not already running)
+
+    PARAMETERS:
+    - frames: Stack depth tracemalloc records per allocation
+    """
+    if not tracemalloc.is_tracing():
+      tracemalloc.start(frames)
+    self.stage_count = 0
+    self.previous_counts = None
+    self.previous_snapshot = None
+    self.reports = []
+
+  def live_sprites(self):
+    """Return (instances per class, instances per class that belong to no group)."""
+    gc.collect()
+    live = Counter()
+    orphaned = Counter()
+    for obj in gc.get_objects():
+      if isinstance(obj, pygame.sprite.Sprite):
+        name = type(obj).__name__
+        live[name] += 1
+        # Sprite.alive() is shadowed by Character.alive (a bool), so ask for the groups
+        if not obj.groups():
+          orphaned[name] += 1
+    return live, orphaned
+
+  def stage_boundary(self, game, label=None):
+    """Take counts and a snapshot at a stage boundary and print the growth report."""
+    self.stage_count += 1
+    label = label or f"stage {getattr(game, 'level', '?')}"
+    live, orphaned = self.live_sprites()
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+      [tracemalloc.Filter(False, tracemalloc.__file__),
+       tracemalloc.Filter(False, __file__)])
+    # Size of the filtered snapshot, so the tracker's own reports are not counted
+    current = sum(stat.size for stat in snapshot.statistics("filename"))
+    peak = tracemalloc.get_traced_memory()[1]
+
+    report = {"boundary": self.stage_count, "label": label,
+              "live": dict(live), "orphaned": dict(orphaned),
+              "traced_kb": current // 1024, "peak_kb": peak // 1024,
+              "score_bonus": game.score_bonus, "score_popups": game.world.count("score"),
+              "growth": {}, "top_allocations": []}
+
+    if self.previous_counts is not None:
+      for name in set(live) | set(self.previous_counts):
+        change = live[name] - self.previous_counts.get(name, 0)
+        if change:
+          report["growth"][name] = change
+    if self.previous_snapshot is not None:
+      stats = snapshot.compare_to(self.previous_snapshot, "lineno")
+      report["top_allocations"] = [
+        (str(stat.traceback), stat.size_diff // 1024, stat.count_diff)
+        for stat in stats[:TOP_ALLOCATIONS] if stat.size_diff > 0]
+
+    self.previous_counts = live
+    self.previous_snapshot = snapshot
+    self.reports.append(report)
+    self.print_report(report)
+    return report
+
+  def print_report(self, report):
+    print(f"[leaks] {report['label']}: traced {report['traced_kb']} KB (peak {report['peak_kb']} KB)")
+    live = ", ".join(f"{name}={count}" for name, count in sorted(report["live"].items()))
+    print(f"[leaks]   live sprites: {live}")
+    if report["orphaned"]:
+      orphans = ", ".join(f"{name}={count}" for name, count in sorted(report["orphaned"].items()))
+      print(f"[leaks]   not in any group (still referenced): {orphans}")
+    if report["score_bonus"] != report["score_popups"]:
+      print(f"[leaks]   GAME.score_bonus is {report['score_bonus']} "
+            f"but {report['score_popups']} score popups exist")
+    if report["growth"]:
+      growth = ", ".join(f"{name} {change:+d}" for name, change in sorted(report["growth"].items()))
+      print(f"[leaks]   change since last stage: {growth}")
+    for where, size_kb, count in report["top_allocations"]:
+      print(f"[leaks]   +{size_kb} KB ({count:+d} blocks) at {where}")
@@ -6,17 +6,22 @@
 #   - Window creation and management (resizable, fullscreen toggle)
 #   - Event processing (input, window resize, fullscreen toggle with F11)
 #   - Game state updates and rendering
+#   - Start-up: a splash screen while assets load on worker threads, then
+#     time-to-first-frame and time-to-interactive are printed
 #
 # DEPENDENCIES:
 #   - pygame: Core game engine
-#   - Assets: Loads and manages sprites, images, and game resources
+#   - AssetLoader: Loads the Assets (sprites, images, sounds) on a thread pool
 #   - Game: Core game logic (player, blocks, level management)
 #   - gamesetting: Global game configuration and constants
 # ============================================================================
 
+import time
 import pygame
-from assets import Assets  # Class to manage all game assets (images, sounds, sprites)
+from asset_loader import AssetLoader, draw_splash  # Threaded loading of the Assets, splash screen
+from input_dispatcher import InputDispatcher, QUIT, TOGGLE_FULLSCREEN, TOGGLE_PROFILER
 from game import Game      # Core game logic (levels, players, blocks, camera)
+from telemetry import FrameTelemetry  # Per-frame records, hitches dumped to JSONL
 import gamesetting as gs   # Global settings (screen size, FPS, colors, tile sizes, etc.)
 
 # ============================================================================
@@ -28,15 +33,22 @@ class Bomberman:
     CONSTRUCTOR - Initialize the Bomberman game window and core systems
     
     STEPS:
-    1. Initialize Pygame and set up display window
+    1. Record the start time and set running flag to control main loop
+       (closing the splash screen clears it)
+    2. Initialize Pygame and set up display window
        - Clamps window size to the user's display resolution
        - Makes window resizable (RESIZABLE flag)
-    2. Store windowed size for fullscreen toggle restoration
-    3. Load game assets (sprites, images)
-    4. Create the Game object (handles logic, camera, level)
-    5. Initialize frame rate clock for consistent 60 FPS
-    6. Set running flag to control main loop
+    3. Store windowed size for fullscreen toggle restoration
+    4. Initialize frame rate clock for consistent 60 FPS
+    5. Load game assets (sprites, images, sounds) behind a splash screen
+    6. Create the Game object (handles logic, camera, level)
+    7. Start frame telemetry (ring buffer, hitches written to JSONL)
     """
+    # Start-up timings (ms since this point), printed after the first game frame
+    self.start_time = time.perf_counter()
+    self.startup_times = {}
+    self.running = True
+
     # 1. Initialize Pygame modules (MUST be done first before any display operations)
     pygame.init()
     pygame.mixer.init()  # Initialize sound mixer
@@ -54,77 +66,120 @@ class Bomberman:
 
     # 3. Set the title
     pygame.display.set_caption("Bomba~ Na!")
-    # 4. Create an instance of the Assets class to load and manage all game resources
-    self.ASSETS = Assets()
+    # Input layer: unused event types are kept out of the queue from here on
+    self.controls = InputDispatcher()
+    self.controls.install()
+    # 4. Load all game resources on worker threads while the splash screen is drawn
+    self.FPS = pygame.time.Clock()
+    self.pacing = gs.FRAME_PACING  # Where the loop waits for the next frame
+    self.ASSETS = self.load_assets()
     # 5. Create the main Game object
     #    It passes 'self' (the main Bomberman indstance) and the Assets object for the Game class to use
     self.GAME = Game(self, self.ASSETS)
-    # 6. Create a Clock object to manage the game's frame rate (FPS)
-    self.FPS = pygame.time.Clock()
+    # 6. Frame telemetry for diagnosing hitches after the fact
+    self.telemetry = FrameTelemetry() if gs.TELEMETRY_ENABLED else None
 
-    self.running = True
+  def load_assets(self):
+    """
+    Load the Assets with AssetLoader, drawing the splash screen until it is done
+
+    - Worker threads decode; poll() converts and builds on this thread
+    - Each splash frame waits at most one frame time for a job to finish,
+      so the progress bar keeps moving without spinning the CPU
+    - Closing the window (or ESC) still finishes loading, then the game loop exits
+    """
+    loader = AssetLoader()
+    font = pygame.font.Font(None, 64)
+    done = False
+    while not done:
+      self.controls.poll()
+      if self.controls.take(QUIT):
+        self.running = False
+      done = loader.poll(timeout=1 / gs.FPS)
+      draw_splash(self.screen, loader.progress(), font)
+      pygame.display.update()
+      self.mark_startup("first frame")
+    self.mark_startup("assets loaded")
+    return loader.assets
+
+  def mark_startup(self, name):
+    """Record the first time a start-up milestone is reached."""
+    if name not in self.startup_times:
+      self.startup_times[name] = (time.perf_counter() - self.start_time) * 1000
+
+  def report_startup(self):
+    times = ", ".join(f"{name} {ms:.0f} ms" for name, ms in self.startup_times.items())
+    print(f"Start-up: {times}")
+    frames = self.ASSETS.frame_report()
+    print(f"Frames: {frames['references']} used, {frames['unique']} unique "
+          f"({frames['bytes'] / 2**20:.1f} MB), {frames['saved_bytes'] / 2**20:.1f} MB saved by sharing")
 
   def input(self):
     """
     INPUT HANDLER - Process all user input events and window events
     
     RESPONSIBILITIES:
-    - Poll pygame events (keyboard, mouse, window events)
-    - Handle ESC key to exit game
+    - Decode this tick's events into actions (InputDispatcher.poll)
+    - Handle ESC / window close to exit game
     - Handle F11 to toggle fullscreen mode
     - Handle window resize events (VIDEORESIZE)
-    - Forward event list to Game and Character for their processing
+    - Hand the dispatcher to Game and Character to consume their actions
     
-    KEY EVENTS HANDLED:
+    ACTIONS HANDLED:
     1. QUIT: Exit the game when user closes the window
-    2. KEYDOWN + ESCAPE: Exit the game when user presses ESC
-    3. KEYDOWN + F11: Toggle between fullscreen and windowed modes
+    2. QUIT (ESCAPE key): Exit the game when user presses ESC
+    3. TOGGLE_FULLSCREEN (F11): Toggle between fullscreen and windowed modes
        - On fullscreen: hides taskbar, hides mouse cursor
        - On windowed: shows cursor, restores previous window size
+    3b. TOGGLE_PROFILER (F3): Toggle the per-subsystem profiling overlay
     4. VIDEORESIZE: User resizes the window
        - Clamps new size to display resolution
        - Updates stored windowed size for later restoration
     """
-    # Poll events centrally so we can handle window resize and forward events
-    events = pygame.event.get()
-    for event in events:
-      if event.type == pygame.QUIT:
-        self.running = False
-      elif event.type == pygame.KEYDOWN:
-        if event.key == pygame.K_ESCAPE:
-          self.running = False
-        elif event.key == pygame.K_F11:
-          # Toggle fullscreen mode
-          info = pygame.display.Info()
-          if not self.fullscreen:
-            # Enter exclusive fullscreen at current display resolution
-            self.fullscreen = True
-            # Save the last windowed size before switching
-            try:
-              self.windowed_size = (self.screen.get_width(), self.screen.get_height())
-            except Exception:
-              pass
-            flags = pygame.FULLSCREEN | pygame.HWSURFACE | pygame.DOUBLEBUF
-            self.screen = pygame.display.set_mode((info.current_w, info.current_h), flags)
-            pygame.mouse.set_visible(False)
-          else:
-            # Restore previous windowed size and make resizable again
-            self.fullscreen = False
-            w, h = self.windowed_size
-            self.screen = pygame.display.set_mode((w, h), pygame.RESIZABLE)
-            pygame.mouse.set_visible(True)
-      elif event.type == pygame.VIDEORESIZE:
-        # Clamp resize to the current display resolution
-        info = pygame.display.Info()
-        new_w = min(event.w, info.current_w)
-        new_h = min(event.h, info.current_h)
-        # Only update the stored windowed size when not fullscreen
-        self.screen = pygame.display.set_mode((new_w, new_h), pygame.RESIZABLE)
-        if not getattr(self, 'fullscreen', False):
-          self.windowed_size = (new_w, new_h)
-
-    # Pass the event list to the Game so it can forward to the Character, etc.
-    self.GAME.input(events)
+    profiler = self.GAME.profiler
+    profiler.start("input")
+    # Decode this tick's events once; everything below consumes actions
+    controls = self.controls
+    controls.poll()
+    if controls.take(QUIT):
+      self.running = False
+    if controls.take(TOGGLE_PROFILER):
+      # Toggle the profiling overlay
+      profiler.toggle()
+      profiler.start("input")  # toggle() discarded the timer started above
+    if controls.take(TOGGLE_FULLSCREEN):
+      # Toggle fullscreen mode
+      info = pygame.display.Info()
+      if not self.fullscreen:
+        # Enter exclusive fullscreen at current display resolution
+        self.fullscreen = True
+        # Save the last windowed size before switching
+        try:
+          self.windowed_size = (self.screen.get_width(), self.screen.get_height())
+        except Exception:
+          pass
+        flags = pygame.FULLSCREEN | pygame.HWSURFACE | pygame.DOUBLEBUF
+        self.screen = pygame.display.set_mode((info.current_w, info.current_h), flags)
+        pygame.mouse.set_visible(False)
+      else:
+        # Restore previous windowed size and make resizable again
+        self.fullscreen = False
+        w, h = self.windowed_size
+        self.screen = pygame.display.set_mode((w, h), pygame.RESIZABLE)
+        pygame.mouse.set_visible(True)
+    if controls.resize:
+      # Clamp resize to the current display resolution
+      info = pygame.display.Info()
+      new_w = min(controls.resize[0], info.current_w)
+      new_h = min(controls.resize[1], info.current_h)
+      # Only update the stored windowed size when not fullscreen
+      self.screen = pygame.display.set_mode((new_w, new_h), pygame.RESIZABLE)
+      if not getattr(self, 'fullscreen', False):
+        self.windowed_size = (new_w, new_h)
+
+    # The Game (menu) and Character (movement, bombs) consume the rest
+    self.GAME.input(controls)
+    profiler.stop("input")
         
   def update(self):
     """
@@ -144,9 +199,13 @@ class Bomberman:
     """
     # Control the frame rate to a constant value defined in gamesetting (gs.FPS)
     # This makes the game run at the same speed regardless of the computer's performance.
-    self.FPS.tick(gs.FPS)
+    # (With the "*_before_input" pacings, run_frame() waits before input() instead)
+    if self.pacing == "after_input":
+      self.FPS.tick(gs.FPS)
     # Also update the Game logic (handles smoothing camera interpolation)
     self.GAME.update()
+    if self.controls.probe is not None:
+      self.controls.probe.mark("update")
 
   # Method for drawing all game elements to the screen
   def draw(self, window):
@@ -167,8 +226,16 @@ class Bomberman:
     - All camera offset calculations are handled inside Game.draw()
     """
     # window.blit(self.ASSETS.sprite_sheet,(0,0))
+    profiler = self.GAME.profiler
+    profiler.start("draw")
     self.GAME.draw(window) # Delegate drawing of game world, sprites, and camera-adjusted visuals
+    profiler.stop("draw")
+    profiler.draw(window)  # Profiling overlay (only when toggled on with F3)
+    profiler.start("display update")
     pygame.display.update() # Swap buffers and display the rendered frame
+    profiler.stop("display update")
+    if self.controls.probe is not None:
+      self.controls.probe.mark("present")
 
   # The main game loop method
   def rungame(self):
@@ -184,9 +251,32 @@ class Bomberman:
     When user closes window or presses ESC, running is set to False and loop exits.
     """
     while self.running == True:
-      self.input()           # 1. Handle user input and window events
-      self.update()          # 2. Update game state (position, logic, timing)
-      self.draw(self.screen) # 3. Render all game visuals
+      self.run_frame()
+    if self.telemetry:
+      self.telemetry.close()
+    if self.GAME.state_hash:
+      self.GAME.state_hash.close()
+
+  def run_frame(self):
+    """
+    ONE FRAME - input, update and draw, paced by self.pacing (gs.FRAME_PACING)
+
+    Also used by latency.py to drive the loop while it injects key presses.
+    """
+    if self.pacing == "before_input":
+      self.FPS.tick(gs.FPS)
+    elif self.pacing == "busy_before_input":
+      self.FPS.tick_busy_loop(gs.FPS)
+    self.input()           # 1. Handle user input and window events
+    self.update()          # 2. Update game state (position, logic, timing)
+    self.draw(self.screen) # 3. Render all game visuals
+    if "interactive" not in self.startup_times:
+      # First game frame is on screen and input is being handled
+      self.mark_startup("interactive")
+      self.report_startup()
+    self.GAME.profiler.end_frame()
+    if self.telemetry:
+      self.telemetry.record_frame(self.GAME)
 
 
 # ============================================================================
@@ -0,0 +1,123 @@
+# ============================================================================
+# FILE: net_bench.py - VERSUS LATENCY / BANDWIDTH BENCHMARK
+# ============================================================================
+# PURPOSE:
+#   Starts a versus server and 2-4 bot clients on localhost (real UDP
+#   sockets, one asyncio loop) and reports, per simulated link:
+#   - rtt: input sent -> first snapshot acknowledging it received
+#     (round trip + up to one server tick waiting to be applied)
+#   - down/up: bytes per second per client (snapshots / inputs)
+#   - snapshot: mean snapshot size
+#   - missed: snapshots lost or arriving after a newer one
+#   - tick: room tick time (input, Game.update, snapshots)
+#   Bots walk in random directions and plant bombs now and then, so the
+#   snapshots carry a live round (bombs, flames, crumbling blocks).
+#
+# USAGE:
+#   python net_bench.py                          # 4 bots, delays 0/25/50/100 ms
+#   python net_bench.py --bots 2 --delays 40 --jitter 10 --loss 0.02 --seconds 20
+#
+# DEPENDENCIES:
+#   - net_server: BomberServer
+#   - net_client: BomberClient
+# ============================================================================
+
+import argparse
+import asyncio
+import random
+import sys
+import gamesetting as gs
+import net_protocol as proto
+from net_client import BomberClient
+from net_server import BomberServer
+
+MOVES = sorted(proto.MOVES)
+
+
+class BotClient(BomberClient):
+  async def drive(self, seconds, seed):
+    """Join, then send random inputs every frame for `seconds`."""
+    loop = asyncio.get_running_loop()
+    rng = random.Random(seed)
+    step = 1 / gs.FPS
+    end = loop.time() + seconds
+    next_frame = loop.time()
+    move = None
+    while loop.time() < end:
+      if self.bomber_id is None:
+        self.join()
+      else:
+        if rng.random() < 0.05:
+          move = rng.choice(MOVES + [None])
+        self.send_input(move, bombs=1 if rng.random() < 0.02 else 0)
+      next_frame += step
+      await asyncio.sleep(max(0.0, next_frame - loop.time()))
+    self.leave()
+
+
+def percentile(values, pct):
+  values = sorted(values)
+  return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else 0.0
+
+
+async def session(bots, seconds, delay_ms, jitter_ms, loss, seed):
+  loop = asyncio.get_running_loop()
+  server = BomberServer(proto.LinkSimulator(delay_ms, jitter_ms, loss, seed), seed)
+  server_transport, _ = await loop.create_datagram_endpoint(lambda: server, local_addr=("127.0.0.1", 0))
+  port = server_transport.get_extra_info("sockname")[1]
+
+  clients, transports = [], []
+  for index in range(bots):
+    client = BotClient(proto.LinkSimulator(delay_ms, jitter_ms, loss, seed + index + 1))
+    transport, _ = await loop.create_datagram_endpoint(lambda: client, remote_addr=("127.0.0.1", port))
+    clients.append(client)
+    transports.append(transport)
+
+  ticker = asyncio.create_task(server.run())
+  await asyncio.gather(*(client.drive(seconds, seed + index) for index, client in enumerate(clients)))
+  server.stop()
+  await ticker
+  for transport in transports:
+    transport.close()
+  server_transport.close()
+
+  ticks = server.scheduler.tick_samples()
+  rtt = [sample for client in clients for sample in client.rtt_ms]
+  received = sum(client.snapshots for client in clients)
+  missed = sum(client.missed + client.late for client in clients)
+  return {
+    "delay_ms": delay_ms, "jitter_ms": jitter_ms, "loss": loss,
+    "rtt_p50": percentile(rtt, 50), "rtt_p95": percentile(rtt, 95), "rtt_p99": percentile(rtt, 99),
+    "down_kbps": sum(client.bytes_in for client in clients) / bots / seconds / 1024,
+    "up_kbps": sum(client.link.bytes for client in clients) / bots / seconds / 1024,
+    "snapshot_bytes": server.link.bytes / max(1, server.link.packets),
+    "missed_pct": 100 * missed / max(1, received + missed),
+    "tick_p50": percentile(ticks, 50), "tick_p99": percentile(ticks, 99),
+  }
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description="Versus networking benchmark on localhost")
+  parser.add_argument("--bots", type=int, default=4, choices=range(2, gs.VERSUS_MAX_PLAYERS + 1))
+  parser.add_argument("--seconds", type=float, default=10)
+  parser.add_argument("--delays", type=float, nargs="*", default=[0, 25, 50, 100],
+                      help="simulated one-way delays to run (ms)")
+  parser.add_argument("--jitter", type=float, default=0, help="extra random delay (ms)")
+  parser.add_argument("--loss", type=float, default=0, help="fraction of datagrams dropped")
+  parser.add_argument("--seed", type=int, default=1234)
+  args = parser.parse_args(argv)
+
+  print(f"{args.bots} bots, {gs.FPS} Hz, {args.seconds:g} s per link, "
+        f"jitter {args.jitter:g} ms, loss {args.loss:.0%}")
+  print(f"{'delay':>6} {'rtt p50':>8} {'p95':>7} {'p99':>7} {'down KB/s':>10} {'up KB/s':>8} "
+        f"{'snapshot B':>11} {'missed %':>9} {'tick p50':>9} {'p99':>6}")
+  for delay in args.delays:
+    result = asyncio.run(session(args.bots, args.seconds, delay, args.jitter, args.loss, args.seed))
+    print(f"{delay:>6g} {result['rtt_p50']:>8.1f} {result['rtt_p95']:>7.1f} {result['rtt_p99']:>7.1f} "
+          f"{result['down_kbps']:>10.1f} {result['up_kbps']:>8.1f} {result['snapshot_bytes']:>11.0f} "
+          f"{result['missed_pct']:>9.1f} {result['tick_p50']:>9.2f} {result['tick_p99']:>6.2f}")
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
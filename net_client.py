@@ -0,0 +1,268 @@
+# ============================================================================
+# FILE: net_client.py - THIN VERSUS CLIENT
+# ============================================================================
+# PURPOSE:
+#   Joins a versus server (net_server.py), sends the local player's input
+#   every frame and draws the latest snapshot. Nothing is simulated here:
+#   what is drawn is always the server's state, one network delay old.
+#   - BomberClient: asyncio UDP protocol (join, inputs, snapshots) and the
+#     connection figures (round trip, bytes in/out, late snapshots).
+#     Snapshot frames are decoded against the client's recent states; the
+#     newest decoded tick is reported back in every input as the next base
+#   - SnapshotRenderer: draws a WorldState with the normal game sprites,
+#     each bomber tinted by id, the camera following the local bomber
+#   - play(): the window loop, paced by asyncio instead of Clock.tick() so
+#     datagrams are received while the loop waits for the next frame
+#
+# USAGE:
+#   python net_client.py                        # Connect to gs.NET_HOST:gs.NET_PORT
+#   python net_client.py --host 192.168.1.20 --room final --delay 40
+#
+# DEPENDENCIES:
+#   - asyncio: UDP endpoint, frame pacing
+#   - pygame / Assets: Window and sprites
+#   - InputDispatcher: Keyboard input (SPACE bomb, LCTRL detonate, arrows/WASD)
+#   - net_protocol: Messages, link simulation
+#   - snapshot_codec: Frame decoding, cell/entity codes
+# ============================================================================
+
+import argparse
+import asyncio
+import time
+import pygame
+import gamesetting as gs
+import net_protocol as proto
+import snapshot_codec as codec
+from input_dispatcher import InputDispatcher, BOMB, DETONATE, QUIT
+
+JOIN_RETRY_S = 0.5
+# Bomber tints by id (multiplied into the sprite; None keeps the original colours)
+BOMBER_TINTS = {1: None, 2: (255, 110, 110), 3: (110, 150, 255), 4: (120, 255, 120)}
+# Entities are drawn in the same order as Game.draw's sprite groups
+DRAW_ORDER = {codec.FLAME: 0, codec.ENEMY: 1, codec.BOMBER: 2, codec.SCORE: 3}
+
+
+class BomberClient(asyncio.DatagramProtocol):
+  def __init__(self, link=None, room=gs.NET_DEFAULT_ROOM):
+    self.link = link if link is not None else proto.LinkSimulator()
+    self.room = room
+    self.transport = None
+    self.bomber_id = None
+    self.full = False
+    self.snapshot = None     # Latest snapshot: {"tick", "round", "wins", "state"}
+    self.decoder = codec.DeltaDecoder()
+    self.seq = 0
+    self.presses = {BOMB: 0, DETONATE: 0}   # Running totals sent with every input
+    self.sent = {}           # Input seq -> time.perf_counter() when sent
+    self.acked = 0
+    self.rtt_ms = []         # Input sent -> snapshot acknowledging it received
+    self.bytes_in = 0
+    self.snapshots = 0
+    self.late = 0            # Snapshots older than one already received (dropped)
+    self.missed = 0          # Snapshot ticks never received
+    self.undecodable = 0     # Frames whose base state was no longer kept
+
+  def connection_made(self, transport):
+    self.transport = transport
+
+  def send(self, message):
+    if self.transport is not None and not self.transport.is_closing():
+      self.link.send(self.transport, proto.encode(message))
+
+  def join(self):
+    self.send({"t": proto.JOIN, "room": self.room})
+
+  def leave(self):
+    self.send({"t": proto.LEAVE})
+
+  def send_input(self, move, bombs=0, detonates=0):
+    """Send this frame's input (bombs/detonates: presses since the last frame)."""
+    self.seq += 1
+    self.presses[BOMB] += bombs
+    self.presses[DETONATE] += detonates
+    self.sent[self.seq] = time.perf_counter()
+    self.send({"t": proto.INPUT, "seq": self.seq, "move": move,
+               BOMB: self.presses[BOMB], DETONATE: self.presses[DETONATE],
+               "snap": self.snapshot["tick"] if self.snapshot else None})
+
+  def datagram_received(self, data, addr):
+    self.bytes_in += len(data)
+    message = proto.decode(data)
+    if message is None:
+      return
+    kind = message.get("t")
+    if kind == proto.SNAPSHOT:
+      self.receive_snapshot(message)
+    elif kind == proto.WELCOME:
+      self.bomber_id = message["id"]
+      self.room = message.get("room", self.room)
+    elif kind == proto.FULL:
+      self.full = True
+
+  def receive_snapshot(self, message):
+    decoded = self.decoder.decode(message["data"], message["pos"])
+    if decoded is None:
+      self.undecodable += 1
+      return
+    tick, state = decoded
+    if self.snapshot is not None:
+      gap = tick - self.snapshot["tick"]
+      if gap <= 0:
+        self.late += 1
+        return
+      self.missed += gap - 1
+    self.snapshot = {"tick": tick, "round": message["round"], "wins": message["wins"], "state": state}
+    self.snapshots += 1
+    ack = message["ack"]
+    if ack > self.acked:
+      now = time.perf_counter()
+      if ack in self.sent:
+        self.rtt_ms.append((now - self.sent[ack]) * 1000)
+      for seq in [seq for seq in self.sent if seq <= ack]:
+        del self.sent[seq]
+      self.acked = ack
+
+
+class SnapshotRenderer:
+  def __init__(self, assets):
+    self.ASSETS = assets
+    self.tinted = {}   # (bomber id, action, index) -> tinted copy of the frame
+
+  def bomber_frame(self, bomber_id, action, index):
+    frame = self.ASSETS.player_char[action][index]
+    tint = BOMBER_TINTS.get(bomber_id)
+    if tint is None:
+      return frame
+    key = (bomber_id, action, index)
+    if key not in self.tinted:
+      # Tint a copy: frames are shared through the frame registry
+      tinted = frame.copy()
+      tinted.fill(tint, special_flags=pygame.BLEND_RGB_MULT)
+      self.tinted[key] = tinted
+    return self.tinted[key]
+
+  def camera(self, window, state, bomber_id):
+    """Offsets that centre the local bomber (or the arena) in the window."""
+    focus = (gs.COLS * gs.SIZE // 2, gs.ROWS * gs.SIZE // 2 + gs.Y_OFFSET)
+    for kind, x, y, bomber, *_ in state.entities.values():
+      if kind == codec.BOMBER and bomber == bomber_id:
+        focus = (x // codec.POSITION_SCALE + gs.SIZE // 2, y // codec.POSITION_SCALE + gs.SIZE // 2)
+    max_x = max(0, gs.COLS * gs.SIZE - window.get_width())
+    max_y = max(0, gs.ROWS * gs.SIZE + gs.Y_OFFSET - window.get_height())
+    cam_x = min(max(0, focus[0] - window.get_width() // 2), max_x)
+    cam_y = min(max(0, focus[1] - window.get_height() // 2), max_y)
+    return cam_x, cam_y
+
+  def draw(self, window, snapshot, bomber_id):
+    window.fill(gs.DARK_RED)
+    if snapshot is None or not any(snapshot["state"].cells):
+      return  # Waiting for a round to start
+    assets = self.ASSETS
+    state = snapshot["state"]
+    cam_x, cam_y = self.camera(window, state, bomber_id)
+    cell_frames = {
+      codec.HARD: assets.hard_block["hard_block"],
+      codec.SOFT: assets.soft_block["soft_block"],
+      codec.BOMB: assets.bomb["bomb"],
+    }
+
+    background = assets.background["background"][0]
+    for index, code in enumerate(state.cells):
+      row, col = divmod(index, gs.COLS)
+      position = (col * gs.SIZE - cam_x, row * gs.SIZE + gs.Y_OFFSET - cam_y)
+      window.blit(background, position)
+      if code:
+        kind, frame = codec.cell_kind(code)
+        if kind == codec.SPECIAL:
+          window.blit(assets.specials[codec.SPECIAL_TYPES[frame]][0], position)
+        else:
+          window.blit(cell_frames[kind][frame], position)
+
+    scale = codec.POSITION_SCALE
+    for kind, x, y, type_code, action, frame, _ in sorted(state.entities.values(),
+                                                           key=lambda fields: DRAW_ORDER[fields[0]]):
+      if kind == codec.FLAME:  # x, y are the cell
+        image = assets.explosion[codec.FLAME_KINDS[type_code]][frame]
+        window.blit(image, (x * gs.SIZE - cam_x, y * gs.SIZE + gs.Y_OFFSET - cam_y))
+        continue
+      if kind == codec.BOMBER:
+        image = self.bomber_frame(type_code, codec.ACTIONS[action], frame)
+      elif kind == codec.ENEMY:
+        image = assets.enemies[codec.ENEMY_TYPES[type_code]][codec.ACTIONS[action]][frame]
+      else:
+        image = assets.score_images[codec.SCORES[type_code]][0]
+      window.blit(image, (x // scale - cam_x, y // scale - cam_y))
+
+
+def caption(client):
+  if client.full:
+    return f"Bomba~ Na! versus - room {client.room} full"
+  if client.bomber_id is None:
+    return "Bomba~ Na! versus - joining..."
+  snapshot = client.snapshot or {}
+  recent = client.rtt_ms[-60:]
+  rtt = f"{sorted(recent)[len(recent) // 2]:.0f} ms" if recent else "-"
+  wins = snapshot.get("wins", {}).get(client.bomber_id, 0)
+  return (f"Bomba~ Na! versus - room {client.room} - bomber {client.bomber_id} - round {snapshot.get('round', 0)}"
+          f" - wins {wins} - rtt {rtt}")
+
+
+async def play(host, port, link, room=gs.NET_DEFAULT_ROOM):
+  from assets import Assets
+
+  pygame.init()
+  screen = pygame.display.set_mode((min(gs.SCREENWIDTH, 1280), min(gs.SCREENHEIGHT, 768)))
+  pygame.display.set_caption("Bomba~ Na! versus")
+  controls = InputDispatcher()
+  controls.install()
+  renderer = SnapshotRenderer(Assets())
+
+  loop = asyncio.get_running_loop()
+  client = BomberClient(link, room)
+  transport, _ = await loop.create_datagram_endpoint(lambda: client, remote_addr=(host, port))
+  step = 1 / gs.FPS
+  next_frame = loop.time()
+  next_join = next_title = 0
+  try:
+    while not client.full:
+      controls.poll()
+      if controls.take(QUIT):
+        break
+      if client.bomber_id is None:
+        if loop.time() >= next_join:
+          client.join()
+          next_join = loop.time() + JOIN_RETRY_S
+      else:
+        bombs = detonates = 0
+        while controls.take(BOMB):
+          bombs += 1
+        while controls.take(DETONATE):
+          detonates += 1
+        client.send_input(controls.move, bombs, detonates)
+      renderer.draw(screen, client.snapshot, client.bomber_id)
+      pygame.display.update()
+      if loop.time() >= next_title:
+        pygame.display.set_caption(caption(client))
+        next_title = loop.time() + 1
+      next_frame += step
+      await asyncio.sleep(max(0.0, next_frame - loop.time()))
+  finally:
+    client.leave()
+    transport.close()
+    pygame.quit()
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description="Thin versus client")
+  parser.add_argument("--host", default=gs.NET_HOST)
+  parser.add_argument("--port", type=int, default=gs.NET_PORT)
+  parser.add_argument("--room", default=gs.NET_DEFAULT_ROOM, help="room to join (opened if new)")
+  parser.add_argument("--delay", type=float, default=0, help="simulated one-way delay (ms)")
+  parser.add_argument("--jitter", type=float, default=0, help="extra random delay (ms)")
+  parser.add_argument("--loss", type=float, default=0, help="fraction of datagrams dropped")
+  args = parser.parse_args(argv)
+  asyncio.run(play(args.host, args.port, proto.LinkSimulator(args.delay, args.jitter, args.loss), args.room))
+
+
+if __name__ == "__main__":
+  main()
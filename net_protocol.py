@@ -0,0 +1,133 @@
+# ============================================================================
+# FILE: net_protocol.py - VERSUS NETWORK MESSAGES
+# ============================================================================
+# PURPOSE:
+#   What the versus server (net_server.py) and its thin clients
+#   (net_client.py) send each other over UDP, one message per datagram.
+#   Snapshots are binary (snapshot_codec frames); everything else is a
+#   small JSON object:
+#
+#   client -> server
+#     join      {"t": "join", "room": name}          (resent until welcomed)
+#     input     {"t": "input", "seq": n, "move": "walk_left" | null,
+#                "bomb": presses, "detonate": presses,
+#                "snap": last snapshot tick decoded | null}
+#     leave     {"t": "leave"}
+#   server -> client
+#     welcome   {"t": "welcome", "id": bomber id, "room": name}
+#     full      {"t": "full"}          (room has 4 bombers / no room free)
+#     snapshot  SNAPSHOT_TAG, varints ack, round, win count, (bomber id,
+#               wins)..., then a snapshot_codec frame   (every tick)
+#
+#   Inputs are sent every client frame. Button presses are running totals,
+#   so a lost or reordered input datagram does not lose a bomb press: the
+#   server plants one bomb per increase of the total. "ack" in a snapshot is
+#   the last input seq the server applied before that tick, which lets the
+#   client time input -> simulated -> received round trips.
+#
+#   Each snapshot frame is diffed against the last snapshot the client
+#   reported ("snap"), so a steady round costs a few bytes per moving
+#   bomber instead of the whole arena.
+#
+# LINK SIMULATION:
+#   LinkSimulator sends datagrams with an added one-way delay, jitter and
+#   random loss (both sides use one), so localhost runs show how the game
+#   behaves on a real connection. It also counts the bytes sent.
+#
+# DEPENDENCIES:
+#   - json: Message encoding
+#   - asyncio: Delayed sends (call_later)
+#   - snapshot_codec: Varints, state frames
+# ============================================================================
+
+import asyncio
+import json
+import random
+from snapshot_codec import read_varint, write_varint
+
+# Message types
+JOIN = "join"
+WELCOME = "welcome"
+FULL = "full"
+INPUT = "input"
+LEAVE = "leave"
+SNAPSHOT = "snapshot"
+
+MOVES = {"walk_left", "walk_right", "walk_up", "walk_down"}
+SNAPSHOT_TAG = b"\x01"   # First byte of a snapshot (JSON messages start with "{")
+
+
+def encode(message):
+  return json.dumps(message, separators=(",", ":")).encode()
+
+
+def decode(data):
+  """Decode a datagram; returns None if it is not a message."""
+  if data[:1] == SNAPSHOT_TAG:
+    return decode_snapshot(data)
+  try:
+    message = json.loads(data)
+  except ValueError:
+    return None
+  return message if isinstance(message, dict) else None
+
+
+def encode_snapshot(ack, round_number, wins, frame):
+  """Snapshot datagram: header + snapshot_codec frame."""
+  out = bytearray(SNAPSHOT_TAG)
+  write_varint(out, ack)
+  write_varint(out, round_number)
+  write_varint(out, len(wins))
+  for bomber_id, count in sorted(wins.items()):
+    write_varint(out, bomber_id)
+    write_varint(out, count)
+  return bytes(out) + frame
+
+
+def decode_snapshot(data):
+  """{"t": "snapshot", "ack", "round", "wins", "data", "pos"}: the frame is data[pos:]."""
+  try:
+    ack, pos = read_varint(data, 1)
+    round_number, pos = read_varint(data, pos)
+    count, pos = read_varint(data, pos)
+    wins = {}
+    for _ in range(count):
+      bomber_id, pos = read_varint(data, pos)
+      wins[bomber_id], pos = read_varint(data, pos)
+  except IndexError:
+    return None
+  return {"t": SNAPSHOT, "ack": ack, "round": round_number, "wins": wins, "data": data, "pos": pos}
+
+
+class LinkSimulator:
+  def __init__(self, delay_ms=0, jitter_ms=0, loss=0.0, seed=None):
+    """
+    PARAMETERS:
+    - delay_ms: One-way delay added to every datagram
+    - jitter_ms: Extra random delay, 0..jitter_ms (can reorder datagrams)
+    - loss: Fraction of datagrams dropped (0.01 = 1%)
+    """
+    self.delay_ms = delay_ms
+    self.jitter_ms = jitter_ms
+    self.loss = loss
+    self.random = random.Random(seed)
+    self.bytes = 0
+    self.packets = 0
+    self.dropped = 0
+
+  def send(self, transport, data, addr=None):
+    self.bytes += len(data)
+    self.packets += 1
+    if self.loss and self.random.random() < self.loss:
+      self.dropped += 1
+      return
+    delay = self.delay_ms + (self.random.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+    if delay <= 0:
+      transport.sendto(data, addr)
+    else:
+      asyncio.get_running_loop().call_later(delay / 1000, self._deliver, transport, data, addr)
+
+  @staticmethod
+  def _deliver(transport, data, addr):
+    if not transport.is_closing():
+      transport.sendto(data, addr)
@@ -0,0 +1,316 @@
+# ============================================================================
+# FILE: net_server.py - AUTHORITATIVE VERSUS SERVER
+# ============================================================================
+# PURPOSE:
+#   Runs versus rounds for 2-4 bombers headless and is the only place the
+#   game is simulated. Clients (net_client.py) only send their inputs and
+#   draw the snapshots they receive.
+#   - One process hosts up to gs.NET_MAX_ROOMS rooms (VersusRoom). Each
+#     room has its own Game, random generator and score counter, and no
+#     audio or window; a client names its room when it joins, the room
+#     opens with its first client and closes with its last
+#   - asyncio UDP endpoint: joins, inputs and leaves arrive in
+#     datagram_received() and are routed to the client's room
+#   - run() ticks every room at gs.FPS, round-robin (room_scheduler): each
+#     room applies its bombers' latest input, steps its fixed-step Game
+#     once and sends every client a snapshot, diffed against the last
+#     snapshot that client reported (snapshot_codec)
+#   - A round starts once gs.VERSUS_MIN_PLAYERS have joined and ends when at
+#     most one bomber is left; the next starts gs.VERSUS_ROUND_END_MS later
+#
+#   Remote bombers are driven through RemoteControls, which offers
+#   Character.input the same move / consume() interface as InputDispatcher,
+#   so bombs, remote detonation and movement run the single-player code.
+#
+# USAGE:
+#   python net_server.py                   # Listen on gs.NET_HOST:gs.NET_PORT
+#   python net_server.py --delay 50 --jitter 10 --loss 0.01 --rooms 32
+#   python net_client.py --room final      # One per player
+#   python net_bench.py                    # Latency/bandwidth with bot clients
+#   python room_bench.py                   # Room tick cost, rooms per core
+#
+# DEPENDENCIES:
+#   - asyncio: UDP endpoint
+#   - room_scheduler: Round-robin room ticks, tick costs
+#   - headless: Window-less, silent fixed-step Game per room
+#   - versus: Rounds and bombers
+#   - net_protocol: Messages, link simulation
+#   - snapshot_codec: State capture, delta frames
+# ============================================================================
+
+import argparse
+import asyncio
+import time
+from collections import Counter, deque
+import gamesetting as gs
+import net_protocol as proto
+import versus
+from headless import make_game
+from input_dispatcher import BOMB, DETONATE
+from room_scheduler import RoomScheduler
+from snapshot_codec import StateCapture, StateHistory, encode_frame
+
+ROOM_NAME_LENGTH = 32
+ROOM_SEED_STRIDE = 100000   # Seeds per room (a room's round n uses seed + n)
+
+
+class RemoteControls:
+  """A remote bomber's input, read by Character.input like an InputDispatcher."""
+  def __init__(self, buffer_ms=gs.INPUT_BUFFER_MS):
+    self.buffer_ms = buffer_ms
+    self.move = None
+    self.totals = {BOMB: 0, DETONATE: 0}           # Press totals last received
+    self.presses = {BOMB: deque(), DETONATE: deque()}  # Game time of presses not used yet
+
+  def receive(self, message, now):
+    """Take the state of an input message (`now`: game time in ms)."""
+    move = message.get("move")
+    self.move = move if move in proto.MOVES else None
+    for action in (BOMB, DETONATE):
+      total = message.get(action, 0)
+      if isinstance(total, int) and total > self.totals[action]:
+        self.presses[action].extend([now] * min(total - self.totals[action], 4))
+        self.totals[action] = total
+
+  def expire(self, now):
+    """Forget presses older than the input buffer window."""
+    for presses in self.presses.values():
+      while presses and now - presses[0] > self.buffer_ms:
+        presses.popleft()
+
+  def consume(self, action, handler):
+    """Same contract as InputDispatcher.consume()."""
+    if self.presses[action] and handler():
+      self.presses[action].popleft()
+      return True
+    return False
+
+
+class ClientSlot:
+  def __init__(self, bomber_id, addr, now):
+    self.bomber_id = bomber_id
+    self.addr = addr
+    self.last_seq = 0        # Last input seq applied (acked in snapshots)
+    self.snap_tick = None    # Last snapshot tick the client decoded (delta base)
+    self.last_heard = now    # time.monotonic() of the last datagram
+    self.controls = RemoteControls()
+
+
+class VersusRoom:
+  """One versus match: its own headless Game, clients, rounds and snapshot history."""
+  def __init__(self, server, name, seed=None):
+    self.server = server
+    self.name = name
+    self.GAME = make_game(seed, start=False, render=False)
+    self.seed = seed
+    self.capture = StateCapture()
+    self.history = StateHistory()   # Recent states clients may diff against
+    self.clients = {}        # addr -> ClientSlot
+    self.next_id = 1
+    self.bombers = {}        # bomber id -> VersusBomber (current round)
+    self.round = 0
+    self.round_end = None    # Game time the current round was decided
+    self.wins = Counter()
+    self.tick = 0
+
+  # --------------------------------------------------------------------------
+  # Clients
+  # --------------------------------------------------------------------------
+  def join(self, addr):
+    """The slot of `addr`, new if needed; None if the room is full."""
+    slot = self.clients.get(addr)
+    if slot is None:
+      if len(self.clients) >= gs.VERSUS_MAX_PLAYERS:
+        return None
+      slot = ClientSlot(self.next_id, addr, time.monotonic())
+      self.clients[addr] = slot
+      self.next_id += 1
+    return slot
+
+  def receive_input(self, slot, message):
+    slot.last_heard = time.monotonic()
+    seq = message.get("seq")
+    if isinstance(seq, int) and seq > slot.last_seq:  # Older datagrams arrived late
+      slot.last_seq = seq
+      slot.controls.receive(message, self.GAME.clock.get_ticks())
+      snap = message.get("snap")
+      if isinstance(snap, int) and (slot.snap_tick is None or snap > slot.snap_tick):
+        slot.snap_tick = snap
+
+  def drop(self, slot):
+    """Remove a client; its bomber (if playing) is out of the round."""
+    del self.clients[slot.addr]
+    bomber = self.bombers.get(slot.bomber_id)
+    if bomber is not None and bomber.alive:
+      bomber.alive = False
+      bomber.kill()
+    self.server.forget(slot.addr)
+
+  # --------------------------------------------------------------------------
+  # Simulation
+  # --------------------------------------------------------------------------
+  def step(self):
+    """One room tick: rounds, inputs, Game.update, snapshots."""
+    now = time.monotonic()
+    for slot in list(self.clients.values()):
+      if (now - slot.last_heard) * 1000 > gs.NET_CLIENT_TIMEOUT_MS:
+        self.drop(slot)
+
+    game = self.GAME
+    if not self.bombers:
+      if len(self.clients) >= gs.VERSUS_MIN_PLAYERS:
+        self.start_round()
+    else:
+      ticks = game.clock.get_ticks()
+      for slot in self.clients.values():
+        bomber = self.bombers.get(slot.bomber_id)
+        slot.controls.expire(ticks)
+        if bomber is not None and bomber.alive:
+          bomber.input(slot.controls)
+      game.update()
+      if self.round_end is None and versus.round_over(self.bombers):
+        self.round_end = game.clock.get_ticks()
+        winner = versus.round_winner(self.bombers)
+        if winner is not None:
+          self.wins[winner] += 1
+      elif self.round_end is not None and \
+          game.clock.get_ticks() - self.round_end >= gs.VERSUS_ROUND_END_MS:
+        self.bombers = {}   # Next round starts when enough clients are connected
+        self.round_end = None
+
+    self.tick += 1
+    self.broadcast()
+
+  def start_round(self):
+    self.round += 1
+    seed = None if self.seed is None else self.seed + self.round
+    ids = sorted(slot.bomber_id for slot in self.clients.values())
+    self.bombers = versus.start_round(self.GAME, ids, seed)
+    self.round_end = None
+
+  def broadcast(self):
+    state = self.capture.capture(self.GAME, self.bombers)
+    self.history.add(self.tick, state)
+    frames = {}   # Base tick -> frame (clients usually share a base)
+    for slot in self.clients.values():
+      base_tick = slot.snap_tick if self.history.get(slot.snap_tick) is not None else None
+      if base_tick not in frames:
+        frames[base_tick] = encode_frame(state, self.tick, self.history.get(base_tick), base_tick)
+      data = proto.encode_snapshot(slot.last_seq, self.round, self.wins, frames[base_tick])
+      self.server.link.send(self.server.transport, data, slot.addr)
+
+
+class BomberServer(asyncio.DatagramProtocol):
+  def __init__(self, link=None, seed=None, max_rooms=gs.NET_MAX_ROOMS):
+    self.link = link if link is not None else proto.LinkSimulator()
+    self.seed = seed
+    self.max_rooms = max_rooms
+    self.transport = None
+    self.scheduler = RoomScheduler()
+    self.rooms = self.scheduler.rooms   # name -> VersusRoom
+    self.clients = {}        # addr -> VersusRoom
+    self.rooms_opened = 0
+
+  # --------------------------------------------------------------------------
+  # Datagrams
+  # --------------------------------------------------------------------------
+  def connection_made(self, transport):
+    self.transport = transport
+
+  def send(self, message, addr):
+    self.link.send(self.transport, proto.encode(message), addr)
+
+  def datagram_received(self, data, addr):
+    message = proto.decode(data)
+    if message is None:
+      return
+    kind = message.get("t")
+    room = self.clients.get(addr)
+    if kind == proto.JOIN:
+      if room is None:
+        name = message.get("room")
+        name = name[:ROOM_NAME_LENGTH] if isinstance(name, str) and name else gs.NET_DEFAULT_ROOM
+        room = self.rooms.get(name) or self.open_room(name)
+      slot = room.join(addr) if room is not None else None
+      if slot is None:
+        self.send({"t": proto.FULL}, addr)
+        return
+      self.clients[addr] = room
+      self.send({"t": proto.WELCOME, "id": slot.bomber_id, "room": room.name}, addr)
+    elif room is None:
+      return
+    elif kind == proto.INPUT:
+      room.receive_input(room.clients[addr], message)
+    elif kind == proto.LEAVE:
+      room.drop(room.clients[addr])
+
+  # --------------------------------------------------------------------------
+  # Rooms
+  # --------------------------------------------------------------------------
+  def open_room(self, name):
+    """A new room, or None when the server already hosts max_rooms."""
+    if len(self.rooms) >= self.max_rooms:
+      return None
+    # Each room gets its own seed range, so rooms do not replay each other's arenas
+    seed = None if self.seed is None else self.seed + self.rooms_opened * ROOM_SEED_STRIDE
+    self.rooms_opened += 1
+    room = VersusRoom(self, name, seed)
+    self.scheduler.add(name, room)
+    return room
+
+  def forget(self, addr):
+    """A client left its room; the room closes with its last client."""
+    room = self.clients.pop(addr, None)
+    if room is not None and not room.clients:
+      self.scheduler.remove(room.name)
+
+  async def run(self, duration=None):
+    """Tick every room at gs.FPS until stop() (or for `duration` seconds)."""
+    await self.scheduler.run(duration)
+
+  def stop(self):
+    self.scheduler.stop()
+
+
+async def serve(host, port, link, seed=None, max_rooms=gs.NET_MAX_ROOMS):
+  server = BomberServer(link, seed, max_rooms)
+  loop = asyncio.get_running_loop()
+  transport, _ = await loop.create_datagram_endpoint(lambda: server, local_addr=(host, port))
+  print(f"Versus server on {host}:{port}, up to {max_rooms} rooms (one-way delay {link.delay_ms} ms, "
+        f"jitter {link.jitter_ms} ms, loss {link.loss:.0%})")
+  ticker = asyncio.create_task(server.run())
+  sent = 0
+  try:
+    while True:
+      await asyncio.sleep(5)
+      report = server.scheduler.report()
+      print(f"frame {server.scheduler.frames}  rooms {report['rooms']}  clients {len(server.clients)}  "
+            f"room tick {report['room_ms']:.2f} ms (p99 {report['room_p99']:.2f})  "
+            f"frame p99 {report['frame_p99']:.2f} ms  rooms/core {report['rooms_per_core']}  "
+            f"out {(link.bytes - sent) / 5 / 1024:.1f} KB/s")
+      sent = link.bytes
+  finally:
+    server.stop()
+    await ticker
+    transport.close()
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description="Authoritative versus server")
+  parser.add_argument("--host", default=gs.NET_HOST)
+  parser.add_argument("--port", type=int, default=gs.NET_PORT)
+  parser.add_argument("--seed", type=int, default=None, help="seed for the arena layouts")
+  parser.add_argument("--rooms", type=int, default=gs.NET_MAX_ROOMS, help="most rooms hosted at once")
+  parser.add_argument("--delay", type=float, default=0, help="simulated one-way delay (ms)")
+  parser.add_argument("--jitter", type=float, default=0, help="extra random delay (ms)")
+  parser.add_argument("--loss", type=float, default=0, help="fraction of datagrams dropped")
+  args = parser.parse_args(argv)
+  link = proto.LinkSimulator(args.delay, args.jitter, args.loss)
+  try:
+    asyncio.run(serve(args.host, args.port, link, args.seed, args.rooms))
+  except KeyboardInterrupt:
+    pass
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,126 @@
+# ============================================================================
+# FILE: profiler.py - PER-SUBSYSTEM FRAME PROFILER AND OVERLAY
+# ============================================================================
+# PURPOSE:
+#   Measures how long each part of a frame takes and draws the results as an
+#   overlay (toggled with F3 in Bomberman.input).
+#   - Sections are timed with start(name) / stop(name) pairs; a section may
+#     be entered several times per frame and its time is accumulated
+#   - end_frame() pushes each section's total into a rolling history
+#   - The overlay shows, per section: last/average/worst ms, a small
+#     histogram of recent frames, and a marker on the worst frame
+#
+# COST WHEN OFF:
+#   start()/stop() return after a single attribute check, so leaving the
+#   calls in the game loop costs a handful of method calls per frame.
+#
+# DEPENDENCIES:
+#   - pygame: Overlay rendering
+#   - gamesetting: Colours, frame rate (for the frame budget line)
+# ============================================================================
+
+from collections import deque
+from time import perf_counter
+import pygame
+import gamesetting as gs
+
+HISTORY_FRAMES = 120          # Frames kept per section (2 seconds at 60 FPS)
+FRAME_BUDGET_MS = 1000 / gs.FPS
+
+
+class FrameProfiler:
+  def __init__(self, history=HISTORY_FRAMES):
+    self.enabled = False
+    self.history_length = history
+    self.history = {}      # Section name -> deque of ms per frame
+    self._totals = {}      # Section name -> seconds accumulated this frame
+    self._starts = {}      # Section name -> perf_counter() at start()
+    self._frame_start = None
+    self.font = None
+
+  def toggle(self):
+    """Turn profiling on/off. Histories restart when it is turned on."""
+    self.enabled = not self.enabled
+    self.history.clear()
+    self._totals.clear()
+    self._starts.clear()
+    self._frame_start = None
+
+  def start(self, name):
+    if not self.enabled:
+      return
+    self._starts[name] = perf_counter()
+
+  def stop(self, name):
+    if not self.enabled:
+      return
+    started = self._starts.pop(name, None)
+    if started is not None:
+      self._totals[name] = self._totals.get(name, 0.0) + perf_counter() - started
+
+  def end_frame(self):
+    """Close the current frame: record every section's total for this frame."""
+    if not self.enabled:
+      return
+    now = perf_counter()
+    if self._frame_start is not None:
+      self._totals["frame"] = now - self._frame_start
+    self._frame_start = now
+
+    for name in self._totals:
+      if name not in self.history:
+        self.history[name] = deque(maxlen=self.history_length)
+    for name, samples in self.history.items():
+      samples.append(self._totals.get(name, 0.0) * 1000)
+    self._totals.clear()
+
+  def stats(self, name):
+    """Return (last, average, worst) ms for a section over the history window."""
+    samples = self.history.get(name)
+    if not samples:
+      return 0.0, 0.0, 0.0
+    return samples[-1], sum(samples) / len(samples), max(samples)
+
+  def draw(self, window, x=8, y=gs.Y_OFFSET + 8):
+    """Draw the overlay: one row per section with numbers and a histogram."""
+    if not self.enabled or not self.history:
+      return
+    if self.font is None:
+      self.font = pygame.font.Font(None, 18)
+
+    row_h = 18
+    label_w = 300  # Must fit the label and the three value columns
+    bar_w = 2
+    graph_w = self.history_length * bar_w
+    panel = pygame.Surface((label_w + graph_w + 16, row_h * len(self.history) + 8), pygame.SRCALPHA)
+    panel.fill((0, 0, 0, 170))
+
+    for row, (name, samples) in enumerate(self.history.items()):
+      last, avg, worst = self.stats(name)
+      top = 4 + row * row_h
+      self.draw_columns(panel, top + 2, name, [f"{last:.2f}", f"{avg:.2f}", f"{worst:.2f}"], gs.WHITE)
+
+      # Histogram scaled to the section's worst frame (at least 1 ms tall)
+      scale = (row_h - 4) / max(worst, 1.0)
+      worst_index = max(range(len(samples)), key=samples.__getitem__)
+      left = label_w + 8 + (self.history_length - len(samples)) * bar_w
+      for i, value in enumerate(samples):
+        height = max(1, int(value * scale))
+        colour = gs.RED if i == worst_index else \
+                 gs.ORANGE if value > FRAME_BUDGET_MS else gs.LIGHTGREEN
+        pygame.draw.rect(panel, colour, (left + i * bar_w, top + row_h - 2 - height, bar_w, height))
+      # Worst-frame marker: a tick above the worst bar
+      pygame.draw.line(panel, gs.RED, (left + worst_index * bar_w, top),
+                       (left + worst_index * bar_w + bar_w - 1, top))
+
+    header = pygame.Surface((label_w, row_h), pygame.SRCALPHA)
+    self.draw_columns(header, 2, "section (ms)", ["last", "avg", "worst"], gs.YELLOW)
+    window.blit(header, (x, y - row_h))
+    window.blit(panel, (x, y))
+
+  def draw_columns(self, surface, top, label, values, colour):
+    """Draw a label and right-aligned value columns (the default font is not monospaced)."""
+    surface.blit(self.font.render(label, True, colour), (4, top))
+    for column, value in enumerate(values):
+      text = self.font.render(value, True, colour)
+      surface.blit(text, (190 + column * 48 - text.get_width(), top))
@@ -0,0 +1,137 @@
+# ============================================================================
+# FILE: room_bench.py - ROOMS PER CORE BENCHMARK
+# ============================================================================
+# PURPOSE:
+#   Fills a versus server (net_server.BomberServer) with N rooms of 4 bot
+#   bombers and lets its room scheduler tick them at gs.FPS on one asyncio
+#   loop, for each N asked for. Reports:
+#   - room: mean / p99 time of one room tick (inputs, Game.update, snapshot
+#     capture and one delta frame per client)
+#   - frame: mean / p99 time to tick every room once, against the
+#     1000 / gs.FPS ms budget; late: frames started over a frame late
+#   - rooms/core: budget / mean room tick
+#   Bot inputs go through BomberServer.datagram_received() like real
+#   datagrams; snapshots are encoded and handed to a transport that only
+#   counts them, so the figures are the simulation's, not the kernel's.
+#   Bots acknowledge the snapshot NETWORK_LAG_TICKS old, as a client
+#   ~100 ms away would.
+#
+# USAGE:
+#   python room_bench.py                          # 1, 8, 16, 32, 64 rooms
+#   python room_bench.py --rooms 48 --seconds 20
+#
+# DEPENDENCIES:
+#   - net_server: BomberServer, VersusRoom
+#   - net_protocol: Message encoding
+# ============================================================================
+
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import sys
+import gamesetting as gs
+import net_protocol as proto
+from input_dispatcher import BOMB, DETONATE
+from net_server import BomberServer
+
+MOVES = sorted(proto.MOVES)
+NETWORK_LAG_TICKS = 6
+
+
+class CountingTransport:
+  """Datagram transport that counts what it is given instead of sending it."""
+  def __init__(self):
+    self.bytes = 0
+    self.packets = 0
+
+  def sendto(self, data, addr=None):
+    self.bytes += len(data)
+    self.packets += 1
+
+  def is_closing(self):
+    return False
+
+
+class Bot:
+  def __init__(self, server, room, index, seed):
+    self.server = server
+    self.room = room
+    self.addr = ("bot", room, index)
+    self.rng = random.Random(seed)
+    self.seq = 0
+    self.move = None
+    self.bombs = 0
+
+  def join(self):
+    self.server.datagram_received(proto.encode({"t": proto.JOIN, "room": self.room}), self.addr)
+
+  def send_input(self):
+    if self.rng.random() < 0.05:
+      self.move = self.rng.choice(MOVES + [None])
+    if self.rng.random() < 0.02:
+      self.bombs += 1
+    self.seq += 1
+    tick = self.server.rooms[self.room].tick - NETWORK_LAG_TICKS
+    self.server.datagram_received(proto.encode({
+      "t": proto.INPUT, "seq": self.seq, "move": self.move, BOMB: self.bombs, DETONATE: 0,
+      "snap": tick if tick >= 0 else None}), self.addr)
+
+
+async def drive(server, bots):
+  """Send every bot's input once per frame, ahead of the room ticks."""
+  loop = asyncio.get_running_loop()
+  step = 1 / gs.FPS
+  next_frame = loop.time()
+  while server.scheduler.running:
+    for bot in bots:
+      bot.send_input()
+    next_frame += step
+    await asyncio.sleep(max(0.0, next_frame - loop.time()))
+
+
+async def session(rooms, seconds, seed):
+  server = BomberServer(seed=seed, max_rooms=rooms)
+  transport = CountingTransport()
+  server.connection_made(transport)
+  bots = [Bot(server, f"room-{room}", index, seed + room * gs.VERSUS_MAX_PLAYERS + index)
+          for room in range(rooms) for index in range(gs.VERSUS_MAX_PLAYERS)]
+  for bot in bots:
+    bot.join()
+
+  driver = asyncio.create_task(drive(server, bots))
+  await server.run(seconds)
+  server.stop()
+  await driver
+  report = server.scheduler.report()
+  report["rounds"] = sum(room.round for room in server.rooms.values())
+  report["out_kbps"] = transport.bytes / seconds / 1024
+  return report
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description="Versus rooms ticked on one core")
+  parser.add_argument("--rooms", type=int, nargs="*", default=[1, 8, 16, 32, 64])
+  parser.add_argument("--seconds", type=float, default=10)
+  parser.add_argument("--seed", type=int, default=1234)
+  args = parser.parse_args(argv)
+
+  budget_ms = 1000 / gs.FPS
+  print(f"{gs.VERSUS_MAX_PLAYERS} bots per room, {gs.FPS} Hz (frame budget {budget_ms:.2f} ms), "
+        f"{args.seconds:g} s per run")
+  print(f"{'rooms':>5} {'room ms':>8} {'p99':>6} {'frame ms':>9} {'p99':>6} {'late %':>7} "
+        f"{'rounds':>7} {'out KB/s':>9} {'rooms/core':>11}")
+  for rooms in args.rooms:
+    # The level generator prints; keep the table readable
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+      result = asyncio.run(session(rooms, args.seconds, args.seed))
+    late = 100 * result["late_frames"] / max(1, result["frames"])
+    print(f"{rooms:>5} {result['room_ms']:>8.3f} {result['room_p99']:>6.2f} {result['frame_ms']:>9.2f} "
+          f"{result['frame_p99']:>6.2f} {late:>7.1f} {result['rounds']:>7} {result['out_kbps']:>9.1f} "
+          f"{result['rooms_per_core']:>11}")
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,124 @@
+# ============================================================================
+# FILE: room_scheduler.py - MANY GAMES ON ONE EVENT LOOP
+# ============================================================================
+# PURPOSE:
+#   Ticks any number of rooms (anything with a step() method, e.g. the
+#   versus rooms of net_server.py) at gs.FPS on the running asyncio loop:
+#   - Every frame each room is stepped once, round-robin. The first room
+#     of the frame rotates, so no room is always the last to be ticked
+#   - The loop gets control back between rooms, so datagrams for the later
+#     rooms are read before those rooms tick
+#   - A frame that starts more than one frame late is counted and the
+#     schedule restarts from now (no burst of catch-up ticks)
+#
+# COST REPORT:
+#   Each open room's tick times are kept (RoomStats). When a room closes its
+#   stats are folded into one record for every closed room, so a server that
+#   sees many room names keeps a bounded amount of stats.
+#   report() gives the mean and p99 room tick, the frame time (all rooms
+#   plus the datagrams read in between) and the rooms one core can tick at
+#   gs.FPS: the frame budget divided by the mean room tick.
+#
+# DEPENDENCIES:
+#   - asyncio: Frame pacing, yielding between rooms
+#   - gamesetting: Tick rate
+# ============================================================================
+
+import asyncio
+import time
+from collections import deque
+import gamesetting as gs
+
+TICK_SAMPLES = 3600   # Tick times kept per room and for frames (one minute)
+
+
+def percentile(values, pct):
+  values = sorted(values)
+  return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else 0.0
+
+
+class RoomStats:
+  def __init__(self):
+    self.tick_ms = deque(maxlen=TICK_SAMPLES)
+    self.ticks = 0
+
+
+class RoomScheduler:
+  def __init__(self, rate=gs.FPS):
+    self.rate = rate
+    self.rooms = {}          # name -> room (has step())
+    self.stats = {}          # name -> RoomStats of an open room
+    self.closed = RoomStats()  # Every removed room's ticks, folded together
+    self.closed_rooms = 0
+    self.frame_ms = deque(maxlen=TICK_SAMPLES)
+    self.frames = 0
+    self.late_frames = 0     # Frames started more than a frame late
+    self.running = True
+
+  def add(self, name, room):
+    self.rooms[name] = room
+    self.stats.setdefault(name, RoomStats())
+
+  def remove(self, name):
+    if self.rooms.pop(name, None) is None:
+      return
+    stats = self.stats.pop(name)
+    self.closed.tick_ms.extend(stats.tick_ms)
+    self.closed.ticks += stats.ticks
+    self.closed_rooms += 1
+
+  def tick_samples(self):
+    """Recent room tick times (ms) of the open rooms and the closed ones."""
+    return [ms for stats in [*self.stats.values(), self.closed] for ms in stats.tick_ms]
+
+  async def frame(self):
+    """Step every room once, starting one room further along than last frame."""
+    started = time.perf_counter()
+    names = list(self.rooms)
+    if names:
+      first = self.frames % len(names)
+      names = names[first:] + names[:first]
+    for name in names:
+      room = self.rooms.get(name)
+      if room is None:
+        continue   # Closed since the frame started
+      t0 = time.perf_counter()
+      room.step()
+      stats = self.stats.get(name, self.closed)   # Rooms can close themselves in step()
+      stats.tick_ms.append((time.perf_counter() - t0) * 1000)
+      stats.ticks += 1
+      await asyncio.sleep(0)   # Read waiting datagrams before the next room
+    self.frame_ms.append((time.perf_counter() - started) * 1000)
+    self.frames += 1
+
+  async def run(self, duration=None):
+    """Run frames at `rate` until stop() (or for `duration` seconds)."""
+    loop = asyncio.get_running_loop()
+    step = 1 / self.rate
+    next_frame = loop.time()
+    end = None if duration is None else next_frame + duration
+    while self.running and (end is None or next_frame < end):
+      await self.frame()
+      next_frame += step
+      delay = next_frame - loop.time()
+      if delay < -step:
+        self.late_frames += 1
+        next_frame = loop.time()  # Fell behind: do not try to catch up in a burst
+      await asyncio.sleep(max(0.0, delay))
+
+  def stop(self):
+    self.running = False
+
+  def report(self):
+    """Room tick and frame costs (ms) and the rooms one core can tick at `rate`."""
+    ticks = self.tick_samples()
+    room_ms = sum(ticks) / len(ticks) if ticks else 0.0
+    budget_ms = 1000 / self.rate
+    return {
+      "rooms": len(self.rooms), "closed_rooms": self.closed_rooms,
+      "room_ms": room_ms, "room_p99": percentile(ticks, 99),
+      "frame_ms": sum(self.frame_ms) / len(self.frame_ms) if self.frame_ms else 0.0,
+      "frame_p99": percentile(self.frame_ms, 99),
+      "late_frames": self.late_frames, "frames": self.frames,
+      "rooms_per_core": int(budget_ms / room_ms) if room_ms else 0,
+    }
@@ -0,0 +1,137 @@
+# ============================================================================
+# FILE: snapshot_bench.py - SNAPSHOT ENCODING BENCHMARK
+# ============================================================================
+# PURPOSE:
+#   Runs the benchmark.py scenarios (and a 4-bomber versus round) headless,
+#   captures the WorldState every tick and reports, per scenario:
+#   - json: the whole state as JSON (grid + every entity), what sending
+#     everything each tick costs
+#   - key: a snapshot_codec keyframe (the whole state, varint packed)
+#   - delta: diffed against the previous tick (replay stream)
+#   - delta@6: diffed against the state 6 ticks back (~100 ms round trip
+#     on the network, where the base is the last acknowledged snapshot)
+#   - encode/decode: microseconds per delta frame
+#   Every decoded frame is checked against the captured state.
+#
+# USAGE:
+#   python snapshot_bench.py
+#   python snapshot_bench.py --ticks 1200 --only versus_4 horde_200
+#
+# DEPENDENCIES:
+#   - benchmark: Scenario setups
+#   - snapshot_codec: Capture, frames
+#   - headless / versus / net_server: Versus round driven by random inputs
+# ============================================================================
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+import benchmark
+import snapshot_codec as codec
+import versus
+from headless import make_game
+from input_dispatcher import BOMB
+from net_server import RemoteControls
+
+NETWORK_LAG_TICKS = 6
+
+
+def setup_versus(seed):
+  """A 4-bomber round whose bombers walk and bomb at random."""
+  game = make_game(seed=seed, start=False)
+  bombers = versus.start_round(game, [1, 2, 3, 4], seed)
+  rng = random.Random(seed)
+  controls = {bomber_id: RemoteControls() for bomber_id in bombers}
+  presses = {bomber_id: 0 for bomber_id in bombers}
+
+  def tick():
+    now = game.clock.get_ticks()
+    for bomber_id, bomber in bombers.items():
+      if not bomber.alive:
+        continue
+      control = controls[bomber_id]
+      if rng.random() < 0.05 or control.move is None:
+        control.move = rng.choice(["walk_left", "walk_right", "walk_up", "walk_down"])
+      if rng.random() < 0.02:
+        presses[bomber_id] += 1
+      control.receive({"move": control.move, BOMB: presses[bomber_id]}, now)
+      control.expire(now)
+      bomber.input(control)
+  return game, bombers, tick
+
+
+def run_scenario(name, ticks, seed):
+  if name == "versus_4":
+    game, bombers, tick = setup_versus(seed)
+  else:
+    setup, scenario_tick = benchmark.SCENARIOS[name]
+    game = make_game(seed=seed)
+    setup(game)
+    bombers = None
+    tick = (lambda: scenario_tick(game)) if scenario_tick else None
+
+  capture = codec.StateCapture()
+  states = []
+  for _ in range(ticks):
+    if tick:
+      tick()
+    game.update()
+    states.append(capture.capture(game, bombers))
+
+  sizes = {"json": [], "key": [], "delta": [], "delta@6": []}
+  encode_us, decode_us = [], []
+  previous = None
+  for index, state in enumerate(states):
+    sizes["json"].append(len(json.dumps({"cells": state.cells, "entities": state.entities},
+                                        separators=(",", ":"))))
+    sizes["key"].append(len(codec.encode_frame(state, index)))
+    if index >= NETWORK_LAG_TICKS:
+      base = index - NETWORK_LAG_TICKS
+      sizes["delta@6"].append(len(codec.encode_frame(state, index, states[base], base)))
+
+    t0 = time.perf_counter()
+    frame = codec.encode_frame(state, index, previous, index - 1 if previous is not None else None)
+    t1 = time.perf_counter()
+    _, decoded, _ = codec.decode_frame(frame, previous)
+    t2 = time.perf_counter()
+    if decoded != state:
+      raise AssertionError(f"{name}: tick {index} did not decode to the captured state")
+    sizes["delta"].append(len(frame))
+    encode_us.append((t1 - t0) * 1e6)
+    decode_us.append((t2 - t1) * 1e6)
+    previous = state
+
+  mean = lambda values: sum(values) / len(values) if values else 0.0
+  return {"bytes": {kind: mean(values) for kind, values in sizes.items()},
+          "delta_max": max(sizes["delta"][1:], default=0),
+          "encode_us": mean(encode_us[1:]), "decode_us": mean(decode_us[1:]),
+          "entities": mean([len(state.entities) for state in states])}
+
+
+def main(argv=None):
+  names = list(benchmark.SCENARIOS) + ["versus_4"]
+  parser = argparse.ArgumentParser(description="Snapshot size and encode/decode time")
+  parser.add_argument("--ticks", type=int, default=600)
+  parser.add_argument("--seed", type=int, default=1234)
+  parser.add_argument("--only", nargs="*", choices=names)
+  args = parser.parse_args(argv)
+
+  print(f"bytes per tick (mean over {args.ticks} ticks), microseconds per delta frame")
+  print(f"{'scenario':<18} {'entities':>8} {'json':>7} {'key':>6} {'delta':>6} {'max':>5} "
+        f"{'delta@6':>8} {'encode':>7} {'decode':>7}")
+  for name in args.only or names:
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+      result = run_scenario(name, args.ticks, args.seed)
+    size = result["bytes"]
+    print(f"{name:<18} {result['entities']:>8.1f} {size['json']:>7.0f} {size['key']:>6.0f} "
+          f"{size['delta']:>6.1f} {result['delta_max']:>5} {size['delta@6']:>8.1f} "
+          f"{result['encode_us']:>7.1f} {result['decode_us']:>7.1f}")
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
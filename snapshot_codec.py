@@ -0,0 +1,345 @@
+# ============================================================================
+# FILE: snapshot_codec.py - DELTA-COMPRESSED GAME STATE SNAPSHOTS
+# ============================================================================
+# PURPOSE:
+#   Turns the game into a compact WorldState and encodes each state as the
+#   difference from an earlier one, for the versus network stream and for
+#   replay streams.
+#
+# WORLD STATE:
+#   - cells: one small int per grid cell, kind * CELL_FRAMES + frame
+#     (empty, hard block, soft block + crumble frame, bomb + fuse frame,
+#     special + type)
+#   - entities: stable id -> (kind, x, y, type, action, frame, flags)
+#     for bombers/the player, enemies, flame cells and score popups.
+#     Positions are quantized to 1/POSITION_SCALE pixel; every speed in
+#     the game is a multiple of 0.5 px, so this loses nothing.
+#   Names (actions, enemy types, flame pieces...) are sent as their index
+#   in the tables below, which client and server build from gamesetting.
+#
+# FRAME FORMAT (all numbers are LEB128 varints, deltas are zigzag encoded):
+#   tick
+#   base tick + 1  (0: keyframe, diffed against the empty state)
+#   changed cells: count, then (gap to the previous changed index, code)
+#   removed entities: count, then id gap
+#   new/changed entities: count, then (id gap, field mask, field deltas)
+#   A new entity is diffed against all zeros, so it costs the same as a
+#   change. Most ticks only carry the entities that moved.
+#
+# STREAMS:
+#   - Network: the server diffs against the last state each client
+#     acknowledged (StateHistory), so lost datagrams need no resend
+#   - Replays: DeltaEncoder diffs against the previous tick, with a
+#     keyframe every `keyframe_interval` ticks to allow seeking
+#
+# DEPENDENCIES:
+#   - weakref: Stable entity ids without keeping sprites alive
+#   - ecs, info_panel, explosion: Score popups and blasts (GAME.world entities)
+#   - gamesetting: Grid size, name tables
+# ============================================================================
+
+import weakref
+import gamesetting as gs
+from ecs import Animation, Position
+from explosion import Flames
+from info_panel import ScorePopup
+
+# Cell codes: kind * CELL_FRAMES + frame
+CELL_FRAMES = 16
+EMPTY, HARD, SOFT, BOMB, SPECIAL = range(5)
+
+# Entity kinds and fields
+BOMBER, ENEMY, FLAME, SCORE = 1, 2, 3, 4
+FIELDS = ("kind", "x", "y", "type", "action", "frame", "flags")
+ZERO = (0,) * len(FIELDS)
+POSITION_SCALE = 2   # Half-pixel positions
+
+# Name tables (index = code)
+ACTIONS = sorted(set(gs.PLAYER) | {action for name in gs.ENEMIES for action in getattr(gs, name.upper())})
+ENEMY_TYPES = list(gs.ENEMIES)
+SPECIAL_TYPES = list(gs.SPECIALS)
+FLAME_KINDS = list(gs.EXPLOSION)
+SCORES = list(gs.SCORE_IMAGES)
+ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+FLAME_KIND_CODES = {name: code for code, name in enumerate(FLAME_KINDS)}
+
+
+class WorldState:
+  def __init__(self, cells=None, entities=None):
+    self.cells = cells if cells is not None else [0] * (gs.ROWS * gs.COLS)
+    self.entities = entities if entities is not None else {}  # id -> field tuple
+
+  def __eq__(self, other):
+    return isinstance(other, WorldState) and self.cells == other.cells and self.entities == other.entities
+
+  def copy(self):
+    return WorldState(list(self.cells), dict(self.entities))
+
+
+def cell_kind(code):
+  """(kind, frame) of a cell code."""
+  return divmod(code, CELL_FRAMES)
+
+
+# ============================================================================
+# CAPTURE - Game -> WorldState
+# ============================================================================
+class StateCapture:
+  def __init__(self):
+    self.ids = weakref.WeakKeyDictionary()   # Sprite -> entity id
+    self.world_ids = {}                      # GAME.world entity -> first entity id (live ones only)
+    self.next_id = 1
+
+  def entity_id(self, sprite, count=1):
+    """Id of `sprite`; count > 1 reserves that many consecutive ids (one per blast cell)."""
+    entity_id = self.ids.get(sprite)
+    if entity_id is None:
+      entity_id = self.ids[sprite] = self.next_id
+      self.next_id += count
+    return entity_id
+
+  def world_id(self, entity, count=1):
+    """entity_id() for a GAME.world entity (ids seen in the last capture are kept)."""
+    codec_id = self.world_ids.get(entity)
+    if codec_id is None:
+      codec_id = self.next_id
+      self.next_id += count
+    return codec_id
+
+  def capture(self, game, bombers=None):
+    """
+    Snapshot the game
+
+    PARAMETERS:
+    - game: Game to read
+    - bombers: dict of bomber id -> Character (versus); None uses GAME.PLAYER as bomber 0
+    """
+    state = WorldState()
+    cells = state.cells
+    groups = game.groups
+    if not game.game_on:
+      return state
+    for block in groups["hard_block"]:
+      cells[block.row * gs.COLS + block.col] = HARD * CELL_FRAMES
+    for block in groups["soft_block"]:
+      cells[block.row * gs.COLS + block.col] = SOFT * CELL_FRAMES + block.image_index
+    for bomb in groups["bomb"]:
+      cells[bomb.row * gs.COLS + bomb.col] = BOMB * CELL_FRAMES + bomb.index
+    for special in groups["specials"]:
+      cells[special.row * gs.COLS + special.col] = SPECIAL * CELL_FRAMES + SPECIAL_TYPES.index(special.name)
+
+    entities = state.entities
+    entity_id = self.entity_id
+    scale = POSITION_SCALE
+    if bombers is None:
+      bombers = {0: game.PLAYER} if hasattr(game, "PLAYER") else {}
+    for bomber_id, bomber in bombers.items():
+      if bomber.groups():  # Not yet removed after its death animation
+        entities[entity_id(bomber)] = (BOMBER, round(bomber.x * scale), round(bomber.y * scale), bomber_id,
+                                       ACTION_CODES[bomber.action], bomber.index, int(bomber.alive))
+    for enemy in groups["enemies"]:
+      entities[entity_id(enemy)] = (ENEMY, round(enemy.x * scale), round(enemy.y * scale),
+                                    ENEMY_TYPES.index(enemy.type), ACTION_CODES[enemy.action], enemy.index, 0)
+    world_ids = {}
+    world_id = self.world_id
+    for entity, flames, animation in game.world.query(Flames, Animation):
+      # A blast's cells are fixed when it starts, so cell n keeps id first + n
+      first = world_ids[entity] = world_id(entity, len(flames.cells))
+      for offset, ((row, col), kind) in enumerate(flames.cells.items()):
+        entities[first + offset] = (FLAME, col, row, FLAME_KIND_CODES[kind], 0, animation.index, 0)
+    for entity, position, popup in game.world.query(Position, ScorePopup):
+      codec_id = world_ids[entity] = world_id(entity)
+      entities[codec_id] = (SCORE, round(position.x * scale), round(position.y * scale),
+                            SCORES.index(popup.score), 0, 0, 0)
+    self.world_ids = world_ids
+    return state
+
+
+# ============================================================================
+# VARINTS
+# ============================================================================
+def write_varint(out, value):
+  """Append an unsigned LEB128 varint to bytearray `out`."""
+  while value > 0x7F:
+    out.append((value & 0x7F) | 0x80)
+    value >>= 7
+  out.append(value)
+
+
+def read_varint(data, pos):
+  """Return (value, next position)."""
+  value = shift = 0
+  while True:
+    byte = data[pos]
+    pos += 1
+    value |= (byte & 0x7F) << shift
+    if byte < 0x80:
+      return value, pos
+    shift += 7
+
+
+def zigzag(value):
+  return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+
+def unzigzag(value):
+  return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+# ============================================================================
+# FRAMES
+# ============================================================================
+def encode_frame(state, tick, base=None, base_tick=None):
+  """Encode `state` as a diff from `base` (None: keyframe). Returns bytes."""
+  out = bytearray()
+  write_varint(out, tick)
+  if base is None:
+    base = WorldState()
+    write_varint(out, 0)
+  else:
+    write_varint(out, base_tick + 1)
+
+  # Most ticks change no cell: one list comparison (in C) skips the scan
+  changed = [] if base.cells == state.cells else \
+    [index for index, (old, new) in enumerate(zip(base.cells, state.cells)) if old != new]
+  write_varint(out, len(changed))
+  previous = -1
+  cells = state.cells
+  for index in changed:
+    write_varint(out, index - previous - 1)
+    write_varint(out, cells[index])
+    previous = index
+
+  old_entities, new_entities = base.entities, state.entities
+  removed = sorted(entity_id for entity_id in old_entities if entity_id not in new_entities)
+  write_varint(out, len(removed))
+  previous = 0
+  for entity_id in removed:
+    write_varint(out, entity_id - previous)
+    previous = entity_id
+
+  updated = sorted(entity_id for entity_id, fields in new_entities.items()
+                   if old_entities.get(entity_id) != fields)
+  write_varint(out, len(updated))
+  previous = 0
+  for entity_id in updated:
+    write_varint(out, entity_id - previous)
+    previous = entity_id
+    old = old_entities.get(entity_id, ZERO)
+    new = new_entities[entity_id]
+    mask = 0
+    for bit, (a, b) in enumerate(zip(old, new)):
+      if a != b:
+        mask |= 1 << bit
+    write_varint(out, mask)
+    for a, b in zip(old, new):
+      if a != b:
+        write_varint(out, zigzag(b - a))
+  return bytes(out)
+
+
+def frame_base(data, pos=0):
+  """Base tick a frame was diffed against (None for a keyframe)."""
+  _, pos = read_varint(data, pos)
+  base_tick, _ = read_varint(data, pos)
+  return base_tick - 1 if base_tick else None
+
+
+def decode_frame(data, base=None, pos=0):
+  """
+  Rebuild a state
+
+  PARAMETERS:
+  - data: Encoded frame (bytes)
+  - base: The state the frame was diffed against (see frame_base()); ignored for keyframes
+  - pos: Offset of the frame in `data`
+
+  RETURNS: (tick, WorldState, position after the frame)
+  """
+  tick, pos = read_varint(data, pos)
+  base_tick, pos = read_varint(data, pos)
+  state = base.copy() if base_tick and base is not None else WorldState()
+  if base_tick and base is None:
+    raise ValueError(f"frame needs the state of tick {base_tick - 1}")
+
+  cells = state.cells
+  count, pos = read_varint(data, pos)
+  index = -1
+  for _ in range(count):
+    gap, pos = read_varint(data, pos)
+    index += gap + 1
+    cells[index], pos = read_varint(data, pos)
+
+  entities = state.entities
+  count, pos = read_varint(data, pos)
+  entity_id = 0
+  for _ in range(count):
+    gap, pos = read_varint(data, pos)
+    entity_id += gap
+    del entities[entity_id]
+
+  count, pos = read_varint(data, pos)
+  entity_id = 0
+  for _ in range(count):
+    gap, pos = read_varint(data, pos)
+    entity_id += gap
+    mask, pos = read_varint(data, pos)
+    fields = list(entities.get(entity_id, ZERO))
+    for bit in range(len(FIELDS)):
+      if mask & (1 << bit):
+        delta, pos = read_varint(data, pos)
+        fields[bit] += unzigzag(delta)
+    entities[entity_id] = tuple(fields)
+  return tick, state, pos
+
+
+# ============================================================================
+# STREAMS
+# ============================================================================
+class StateHistory:
+  """The last `size` states by tick (bases the other side may still hold)."""
+  def __init__(self, size=64):
+    self.size = size
+    self.states = {}
+
+  def add(self, tick, state):
+    self.states[tick] = state
+    if len(self.states) > self.size:
+      del self.states[min(self.states)]
+
+  def get(self, tick):
+    return self.states.get(tick)
+
+
+class DeltaEncoder:
+  """Replay stream: each tick diffed against the previous one."""
+  def __init__(self, keyframe_interval=gs.FPS * 5):
+    self.keyframe_interval = keyframe_interval
+    self.previous = None
+    self.previous_tick = None
+    self.frames = 0
+
+  def encode(self, state, tick):
+    keyframe = self.previous is None or self.frames % self.keyframe_interval == 0
+    data = encode_frame(state, tick, None if keyframe else self.previous, self.previous_tick)
+    self.previous, self.previous_tick = state, tick
+    self.frames += 1
+    return data
+
+
+class DeltaDecoder:
+  """Decodes a stream of frames, keeping the recent states frames may refer to."""
+  def __init__(self, history=64):
+    self.history = StateHistory(history)
+
+  def decode(self, data, pos=0):
+    """Returns (tick, WorldState), or None if the frame's base state is gone."""
+    base_tick = frame_base(data, pos)
+    base = None
+    if base_tick is not None:
+      base = self.history.get(base_tick)
+      if base is None:
+        return None
+    tick, state, _ = decode_frame(data, base, pos)
+    self.history.add(tick, state)
+    return tick, state
@@ -1,6 +1,5 @@
 import pygame
 import gamesetting as gs
-from info_panel import Scoring
 
 class Special(pygame.sprite.Sprite):
   def __init__(self, game, images,name, group, type, row_num, col_num, size):
@@ -44,14 +43,12 @@ class Special(pygame.sprite.Sprite):
          if self.name == "exit":
             # Clear exit from level matrix and remove sprite
             self.GAME.level_matrix[self.row][self.col] = "_"
-            self.GAME.bg_music.stop()
-            self.GAME.bg_music_special.stop()
+            self.GAME.music.stop()
             self.kill()
             return
          self.GAME.level_matrix[self.row][self.col] = "_"
-         self.GAME.ASSETS.sounds["Bomberman SFX (4).wav"].play()
-         self.GAME.bg_music.stop()
-         self.GAME.bg_music_special.play(loops=-1)
+         self.GAME.sfx.play("Bomberman SFX (4).wav")
+         self.GAME.music.play("power_up")
          self.kill()
          self.GAME.PLAYER.update_score(self.score)
          return
@@ -88,7 +85,10 @@ class Special(pygame.sprite.Sprite):
   def invisible_special(self, player):
      # Make player invisible to enemies
      player.invisibility = True
-     player.invisibility_timer = pygame.time.get_ticks()
+     player.invisibility_timer = self.GAME.clock.get_ticks()
+     # A second pick-up restarts the 20 s
+     self.GAME.timers.cancel(player.invisibility_expiry)
+     player.invisibility_expiry = self.GAME.timers.schedule(20000, player.end_invisibility, owner=player)
 
   def end_stage(self, player):
      """end the level, and generate a new level"""
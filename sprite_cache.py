@@ -0,0 +1,189 @@
+# ============================================================================
+# FILE: sprite_cache.py - BAKED SPRITE CACHE
+# ============================================================================
+# PURPOSE:
+#   Stores the finished frames built by Assets (cut, scaled to gs.SIZE,
+#   rotated, colorkeyed) in one compact binary file, so later launches load
+#   the frames directly instead of running the cut/scale/rotate pipeline.
+#
+# CACHE KEY:
+#   SHA-1 of every source image, the sprite coordinate tables in gamesetting,
+#   gs.SIZE, the screen size (start screen) and assets.py itself (the
+#   pipeline). Any change gives a new key and the cache is baked again.
+#
+# FILE FORMAT (CACHE_PATH):
+#   MAGIC | version (u16) | key (20 bytes) | manifest length (u32) |
+#   manifest (JSON) | zlib-compressed RGBA pixels of every frame, in order
+#
+#   The manifest mirrors the Assets attributes (dicts, lists, surfaces);
+#   each surface is stored as [width, height, colorkey or null]. A frame
+#   shared by several animations (see frame_registry.py) is stored once and
+#   referenced by index, so it is still shared after loading.
+#
+# DEPENDENCIES:
+#   - pygame: Surface <-> bytes (needs a display for convert_alpha)
+#   - hashlib, zlib, struct, json: Key, compression, file layout
+# ============================================================================
+
+import hashlib
+import json
+import os
+import struct
+import zlib
+import pygame
+import gamesetting as gs
+
+CACHE_PATH = os.path.join("cache", "sprites.bin")
+MAGIC = b"BMSC"
+VERSION = 3
+HEADER = struct.Struct(">4sH20sI")
+
+# Images in the images folder that Assets cuts its frames from
+SHEET_FILES = ["owncreation.png", "sprite_sheet (1).png", "BlockExplosion.png", "bomb.png",
+               "spritesheet.png", "Bomberman start screen.png", "pointer.png"]
+
+# Files the baked frames are made from
+SOURCE_FILES = [os.path.join("images", name) for name in SHEET_FILES] + ["assets.py"]
+
+# Coordinate tables in gamesetting that decide which cells are cut
+SOURCE_TABLES = ["PLAYER", "HARD_BLOCK", "SOFT_BLOCK", "BOMB", "EXPLOSION",
+                 "BALLOM", "ONIL", "DAHL", "MINVO", "DORIA", "OVAPE", "PASS", "PONTAN",
+                 "SPECIALS", "NUMBERS_BLACK", "NUMBERS_WHITE", "SCORE_IMAGES"]
+
+# Assets attributes that hold processed frames (enemies and specials are
+# built per stage by asset_manager.SpriteSetManager)
+SPRITE_ATTRIBUTES = ["player_char", "hard_block", "soft_block", "bomb", "explosion",
+                     "time_word", "numbers_black", "numbers_white",
+                     "score_images", "left_word", "start_screen", "start_screen_pointer",
+                     "stage_word"]
+
+
+def cache_key():
+  """SHA-1 digest of everything the baked frames depend on."""
+  digest = hashlib.sha1()
+  for path in SOURCE_FILES:
+    digest.update(path.encode())
+    with open(path, "rb") as f:
+      digest.update(f.read())
+  for name in SOURCE_TABLES:
+    digest.update(f"{name}={getattr(gs, name)!r}".encode())
+  digest.update(f"SIZE={gs.SIZE} SCREEN={gs.SCREENWIDTH}x{gs.SCREENHEIGHT}".encode())
+  return digest.digest()
+
+
+# ============================================================================
+# SERIALIZATION
+# ============================================================================
+def _flatten(value, pixels, stored):
+  """
+  Turn an attribute value into a JSON manifest node, appending surface pixels.
+  `stored` maps id(Surface) -> index of surfaces already written.
+  """
+  if isinstance(value, pygame.Surface):
+    if id(value) in stored:
+      return {"ref": stored[id(value)]}
+    stored[id(value)] = len(stored)
+    colorkey = value.get_colorkey()
+    if colorkey:
+      # tobytes() folds the colorkey into the alpha channel; store the raw pixels
+      value = value.copy()
+      value.set_colorkey(None)
+    pixels.append(pygame.image.tobytes(value, "RGBA"))
+    return {"surface": [value.get_width(), value.get_height(),
+                        list(colorkey[:3]) if colorkey else None]}
+  if isinstance(value, dict):
+    # Keys are kept as JSON values so int keys (numbers, scores) stay ints
+    return {"dict": [[key, _flatten(item, pixels, stored)] for key, item in value.items()]}
+  if isinstance(value, list):
+    return {"list": [_flatten(item, pixels, stored) for item in value]}
+  raise TypeError(f"Cannot bake {type(value).__name__}")
+
+
+def _rebuild(node, pixels, offset, built):
+  """Inverse of _flatten: return (value, new offset into the pixel buffer)."""
+  if "ref" in node:
+    return built[node["ref"]], offset
+  if "surface" in node:
+    width, height, colorkey = node["surface"]
+    end = offset + width * height * 4
+    image = pygame.image.frombytes(pixels[offset:end], (width, height), "RGBA").convert_alpha()
+    if colorkey is not None:
+      image.set_colorkey(colorkey)
+    built.append(image)
+    return image, end
+  if "dict" in node:
+    result = {}
+    for key, item in node["dict"]:
+      result[key], offset = _rebuild(item, pixels, offset, built)
+    return result, offset
+  result = []
+  for item in node["list"]:
+    value, offset = _rebuild(item, pixels, offset, built)
+    result.append(value)
+  return result, offset
+
+
+# ============================================================================
+# LOAD / BAKE
+# ============================================================================
+def read(path=CACHE_PATH):
+  """
+  Read, check and decompress the cache file (no display access, so it can
+  run on a loader thread). Returns (manifest, pixels), or None if there is
+  no cache or it was baked from different sources.
+  """
+  try:
+    with open(path, "rb") as f:
+      data = f.read()
+    magic, version, key, manifest_size = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION or key != cache_key():
+      return None
+    start = HEADER.size
+    manifest = json.loads(data[start:start + manifest_size])
+    pixels = zlib.decompress(data[start + manifest_size:])
+  except (OSError, ValueError, struct.error, zlib.error):
+    return None
+  return manifest, pixels
+
+
+def apply(assets, cached):
+  """Build the surfaces from read() output and set them on `assets` (main thread)."""
+  manifest, pixels = cached
+  offset = 0
+  values = {}
+  built = []
+  try:
+    for name in SPRITE_ATTRIBUTES:
+      values[name], offset = _rebuild(manifest[name], pixels, offset, built)
+  except (ValueError, KeyError, IndexError):
+    return False
+
+  for name, value in values.items():
+    setattr(assets, name, value)
+  return True
+
+
+def load(assets, path=CACHE_PATH):
+  """Set the baked frames on `assets`. Returns False if there is no valid cache."""
+  cached = read(path)
+  return cached is not None and apply(assets, cached)
+
+
+def bake(assets, path=CACHE_PATH):
+  """Write the frames currently held by `assets` to the cache file."""
+  pixels = []
+  stored = {}
+  manifest = {name: _flatten(getattr(assets, name), pixels, stored) for name in SPRITE_ATTRIBUTES}
+  manifest_data = json.dumps(manifest, separators=(",", ":")).encode()
+  body = zlib.compress(b"".join(pixels), 6)
+  try:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Write to a temporary file first so a half-written cache is never read
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+      f.write(HEADER.pack(MAGIC, VERSION, cache_key(), len(manifest_data)))
+      f.write(manifest_data)
+      f.write(body)
+    os.replace(temp_path, path)
+  except OSError as error:
+    print(f"Sprite cache: could not write {path}: {error}")
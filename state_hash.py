@@ -0,0 +1,358 @@
+# ============================================================================
+# FILE: state_hash.py - PER-TICK STATE HASH FOR DESYNC DETECTION
+# ============================================================================
+# PURPOSE:
+#   Keeps a hash of the simulation state that is updated as the state
+#   changes, so a run can log it every tick and two runs (a replay and its
+#   recording, two lockstep peers, two builds) can be compared to find the
+#   first tick where they diverge and which part of the state did.
+#
+# SUBSYSTEMS (each hashed separately, then combined):
+#   grid     - hard/soft blocks, bombs, specials (cell, type, fuse state)
+#   player   - the player / versus bombers (position, action, power-ups)
+#   enemies  - type, position, action, destroyed
+#   flames   - blasts and the cells they burn
+#   scores   - score popups
+#   timers   - bomb fuses, crumbling blocks, enemy turn timers, invisibility
+#   stage    - level, stage countdown, game clock, game/transition flags
+#   rng      - every number drawn from the game's TrackedRandom
+#
+# HOW IT STAYS INCREMENTAL:
+#   - Each sprite contributes one term (hash of its fields) to its
+#     subsystem's sum, and one to "timers". The sums are multiset hashes
+#     (addition mod 2**64), so order does not matter and a term can be
+#     taken out again
+#   - Game groups are HashedGroups: adding a sprite queues its term,
+#     removing it (kill(), empty()) subtracts the term right away
+#   - Code that changes a sprite calls GAME.state_hash.touch(sprite); only
+#     touched sprites are re-hashed at the end of the tick. Static sprites
+#     (blocks, specials) are hashed once
+#   - GAME.world entities (ecs.World: score popups, blasts) are hashed once,
+#     when created, and taken out when destroyed: the state hash is the
+#     world's listener
+#   - TrackedRandom folds each drawn value into a digest as it is drawn
+#   full_digest() recomputes everything by walking the groups and the
+#   world, to check
+#   that every state change is touched.
+#
+#   Terms use hash() of tuples of numbers (names go through crc32), which
+#   does not depend on PYTHONHASHSEED, so logs from two processes compare.
+#
+# LOG FORMAT (one line per tick, hex):
+#   tick clock combined grid player enemies flames scores timers stage rng
+#
+# USAGE:
+#   python state_hash.py record a.log --scenario horde_200 --ticks 1200
+#   python state_hash.py record b.log --scenario horde_200 --ticks 1200
+#   python state_hash.py compare a.log b.log
+#
+# DEPENDENCIES:
+#   - pygame: Group hooks
+#   - zlib: Stable codes for names
+#   - random: TrackedRandom
+#   - ecs, info_panel, explosion: Score popup and blast components
+# ============================================================================
+
+import argparse
+import random
+import sys
+import zlib
+import pygame
+from ecs import Position, Timer
+from info_panel import ScorePopup
+from explosion import Flames
+
+MASK = (1 << 64) - 1
+SUBSYSTEMS = ("grid", "player", "enemies", "flames", "scores", "timers", "stage", "rng")
+GRID, PLAYER, ENEMIES, FLAMES, SCORES, TIMERS, STAGE, RNG = range(len(SUBSYSTEMS))
+GROUP_SUBSYSTEMS = {"hard_block": GRID, "soft_block": GRID, "bomb": GRID, "specials": GRID,
+                    "player": PLAYER, "enemies": ENEMIES}
+ENTITY_SUBSYSTEMS = {"score": SCORES, "explosion": FLAMES}
+
+_codes = {}
+
+
+def code(name):
+  """Stable number for a name (str hashes change with PYTHONHASHSEED)."""
+  value = _codes.get(name)
+  if value is None:
+    value = _codes[name] = zlib.crc32(str(name).encode())
+  return value
+
+
+# (state fields, timer fields) of a sprite, by game group
+def _hard_block(block):
+  return (block.row, block.col), ()
+
+
+def _soft_block(block):
+  special = getattr(block, "special_type", None)
+  return ((block.row, block.col, block.destroyed, code(special) if special else 0),
+          (block.anim_timer,) if block.destroyed else ())
+
+
+def _bomb(bomb):
+  return (bomb.row, bomb.col, bomb.power, bomb.remote, bomb.passable), (bomb.bomb_counter, bomb.anim_timer)
+
+
+def _special(special):
+  return (special.row, special.col, code(special.name)), ()
+
+
+def _player(player):
+  return ((player.x, player.y, code(player.action), player.alive, player.lives, player.score,
+           player.bomb_limit, player.bomb_planted, player.power, player.speed, player.remote,
+           player.wall_hack, player.bomb_hack, player.flame_pass, player.invisibility),
+          (player.invisibility_timer or 0,))
+
+
+def _enemy(enemy):
+  return (code(enemy.type), enemy.x, enemy.y, code(enemy.action), enemy.destroyed), (enemy.change_dir_timer,)
+
+
+FIELDS = {"hard_block": _hard_block, "soft_block": _soft_block, "bomb": _bomb, "specials": _special,
+          "player": _player, "enemies": _enemy}
+
+
+# (state fields, timer fields) of a world entity, by kind
+def _score(world, entity):
+  position = world.get(entity, Position)
+  return (world.get(entity, ScorePopup).score, position.x, position.y), (world.get(entity, Timer).start,)
+
+
+def _flame(world, entity):
+  flames = world.get(entity, Flames)
+  return (flames.row, flames.col) + tuple((row, col, code(kind)) for (row, col), kind in flames.cells.items()), ()
+
+
+ENTITY_FIELDS = {"score": _score, "explosion": _flame}
+
+
+class TrackedRandom(random.Random):
+  """random.Random that folds every value it produces into `digest`."""
+  def seed(self, *args, **kwargs):
+    super().seed(*args, **kwargs)
+    self.digest = 0
+    self.draws = 0
+
+  def random(self):
+    value = super().random()
+    self.digest = hash((self.digest, value)) & MASK
+    self.draws += 1
+    return value
+
+  def getrandbits(self, k):
+    value = super().getrandbits(k)
+    self.digest = hash((self.digest, value)) & MASK
+    self.draws += 1
+    return value
+
+
+class HashedGroup(pygame.sprite.Group):
+  """Sprite group that reports its members coming and going to a StateHash."""
+  def __init__(self, state_hash, key):
+    super().__init__()
+    self.state_hash = state_hash
+    self.key = key
+
+  def add_internal(self, sprite, layer=None):
+    super().add_internal(sprite, layer)
+    self.state_hash.added(sprite, self.key)
+
+  def remove_internal(self, sprite):
+    super().remove_internal(sprite)
+    self.state_hash.removed(sprite)
+
+
+def stage_hash(game):
+  """Game-level scalars: a handful of attributes, hashed every tick."""
+  info = getattr(game, "level_info", None) if not game.versus else None
+  return hash((game.clock.get_ticks(), game.game_on, game.transition, game.versus,
+               getattr(game, "level", 0), game.score_bonus,
+               info.time if info else 0, info.timer_start if info else 0)) & MASK
+
+
+class StateHash:
+  def __init__(self, log_path=None):
+    self.sums = [0] * len(SUBSYSTEMS)
+    self.keys = {}       # Sprite -> game group key
+    self.terms = {}      # Sprite or ("entity", id) -> (subsystem, state term, timer term) in the sums
+    self.dirty = set()   # Sprites to re-hash at the end of the tick
+    self.ticks = 0
+    self.last = None     # Subsystem values of the last tick
+    self.log = open(log_path, "w") if log_path else None
+    if self.log:
+      self.log.write("# tick clock combined " + " ".join(SUBSYSTEMS) + "\n")
+
+  # --------------------------------------------------------------------------
+  # State changes
+  # --------------------------------------------------------------------------
+  def group(self, key):
+    return HashedGroup(self, key)
+
+  def added(self, sprite, key):
+    # Fields are not set yet (Sprite.__init__ adds to the group first): hash at end_tick
+    self.keys[sprite] = key
+    self.dirty.add(sprite)
+
+  def removed(self, sprite):
+    if self.keys.pop(sprite, None) is None:
+      return
+    self.dirty.discard(sprite)
+    terms = self.terms.pop(sprite, None)
+    if terms is not None:
+      subsystem, state, timers = terms
+      self.sums[subsystem] -= state
+      self.sums[TIMERS] -= timers
+
+  def entity_added(self, world, entity, kind):
+    # Components are complete when the entity is created: hash it now
+    state, timers = ENTITY_FIELDS[kind](world, entity)
+    terms = (ENTITY_SUBSYSTEMS[kind], hash(state) & MASK, hash(timers) & MASK)
+    self.sums[terms[0]] += terms[1]
+    self.sums[TIMERS] += terms[2]
+    self.terms[("entity", entity)] = terms
+
+  def entity_removed(self, entity):
+    terms = self.terms.pop(("entity", entity), None)
+    if terms is not None:
+      self.sums[terms[0]] -= terms[1]
+      self.sums[TIMERS] -= terms[2]
+
+  def touch(self, sprite):
+    """`sprite` changed: re-hash it at the end of the tick."""
+    if sprite in self.keys:
+      self.dirty.add(sprite)
+
+  # --------------------------------------------------------------------------
+  # Ticks
+  # --------------------------------------------------------------------------
+  def end_tick(self, game):
+    """Fold in this tick's changes, log the hashes and return the subsystem values."""
+    sums = self.sums
+    for sprite in self.dirty:
+      key = self.keys[sprite]
+      state, timers = FIELDS[key](sprite)
+      subsystem = GROUP_SUBSYSTEMS[key]
+      old = self.terms.get(sprite)
+      if old is not None:
+        sums[subsystem] -= old[1]
+        sums[TIMERS] -= old[2]
+      new = (subsystem, hash(state) & MASK, hash(timers) & MASK)
+      sums[subsystem] += new[1]
+      sums[TIMERS] += new[2]
+      self.terms[sprite] = new
+    self.dirty.clear()
+
+    values = self.values(game, sums)
+    self.last = values
+    if self.log:
+      self.log.write(f"{self.ticks} {game.clock.get_ticks()} {combine(values):x} "
+                     + " ".join(f"{value:x}" for value in values) + "\n")
+    self.ticks += 1
+    return values
+
+  def full_digest(self, game):
+    """Subsystem values recomputed from every sprite (slow; checks the incremental sums)."""
+    sums = [0] * len(SUBSYSTEMS)
+    for key, group in game.groups.items():
+      subsystem = GROUP_SUBSYSTEMS[key]
+      for sprite in group:
+        state, timers = FIELDS[key](sprite)
+        sums[subsystem] += hash(state) & MASK
+        sums[TIMERS] += hash(timers) & MASK
+    world = game.world
+    for entity, kind in world.kinds.items():
+      state, timers = ENTITY_FIELDS[kind](world, entity)
+      sums[ENTITY_SUBSYSTEMS[kind]] += hash(state) & MASK
+      sums[TIMERS] += hash(timers) & MASK
+    return self.values(game, sums)
+
+  @staticmethod
+  def values(game, sums):
+    values = [value & MASK for value in sums]
+    values[STAGE] = stage_hash(game)
+    values[RNG] = game.random.digest
+    return values
+
+  def close(self):
+    if self.log:
+      self.log.close()
+      self.log = None
+
+
+def combine(values):
+  return hash(tuple(values)) & MASK
+
+
+# ============================================================================
+# LOG COMPARISON
+# ============================================================================
+def read_log(path):
+  """List of (tick, clock, [subsystem values]) from a log file."""
+  rows = []
+  with open(path) as log:
+    for line in log:
+      if line.startswith("#") or not line.strip():
+        continue
+      tick, clock, _, *values = line.split()
+      rows.append((int(tick), int(clock), [int(value, 16) for value in values]))
+  return rows
+
+
+def first_divergence(log_a, log_b):
+  """
+  Compare two logs tick by tick
+
+  RETURNS: None if they agree (over the ticks both have), else
+  (tick, clock, names of the subsystems that differ)
+  """
+  for (tick, clock, values_a), (_, _, values_b) in zip(read_log(log_a), read_log(log_b)):
+    if values_a != values_b:
+      return tick, clock, [name for name, a, b in zip(SUBSYSTEMS, values_a, values_b) if a != b]
+  return None
+
+
+def record(path, scenario, ticks, seed):
+  """Run a benchmark scenario headless, logging the state hash every tick."""
+  import benchmark
+  from headless import make_game
+
+  setup, scenario_tick = benchmark.SCENARIOS[scenario]
+  state_hash = StateHash(path)
+  game = make_game(seed=seed, state_hash=state_hash)
+  setup(game)
+  for _ in range(ticks):
+    if scenario_tick:
+      scenario_tick(game)
+    game.update()
+  state_hash.close()
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description="Record and compare per-tick state hash logs")
+  commands = parser.add_subparsers(dest="command", required=True)
+  rec = commands.add_parser("record", help="log a headless benchmark scenario")
+  rec.add_argument("log")
+  rec.add_argument("--scenario", default="horde_200")
+  rec.add_argument("--ticks", type=int, default=1200)
+  rec.add_argument("--seed", type=int, default=1234)
+  cmp = commands.add_parser("compare", help="find the first tick where two logs differ")
+  cmp.add_argument("log_a")
+  cmp.add_argument("log_b")
+  args = parser.parse_args(argv)
+
+  if args.command == "record":
+    record(args.log, args.scenario, args.ticks, args.seed)
+    return 0
+  divergence = first_divergence(args.log_a, args.log_b)
+  if divergence is None:
+    print("logs agree")
+    return 0
+  tick, clock, subsystems = divergence
+  print(f"first divergence at tick {tick} ({clock} ms): {', '.join(subsystems)}")
+  return 1
+
+
+if __name__ == "__main__":
+  sys.exit(main())
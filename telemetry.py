@@ -0,0 +1,127 @@
+# ============================================================================
+# FILE: telemetry.py - FRAME TELEMETRY AND HITCH CAPTURE
+# ============================================================================
+# PURPOSE:
+#   Keeps a fixed-size ring buffer of per-frame records and, when a frame
+#   takes longer than gs.TELEMETRY_HITCH_MS, writes the frames around it to
+#   a JSONL file so slow frames on player machines can be diagnosed later
+#   (e.g. regenerate_stage, big chain reactions).
+#
+# HOW IT WORKS:
+#   1. record_frame() stores one tuple per frame in a preallocated list
+#      (no dicts, no I/O on the main loop)
+#   2. A hitch starts a capture; recording continues for
+#      gs.TELEMETRY_FRAMES_AFTER more frames
+#   3. The captured window (frames before + hitch + frames after) is handed
+#      to a background writer thread, which formats and appends it to
+#      TELEMETRY_DIR/hitches-<session>.jsonl
+#
+# DEPENDENCIES:
+#   - threading, queue: Background writer
+#   - gamesetting: Thresholds, buffer sizes, output folder
+# ============================================================================
+
+import json
+import os
+import queue
+import threading
+import time
+import gamesetting as gs
+
+# Order of the values stored in each frame record tuple
+RECORD_FIELDS = ("frame", "time", "frame_ms", "sim_ms", "level", "transition",
+                 "counts", "explosions", "camera_x", "camera_y")
+
+
+class FrameTelemetry:
+  def __init__(self, hitch_ms=gs.TELEMETRY_HITCH_MS, frames_before=gs.TELEMETRY_FRAMES_BEFORE,
+               frames_after=gs.TELEMETRY_FRAMES_AFTER, folder=gs.TELEMETRY_DIR):
+    self.hitch_ms = hitch_ms
+    self.frames_after = frames_after
+    self.size = frames_before + frames_after + 1
+    self.folder = folder
+    self.path = os.path.join(folder, time.strftime("hitches-%Y%m%d-%H%M%S.jsonl"))
+
+    # Ring buffer of record tuples
+    self.records = [None] * self.size
+    self.frame = 0
+    self.last_time = None
+    self.group_names = None  # Keys of game.groups, in the order of record counts
+
+    # Hitch capture state
+    self.capture_frames_left = 0
+    self.capture_hitches = []
+    self.hitch_count = 0
+
+    # Background writer
+    self.queue = queue.Queue()
+    self.writer = threading.Thread(target=self._writer_loop, name="telemetry-writer", daemon=True)
+    self.writer.start()
+
+  def record_frame(self, game):
+    """Store one record for the frame that just finished (call once per frame)."""
+    now = time.perf_counter()
+    if self.last_time is None:
+      # The first frame has no duration (and includes start-up), skip it
+      self.last_time = now
+      return
+    frame_ms = (now - self.last_time) * 1000
+    self.last_time = now
+
+    groups = game.groups
+    if self.group_names is None:
+      self.group_names = list(groups.keys())
+    if game.game_on:
+      camera = (round(game.x_camera_offset, 1), round(game.y_camera_offset, 1))
+      level = game.level
+    else:
+      camera = (0, 0)
+      level = 0
+    record = (self.frame, time.time(), round(frame_ms, 3), game.clock.get_ticks(),
+              level, game.transition, tuple(len(group) for group in groups.values()),
+              game.world.count("explosion"), camera[0], camera[1])
+    self.records[self.frame % self.size] = record
+    self.frame += 1
+
+    if frame_ms >= self.hitch_ms:
+      self.capture_hitches.append(record[0])
+      # Start a capture, or extend the one in progress
+      self.capture_frames_left = self.frames_after
+    elif self.capture_frames_left:
+      self.capture_frames_left -= 1
+      if self.capture_frames_left == 0:
+        self._dump()
+
+  def _dump(self):
+    """Hand the buffered window over to the writer thread (oldest record first)."""
+    start = self.frame % self.size
+    window = [r for r in self.records[start:] + self.records[:start] if r is not None]
+    self.queue.put((self.hitch_count, list(self.capture_hitches), self.group_names, window))
+    self.hitch_count += 1
+    self.capture_hitches = []
+    self.records = [None] * self.size  # Frames already written are not written again
+
+  def _writer_loop(self):
+    while True:
+      item = self.queue.get()
+      if item is None:
+        break
+      hitch_id, hitch_frames, group_names, window = item
+      try:
+        os.makedirs(self.folder, exist_ok=True)
+        with open(self.path, "a") as f:
+          for record in window:
+            data = dict(zip(RECORD_FIELDS, record))
+            data["counts"] = dict(zip(group_names, data["counts"]))
+            data["hitch_id"] = hitch_id
+            data["is_hitch"] = record[0] in hitch_frames
+            f.write(json.dumps(data) + "\n")
+      except OSError as error:
+        print(f"Telemetry: could not write {self.path}: {error}")
+
+  def close(self):
+    """Flush any capture in progress and wait for the writer to finish."""
+    if self.capture_hitches:
+      self._dump()
+    self.queue.put(None)
+    self.writer.join(timeout=5)
@@ -0,0 +1,119 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import snapshot_codec as codec
+from snapshot_codec import (BOMBER, ENEMY, FLAME, DeltaDecoder, DeltaEncoder, StateHistory,
+                            WorldState, decode_frame, encode_frame, read_varint, unzigzag,
+                            write_varint, zigzag)
+
+
+def varint_bytes(value):
+  out = bytearray()
+  write_varint(out, value)
+  return bytes(out)
+
+
+@pytest.mark.parametrize("value, size", [(0, 1), (1, 1), (0x7F, 1), (0x80, 2), (0x3FFF, 2),
+                                         (0x4000, 3), (2 ** 35, 6)])
+def test_varint_round_trip_at_7_bit_boundaries(value, size):
+  data = varint_bytes(value)
+  assert len(data) == size
+  assert read_varint(data + b"\x05", 0) == (value, size)
+
+
+@pytest.mark.parametrize("value, encoded", [(0, 0), (-1, 1), (1, 2), (-64, 127), (63, 126),
+                                            (64, 128), (-65, 129)])
+def test_zigzag_small_magnitudes_stay_small(value, encoded):
+  assert zigzag(value) == encoded
+  assert unzigzag(encoded) == value
+
+
+def test_zigzag_negative_deltas_round_trip_through_varints():
+  for delta in (-1, -63, -64, -65, -8192, -8193, -(2 ** 40)):
+    data = varint_bytes(zigzag(delta))
+    value, _ = read_varint(data, 0)
+    assert unzigzag(value) == delta
+
+
+def make_state(entities, cells=None):
+  state = WorldState(entities=dict(entities))
+  for index, code in (cells or {}).items():
+    state.cells[index] = code
+  return state
+
+
+BASE = make_state({1: (BOMBER, 128, 200, 0, 3, 1, 0),
+                   2: (ENEMY, 640, 328, 2, 5, 0, 0),
+                   7: (FLAME, 300, 300, 0, 1, 2, 0)},
+                  cells={0: codec.HARD * codec.CELL_FRAMES, 45: codec.SOFT * codec.CELL_FRAMES})
+
+
+def test_keyframe_round_trip():
+  tick, state, pos = decode_frame(encode_frame(BASE, 10))
+  assert tick == 10
+  assert state == BASE
+  assert codec.frame_base(encode_frame(BASE, 10)) is None
+
+
+def test_delta_round_trip_adds_removes_and_changes_entities():
+  new = BASE.copy()
+  new.entities[1] = (BOMBER, 126, 200, 0, 4, 2, 0)     # Moved left, new action and frame
+  new.entities[2] = (ENEMY, 640, 200, 2, 5, 0, 1)      # Large negative y delta, destroyed flag
+  del new.entities[7]                                  # Blast over
+  new.entities[300] = (FLAME, 64, 96, 0, 0, 0, 0)      # New blast, id gap > 127
+  new.cells[45] = codec.SOFT * codec.CELL_FRAMES + 3   # Crumbling
+  new.cells[200] = codec.BOMB * codec.CELL_FRAMES
+
+  data = encode_frame(new, 11, BASE, 10)
+  assert codec.frame_base(data) == 10
+  tick, state, pos = decode_frame(data, BASE)
+  assert (tick, pos) == (11, len(data))
+  assert state == new
+  assert BASE.entities[7] == (FLAME, 300, 300, 0, 1, 2, 0)   # The base is not modified
+
+
+def test_unchanged_delta_is_tiny():
+  data = encode_frame(BASE, 11, BASE, 10)
+  assert len(data) == 5   # tick, base, and three empty counts
+  assert decode_frame(data, BASE)[1] == BASE
+
+
+def test_decode_frame_without_its_base_raises():
+  data = encode_frame(BASE, 11, WorldState(), 10)
+  with pytest.raises(ValueError):
+    decode_frame(data)
+
+
+def test_stream_round_trip_with_keyframes():
+  encoder = DeltaEncoder(keyframe_interval=3)
+  decoder = DeltaDecoder()
+  state = BASE
+  for tick in range(1, 8):
+    state = state.copy()
+    state.entities[1] = (BOMBER, 128 + tick * 2, 200, 0, 3, tick % 3, 0)
+    if tick == 4:
+      state.entities[tick + 10] = (ENEMY, 0, 0, 1, 1, 0, 0)
+    assert decoder.decode(encoder.encode(state, tick)) == (tick, state)
+
+
+def test_delta_decoder_returns_none_once_the_base_is_evicted():
+  decoder = DeltaDecoder(history=2)
+  assert decoder.decode(encode_frame(BASE, 1)) is not None
+  later = BASE.copy()
+  later.entities[2] = (ENEMY, 642, 328, 2, 5, 1, 0)
+  decoder.decode(encode_frame(later, 2, BASE, 1))
+  decoder.decode(encode_frame(later, 3, later, 2))   # Tick 1 falls out of the history
+  assert decoder.history.get(1) is None
+  assert decoder.decode(encode_frame(later, 4, BASE, 1)) is None
+  assert decoder.decode(encode_frame(later, 4, later, 3)) == (4, later)
+
+
+def test_state_history_keeps_the_latest_ticks():
+  history = StateHistory(size=3)
+  for tick in range(5):
+    history.add(tick, make_state({tick: (BOMBER, tick, 0, 0, 0, 0, 0)}))
+  assert [history.get(tick) is not None for tick in range(5)] == [False, False, True, True, True]
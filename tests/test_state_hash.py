@@ -0,0 +1,41 @@
+import contextlib
+import io
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # Assets are loaded from paths relative to the repo root
+
+import benchmark
+import gamesetting as gs
+from character import Bomb
+from headless import make_game
+from state_hash import StateHash, SUBSYSTEMS
+
+
+def mismatched(state_hash, game):
+  full = state_hash.full_digest(game)
+  return [name for name, a, b in zip(SUBSYSTEMS, full, state_hash.last) if a != b]
+
+
+def test_blast_on_far_enemy_matches_full_digest():
+  with contextlib.redirect_stdout(io.StringIO()):
+    state_hash = StateHash()
+    game = make_game(seed=5, state_hash=state_hash)
+    benchmark.setup_horde_200(game)
+    for _ in range(3):
+      game.update()
+    far = [enemy for enemy in game.groups["enemies"] if enemy.lod_interval() > 1]
+    assert far, "the horde should have enemies in a far tier"
+    enemy = far[0]
+    row = round((enemy.y - gs.Y_OFFSET) / gs.SIZE)
+    col = round(enemy.x / gs.SIZE)
+    Bomb(game, game.ASSETS.bomb["bomb"], game.groups["bomb"], 1, row, col, gs.SIZE, False).explode()
+
+    for _ in range(30):
+      game.update()
+      assert mismatched(state_hash, game) == []
+  assert enemy.destroyed
@@ -0,0 +1,91 @@
+# ============================================================================
+# FILE: timer_queue.py - CENTRAL TIMER QUEUE
+# ============================================================================
+# PURPOSE:
+#   One queue per Game (GAME.timers) for everything that happens after a
+#   delay, instead of every object comparing the clock with its own
+#   timestamp each tick:
+#   - schedule(delay, callback, *args, owner=None) returns a handle; the
+#     callback runs on the first tick at or after now + delay, the tick the
+#     old "now - start >= delay" polling fired on
+#   - Game.advance() calls run() once per tick, before the sprite groups,
+#     so a tick costs the timers that are due, not one check per object
+#   - Repeating timers (animation frames, the stage countdown) schedule
+#     their next step from their callback, from the tick they fired on
+#   - cancel(handle) drops a timer. So does killing its owner sprite (no
+#     groups left): emptying the game groups needs no bookkeeping here
+#   - Timers due on the same tick run in the order they were scheduled,
+#     so runs stay reproducible
+#
+# TIMERS ON THE QUEUE:
+#   - Bomb fuse frames and detonation (character.Bomb)
+#   - Soft block crumble frames (blocks.Soft_Block)
+#   - Invisibility expiry (specials.Special, character.Character)
+#   - Stage countdown and the pontans at 0 (info_panel.InfoPanel)
+#   - Score popup expiry (ecs.World Timer components)
+#
+# DEPENDENCIES:
+#   - heapq: Timers ordered by due time
+# ============================================================================
+
+import heapq
+
+
+class ScheduledTimer:
+  __slots__ = ("due", "callback", "args", "owner", "cancelled")
+
+  def __init__(self, due, callback, args, owner):
+    self.due = due
+    self.callback = callback
+    self.args = args
+    self.owner = owner
+    self.cancelled = False
+
+
+class TimerQueue:
+  def __init__(self, clock):
+    self.clock = clock
+    self.heap = []        # (due, order, ScheduledTimer)
+    self.order = 0        # Scheduling order: ties on `due` run first come first served
+    self.fired = 0        # Callbacks run by the last run()
+
+  def schedule(self, delay, callback, *args, owner=None):
+    """
+    Run callback(*args) `delay` ms from now
+
+    PARAMETERS:
+    - owner: Sprite the timer belongs to; the timer is dropped once the sprite is killed
+
+    RETURNS: handle for cancel()
+    """
+    timer = ScheduledTimer(self.clock.get_ticks() + delay, callback, args, owner)
+    heapq.heappush(self.heap, (timer.due, self.order, timer))
+    self.order += 1
+    return timer
+
+  def cancel(self, timer):
+    """Drop a pending timer (None is ignored)."""
+    if timer is not None:
+      timer.cancelled = True
+
+  def clear(self):
+    for _, _, timer in self.heap:
+      timer.cancelled = True
+    self.heap.clear()
+
+  def run(self):
+    """Run every timer due by now, earliest first. Returns how many ran."""
+    now = self.clock.get_ticks()
+    heap = self.heap
+    fired = 0
+    while heap and heap[0][0] <= now:
+      timer = heapq.heappop(heap)[2]
+      if timer.cancelled or (timer.owner is not None and not timer.owner.groups()):
+        continue
+      timer.callback(*timer.args)
+      fired += 1
+    self.fired = fired
+    return fired
+
+  def __len__(self):
+    return len(self.heap)
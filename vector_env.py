@@ -0,0 +1,178 @@
+# ============================================================================
+# FILE: vector_env.py - PARALLEL TRAINING ENVIRONMENTS
+# ============================================================================
+# PURPOSE:
+#   Runs N BombermanEnv instances in worker processes and steps them together.
+#   - Each worker writes its observation straight into its slice of one
+#     multiprocessing.shared_memory block, so step() returns a stacked
+#     (N, channels, rows, cols) array without pickling any grids
+#   - Only actions and (reward, done, info) tuples travel over the pipes
+#   - Finished episodes are reset automatically inside the worker
+#
+# USAGE:
+#   python vector_env.py            # Measure step latency/throughput, N = 1..32
+#
+# DEPENDENCIES:
+#   - numpy, multiprocessing: Shared observation buffer and workers
+#   - env: The single-process environment run by each worker
+# ============================================================================
+
+import time
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from env import BombermanEnv
+
+OBS_DTYPE = np.float32
+
+
+def _worker(index, pipe, shm_name, shape, seed, env_kwargs):
+  """Worker process loop: own one env, write observations into shared memory."""
+  shm = shared_memory.SharedMemory(name=shm_name)
+  obs_buffer = None
+  try:
+    obs_buffer = np.ndarray(shape, dtype=OBS_DTYPE, buffer=shm.buf)[index]
+    env = BombermanEnv(seed=seed, **env_kwargs)
+    while True:
+      command, data = pipe.recv()
+      if command == "step":
+        _, reward, terminated, truncated, info = env.step(data)
+        if terminated or truncated:
+          info["final_score"] = info["score"]
+          env.reset()
+          info.update(env.info())
+        env.observe(out=obs_buffer)
+        pipe.send((reward, terminated, truncated, info))
+      elif command == "reset":
+        _, info = env.reset(seed=data)
+        env.observe(out=obs_buffer)
+        pipe.send(info)
+      elif command == "close":
+        env.close()
+        pipe.send(None)
+        break
+  finally:
+    # Drop the view before closing, or the buffer cannot be released
+    obs_buffer = None
+    shm.close()
+
+
+class VectorEnv:
+  def __init__(self, num_envs, seed=0, context=None, **env_kwargs):
+    """
+    CONSTRUCTOR - Start one worker process per environment
+
+    PARAMETERS:
+    - num_envs: Number of games to run in parallel
+    - seed: Base seed; env i is seeded with seed + i
+    - context: multiprocessing start method ("fork", "spawn", ...) or None
+    - env_kwargs: Forwarded to each BombermanEnv
+    """
+    self.num_envs = num_envs
+    self.seed = seed
+    probe = BombermanEnv(**env_kwargs)
+    self.num_actions = probe.num_actions
+    self.observation_shape = probe.observation_shape
+
+    shape = (num_envs,) + self.observation_shape
+    nbytes = int(np.prod(shape)) * np.dtype(OBS_DTYPE).itemsize
+    self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+    # Observations returned by reset()/step() are views of this buffer and
+    # are overwritten by the next call; copy them if they must be kept.
+    self.obs = np.ndarray(shape, dtype=OBS_DTYPE, buffer=self._shm.buf)
+    self.obs.fill(0)
+
+    ctx = mp.get_context(context)
+    self._pipes = []
+    self._procs = []
+    for index in range(num_envs):
+      parent, child = ctx.Pipe()
+      proc = ctx.Process(target=_worker,
+                         args=(index, child, self._shm.name, shape, seed + index, env_kwargs),
+                         daemon=True)
+      proc.start()
+      child.close()
+      self._pipes.append(parent)
+      self._procs.append(proc)
+    self.closed = False
+
+  def reset(self, seed=None):
+    """Reset every env. Returns (observations, list of infos)."""
+    for index, pipe in enumerate(self._pipes):
+      pipe.send(("reset", None if seed is None else seed + index))
+    infos = [pipe.recv() for pipe in self._pipes]
+    return self.obs, infos
+
+  def step(self, actions):
+    """
+    Step every env with its action (all workers run concurrently).
+
+    RETURNS:
+    - (observations, rewards, terminated, truncated, infos)
+    """
+    for pipe, action in zip(self._pipes, actions):
+      pipe.send(("step", int(action)))
+    results = [pipe.recv() for pipe in self._pipes]
+    rewards = np.array([r[0] for r in results], dtype=np.float32)
+    terminated = np.array([r[1] for r in results], dtype=bool)
+    truncated = np.array([r[2] for r in results], dtype=bool)
+    infos = [r[3] for r in results]
+    return self.obs, rewards, terminated, truncated, infos
+
+  def close(self):
+    if self.closed:
+      return
+    self.closed = True
+    for pipe in self._pipes:
+      try:
+        pipe.send(("close", None))
+        pipe.recv()
+      except (BrokenPipeError, EOFError):
+        pass
+    for proc in self._procs:
+      proc.join(timeout=5)
+    del self.obs
+    self._shm.close()
+    self._shm.unlink()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc):
+    self.close()
+
+
+def benchmark(env_counts=(1, 2, 4, 8, 16, 32), steps=500, warmup=50, seed=0):
+  """
+  Measure step latency and throughput for each number of environments.
+
+  RETURNS:
+  - List of dicts: num_envs, mean/p95 step latency (ms), env steps per second
+  """
+  rng = np.random.default_rng(seed)
+  results = []
+  for num_envs in env_counts:
+    with VectorEnv(num_envs, seed=seed) as venv:
+      venv.reset()
+      for _ in range(warmup):
+        venv.step(rng.integers(venv.num_actions, size=num_envs))
+      latencies = np.empty(steps)
+      start = time.perf_counter()
+      for i in range(steps):
+        actions = rng.integers(venv.num_actions, size=num_envs)
+        t0 = time.perf_counter()
+        venv.step(actions)
+        latencies[i] = time.perf_counter() - t0
+      elapsed = time.perf_counter() - start
+    results.append({"num_envs": num_envs,
+                    "step_ms_mean": float(latencies.mean() * 1000),
+                    "step_ms_p95": float(np.percentile(latencies, 95) * 1000),
+                    "env_steps_per_sec": num_envs * steps / elapsed})
+  return results
+
+
+if __name__ == "__main__":
+  print(f"{'envs':>5} {'step ms':>9} {'p95 ms':>9} {'env steps/s':>12}")
+  for row in benchmark():
+    print(f"{row['num_envs']:>5} {row['step_ms_mean']:>9.2f} {row['step_ms_p95']:>9.2f} "
+          f"{row['env_steps_per_sec']:>12.0f}")
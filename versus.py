@@ -0,0 +1,120 @@
+# ============================================================================
+# FILE: versus.py - MULTI-BOMBER BATTLE ROUNDS
+# ============================================================================
+# PURPOSE:
+#   Sets a Game up for a versus round: 2-4 bombers in the corners of an
+#   arena of hard and soft blocks, no enemies, no stage timer. Used by the
+#   network server (net_server.py), which feeds each bomber its client's
+#   inputs.
+#   - VersusBomber: a Character with an id and no respawns
+#   - start_round(): builds the arena and the bombers
+#   - round_over(): True once at most one bomber is left standing
+#
+#   Bombs belong to the bomber that planted them (Bomb.owner), so each
+#   bomber has its own bomb limit and remote detonator. Game.PLAYER is the
+#   first bomber, for code that still expects a single player.
+#
+#   There are no power-ups in versus mode: specials and the exit are tied
+#   to the single-player stage (they spawn enemies and end the stage).
+#
+# DEPENDENCIES:
+#   - Character: Bomber movement, bombs and deaths
+#   - Hard_block, Soft_Block: Arena
+#   - gamesetting: Grid size, versus loadout
+# ============================================================================
+
+import random
+import gamesetting as gs
+from blocks import Soft_Block
+from character import Character
+
+SOFT_BLOCK_CHANCE = 0.35   # Chance that a free cell gets a soft block
+
+
+class VersusBomber(Character):
+  def __init__(self, game, bomber_id, row_num, col_num):
+    super().__init__(game, game.ASSETS.player_char, game.groups["player"], row_num, col_num, gs.SIZE)
+    self.bomber_id = bomber_id
+    self.bomb_limit = gs.VERSUS_BOMB_LIMIT
+    self.power = gs.VERSUS_POWER
+    self.lives = 0
+
+  def reset_player(self):
+    """Called when the death animation ends: out for the rest of the round."""
+    self.kill()
+
+
+def spawn_cells(count):
+  """Free corner cells for `count` bombers (opposite corners first)."""
+  last_row, last_col = gs.ROWS - 2, gs.COLS - 2
+  corners = [(1, 1), (last_row, last_col), (1, last_col), (last_row, 1)]
+  cells = []
+  for row, col in corners[:count]:
+    if row % 2 == 0 and col % 2 == 0:  # Hard block pillar: step inwards
+      row += -1 if row > 1 else 1
+    cells.append((row, col))
+  return cells
+
+
+def start_round(game, bomber_ids, seed=None):
+  """
+  Start a versus round on `game`
+
+  PARAMETERS:
+  - game: Game to reuse (a headless one on the server)
+  - bomber_ids: One id per bomber, in spawn order
+  - seed: Seed for the soft block layout (None draws it from game.random)
+
+  RETURNS: dict of bomber id -> VersusBomber
+  """
+  for group in game.groups.values():
+    group.empty()
+  for group in game.awake.values():
+    group.empty()
+  game.timers.clear()  # The stage countdown of a previous game
+  game.world.clear()
+  game.score_bonus = 0
+  game.versus = True
+  game.game_on = True
+  game.transition = False
+  game.level_transition = None
+  game.music_playing = False
+  game.x_camera_offset = game.y_camera_offset = 0
+  game.cam_target_x = game.cam_target_y = 0
+  game.camera_lerp = 0.14
+  game.deadzone_ratio = 0.6
+
+  spawns = spawn_cells(len(bomber_ids))
+  game.level_matrix = generate_arena(game, spawns, game.random if seed is None else random.Random(seed))
+  bombers = {bomber_id: VersusBomber(game, bomber_id, row, col)
+             for bomber_id, (row, col) in zip(bomber_ids, spawns)}
+  game.PLAYER = next(iter(bombers.values()))
+  return bombers
+
+
+def generate_arena(game, spawns, rng):
+  """Hard block maze plus random soft blocks, keeping each spawn corner open."""
+  matrix = [["_" for _ in range(gs.COLS)] for _ in range(gs.ROWS)]
+  game.insert_hard_block_into_matrix(matrix)
+  keep_clear = set()
+  for row, col in spawns:
+    for d in (-2, -1, 0, 1, 2):
+      keep_clear.add((row + d, col))
+      keep_clear.add((row, col + d))
+  for row_num, row in enumerate(matrix):
+    for col_num, cell in enumerate(row):
+      if cell == "_" and (row_num, col_num) not in keep_clear and rng.random() < SOFT_BLOCK_CHANCE:
+        row[col_num] = Soft_Block(game, game.ASSETS.soft_block["soft_block"],
+                                  game.groups["soft_block"], row_num, col_num)
+  return matrix
+
+
+def round_over(bombers):
+  """True once at most one bomber is still alive."""
+  return sum(1 for bomber in bombers.values() if bomber.alive) <= 1
+
+
+def round_winner(bombers):
+  """Id of the last bomber alive, or None for a draw."""
+  alive = [bomber_id for bomber_id, bomber in bombers.items() if bomber.alive]
+  return alive[0] if len(alive) == 1 else None